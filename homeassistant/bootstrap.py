@@ -18,10 +18,13 @@ from homeassistant.components import http
 from homeassistant.const import REQUIRED_NEXT_PYTHON_DATE, REQUIRED_NEXT_PYTHON_VER
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import area_registry, device_registry, entity_registry
+from homeassistant.helpers.loop_monitor import async_get_loop_monitor
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.setup import (
     DATA_SETUP,
     DATA_SETUP_STARTED,
+    DATA_SETUP_TIMELINE,
+    SetupTimeline,
     async_set_domains_to_be_loaded,
     async_setup_component,
 )
@@ -199,6 +202,9 @@ async def async_from_config_dict(
     """
     start = monotonic()
 
+    # Measure the event loop from the start so slow setups are attributed
+    async_get_loop_monitor(hass)
+
     hass.config_entries = config_entries.ConfigEntries(hass, config)
     await hass.config_entries.async_initialize()
 
@@ -429,6 +435,7 @@ async def _async_set_up_integrations(
 ) -> None:
     """Set up all the integrations."""
     setup_started = hass.data[DATA_SETUP_STARTED] = {}
+    timeline = hass.data[DATA_SETUP_TIMELINE] = SetupTimeline()
     domains_to_setup = _get_domains(hass, config)
 
     # Resolve all dependencies so we know all integrations
@@ -477,14 +484,18 @@ async def _async_set_up_integrations(
     # Load logging as soon as possible
     if logging_domains:
         _LOGGER.info("Setting up logging: %s", logging_domains)
-        await async_setup_multi_components(hass, logging_domains, config, setup_started)
+        with timeline.async_track_stage("logging"):
+            await async_setup_multi_components(
+                hass, logging_domains, config, setup_started
+            )
 
     # Start up debuggers. Start these first in case they want to wait.
     debuggers = domains_to_setup & DEBUGGER_INTEGRATIONS
 
     if debuggers:
         _LOGGER.debug("Setting up debuggers: %s", debuggers)
-        await async_setup_multi_components(hass, debuggers, config, setup_started)
+        with timeline.async_track_stage("debuggers"):
+            await async_setup_multi_components(hass, debuggers, config, setup_started)
 
     # calculate what components to setup in what stage
     stage_1_domains = set()
@@ -512,11 +523,12 @@ async def _async_set_up_integrations(
     stage_2_domains = domains_to_setup - logging_domains - debuggers - stage_1_domains
 
     # Load the registries
-    await asyncio.gather(
-        device_registry.async_load(hass),
-        entity_registry.async_load(hass),
-        area_registry.async_load(hass),
-    )
+    with timeline.async_track_stage("registries"):
+        await asyncio.gather(
+            device_registry.async_load(hass),
+            entity_registry.async_load(hass),
+            area_registry.async_load(hass),
+        )
 
     # Start setup
     if stage_1_domains:
@@ -525,9 +537,10 @@ async def _async_set_up_integrations(
             async with hass.timeout.async_timeout(
                 STAGE_1_TIMEOUT, cool_down=COOLDOWN_TIME
             ):
-                await async_setup_multi_components(
-                    hass, stage_1_domains, config, setup_started
-                )
+                with timeline.async_track_stage("stage_1"):
+                    await async_setup_multi_components(
+                        hass, stage_1_domains, config, setup_started
+                    )
         except asyncio.TimeoutError:
             _LOGGER.warning("Setup timed out for stage 1 - moving forward")
 
@@ -540,9 +553,10 @@ async def _async_set_up_integrations(
             async with hass.timeout.async_timeout(
                 STAGE_2_TIMEOUT, cool_down=COOLDOWN_TIME
             ):
-                await async_setup_multi_components(
-                    hass, stage_2_domains, config, setup_started
-                )
+                with timeline.async_track_stage("stage_2"):
+                    await async_setup_multi_components(
+                        hass, stage_2_domains, config, setup_started
+                    )
         except asyncio.TimeoutError:
             _LOGGER.warning("Setup timed out for stage 2 - moving forward")
 
@@ -550,6 +564,9 @@ async def _async_set_up_integrations(
     _LOGGER.debug("Waiting for startup to wrap up")
     try:
         async with hass.timeout.async_timeout(WRAP_UP_TIMEOUT, cool_down=COOLDOWN_TIME):
-            await hass.async_block_till_done()
+            with timeline.async_track_stage("wrap_up"):
+                await hass.async_block_till_done()
     except asyncio.TimeoutError:
         _LOGGER.warning("Setup timed out for bootstrap - moving forward")
+
+    timeline.async_set_finished()
@@ -12,26 +12,34 @@ from sqlalchemy import and_, bindparam, func, not_, or_
 from sqlalchemy.ext import baked
 import voluptuous as vol
 
-from homeassistant.components import recorder
+from homeassistant.components import recorder, websocket_api
 from homeassistant.components.http import HomeAssistantView
 from homeassistant.components.recorder.models import (
+    StateAttributes,
     States,
     process_timestamp,
     process_timestamp_to_utc_isoformat,
 )
+from homeassistant.components.recorder.statistics import (
+    STATISTICS_TABLES,
+    state_as_float,
+    statistics_during_period,
+)
 from homeassistant.components.recorder.util import execute, session_scope
 from homeassistant.const import (
     CONF_DOMAINS,
     CONF_ENTITIES,
     CONF_EXCLUDE,
     CONF_INCLUDE,
+    EVENT_STATE_CHANGED,
     HTTP_BAD_REQUEST,
 )
-from homeassistant.core import Context, State, split_entity_id
+from homeassistant.core import Context, State, callback, split_entity_id
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entityfilter import (
     CONF_ENTITY_GLOBS,
     INCLUDE_EXCLUDE_BASE_FILTER_SCHEMA,
+    convert_include_exclude_filter,
 )
 from homeassistant.helpers.typing import HomeAssistantType
 import homeassistant.util.dt as dt_util
@@ -80,11 +88,21 @@ QUERY_STATES = [
     States.entity_id,
     States.state,
     States.attributes,
+    StateAttributes.shared_attrs,
     States.last_changed,
     States.last_updated,
 ]
 
 HISTORY_BAKERY = "history_bakery"
+HISTORY_FILTERS = "history_filters"
+HISTORY_ENTITY_FILTER = "history_entity_filter"
+
+
+def _query_states(session):
+    """Query the states joined with their shared attributes."""
+    return session.query(*QUERY_STATES).outerjoin(
+        StateAttributes, States.attributes_id == StateAttributes.attributes_id
+    )
 
 
 def get_significant_states(hass, *args, **kwargs):
@@ -103,6 +121,7 @@ def _get_significant_states(
     include_start_time_state=True,
     significant_changes_only=True,
     minimal_response=False,
+    max_points=None,
 ):
     """
     Return states changes during UTC period start_time - end_time.
@@ -110,12 +129,12 @@ def _get_significant_states(
     Significant states are all states where there is a state change,
     as well as all states from certain domains (for instance
     thermostat so that we get current temperature in our graphs).
+
+    With max_points each entity is downsampled to at most that many states.
     """
     timer_start = time.perf_counter()
 
-    baked_query = hass.data[HISTORY_BAKERY](
-        lambda session: session.query(*QUERY_STATES)
-    )
+    baked_query = hass.data[HISTORY_BAKERY](_query_states)
 
     if significant_changes_only:
         baked_query += lambda q: q.filter(
@@ -161,15 +180,14 @@ def _get_significant_states(
         filters,
         include_start_time_state,
         minimal_response,
+        max_points,
     )
 
 
 def state_changes_during_period(hass, start_time, end_time=None, entity_id=None):
     """Return states changes during UTC period start_time - end_time."""
     with session_scope(hass=hass) as session:
-        baked_query = hass.data[HISTORY_BAKERY](
-            lambda session: session.query(*QUERY_STATES)
-        )
+        baked_query = hass.data[HISTORY_BAKERY](_query_states)
 
         baked_query += lambda q: q.filter(
             (States.last_changed == States.last_updated)
@@ -182,7 +200,9 @@ def state_changes_during_period(hass, start_time, end_time=None, entity_id=None)
             )
 
         if entity_id is not None:
-            baked_query += lambda q: q.filter_by(entity_id=bindparam("entity_id"))
+            baked_query += lambda q: q.filter(
+                States.entity_id == bindparam("entity_id")
+            )
             entity_id = entity_id.lower()
 
         baked_query += lambda q: q.order_by(States.entity_id, States.last_updated)
@@ -203,13 +223,13 @@ def get_last_state_changes(hass, number_of_states, entity_id):
     start_time = dt_util.utcnow()
 
     with session_scope(hass=hass) as session:
-        baked_query = hass.data[HISTORY_BAKERY](
-            lambda session: session.query(*QUERY_STATES)
-        )
+        baked_query = hass.data[HISTORY_BAKERY](_query_states)
         baked_query += lambda q: q.filter(States.last_changed == States.last_updated)
 
         if entity_id is not None:
-            baked_query += lambda q: q.filter_by(entity_id=bindparam("entity_id"))
+            baked_query += lambda q: q.filter(
+                States.entity_id == bindparam("entity_id")
+            )
             entity_id = entity_id.lower()
 
         baked_query += lambda q: q.order_by(
@@ -270,7 +290,7 @@ def _get_states_with_session(
     # We have more than one entity to look at (most commonly we want
     # all entities,) so we need to do a search on all states since the
     # last recorder run started.
-    query = session.query(*QUERY_STATES)
+    query = _query_states(session)
 
     most_recent_states_by_date = session.query(
         States.entity_id.label("max_entity_id"),
@@ -318,9 +338,7 @@ def _get_states_with_session(
 def _get_single_entity_states_with_session(hass, session, utc_point_in_time, entity_id):
     # Use an entirely different (and extremely fast) query if we only
     # have a single entity id
-    baked_query = hass.data[HISTORY_BAKERY](
-        lambda session: session.query(*QUERY_STATES)
-    )
+    baked_query = hass.data[HISTORY_BAKERY](_query_states)
     baked_query += lambda q: q.filter(
         States.last_updated < bindparam("utc_point_in_time"),
         States.entity_id == bindparam("entity_id"),
@@ -344,6 +362,7 @@ def _sorted_states_to_json(
     filters=None,
     include_start_time_state=True,
     minimal_response=False,
+    max_points=None,
 ):
     """Convert SQL results into JSON friendly data structure.
 
@@ -355,6 +374,8 @@ def _sorted_states_to_json(
     We also need to go back and create a synthetic zero data point for
     each list of states, otherwise our graphs won't start on the Y
     axis correctly.
+
+    If max_points is set, longer lists of states are downsampled.
     """
     result = defaultdict(list)
     # Set all entity IDs to empty lists in result set to maintain the order
@@ -420,10 +441,53 @@ def _sorted_states_to_json(
             # a full state
             ent_results[-1] = LazyState(prev_state)
 
+    if max_points is not None:
+        for ent_id, ent_results in result.items():
+            if len(ent_results) > max_points:
+                result[ent_id] = _downsample_states(ent_results, max_points)
+
     # Filter out the empty lists if some states had 0 results.
     return {key: val for key, val in result.items() if val}
 
 
+def _downsample_states(ent_results, max_points):
+    """Reduce a list of states to at most max_points with min/max bucketing.
+
+    The first and last state are always kept. The states in between are
+    split into buckets, of which the lowest and highest numeric state
+    are kept so peaks survive. Buckets without numeric states keep their
+    last state.
+    """
+    buckets = (max_points - 2) // 2
+    if buckets < 1:
+        return [ent_results[0], ent_results[-1]][:max_points]
+
+    inner = ent_results[1:-1]
+    bucket_size = len(inner) / buckets
+    downsampled = [ent_results[0]]
+
+    for bucket in range(buckets):
+        start = int(bucket * bucket_size)
+        end = int((bucket + 1) * bucket_size)
+        if start == end:
+            continue
+        values = []
+        for index in range(start, end):
+            item = inner[index]
+            state = item[STATE_KEY] if isinstance(item, dict) else item.state
+            value = state_as_float(state)
+            if value is not None:
+                values.append((value, index))
+        if not values:
+            downsampled.append(inner[end - 1])
+            continue
+        keep = sorted({min(values)[1], max(values)[1]})
+        downsampled.extend(inner[index] for index in keep)
+
+    downsampled.append(ent_results[-1])
+    return downsampled
+
+
 def get_state(hass, utc_point_in_time, entity_id, run=None):
     """Return a state at a specific point in time."""
     states = get_states(hass, utc_point_in_time, (entity_id,), run)
@@ -437,10 +501,16 @@ async def async_setup(hass, config):
     filters = sqlalchemy_filter_from_include_exclude_conf(conf)
 
     hass.data[HISTORY_BAKERY] = baked.bakery()
+    hass.data[HISTORY_FILTERS] = filters
+    hass.data[HISTORY_ENTITY_FILTER] = (
+        convert_include_exclude_filter(conf) if filters else None
+    )
 
     use_include_order = conf.get(CONF_ORDER)
 
     hass.http.register_view(HistoryPeriodView(filters, use_include_order))
+    hass.components.websocket_api.async_register_command(ws_stream_history)
+    hass.components.websocket_api.async_register_command(ws_subscribe_history)
     hass.components.frontend.async_register_built_in_panel(
         "history", "history", "hass:poll-box"
     )
@@ -448,6 +518,192 @@ async def async_setup(hass, config):
     return True
 
 
+HISTORY_STREAM_SCHEMA = {
+    vol.Required("start_time"): str,
+    vol.Required("entity_ids"): [cv.entity_id],
+    vol.Optional("include_start_time_state", default=True): bool,
+    vol.Optional("significant_changes_only", default=True): bool,
+    vol.Optional("minimal_response", default=False): bool,
+    vol.Optional("max_points"): vol.All(vol.Coerce(int), vol.Range(min=2)),
+}
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "history/stream",
+        vol.Optional("end_time"): str,
+        **HISTORY_STREAM_SCHEMA,
+    }
+)
+@websocket_api.async_response
+async def ws_stream_history(hass, connection, msg):
+    """Stream the history of the requested entities one entity at a time.
+
+    An event is sent with the states of each entity that has history,
+    followed by an event marking the end of the stream.
+    """
+    start_time = dt_util.parse_datetime(msg["start_time"])
+    if start_time is None:
+        connection.send_error(msg["id"], "invalid_start_time", "Invalid start_time")
+        return
+    start_time = dt_util.as_utc(start_time)
+
+    if "end_time" in msg:
+        end_time = dt_util.parse_datetime(msg["end_time"])
+        if end_time is None:
+            connection.send_error(msg["id"], "invalid_end_time", "Invalid end_time")
+            return
+        end_time = dt_util.as_utc(end_time)
+    else:
+        end_time = start_time + timedelta(days=1)
+
+    connection.send_result(msg["id"])
+    await _async_stream_history(
+        hass,
+        connection,
+        msg,
+        _filtered_entity_ids(hass, msg["entity_ids"]),
+        start_time,
+        end_time,
+    )
+
+
+@websocket_api.websocket_command(
+    {vol.Required("type"): "history/subscribe", **HISTORY_STREAM_SCHEMA}
+)
+@websocket_api.async_response
+async def ws_subscribe_history(hass, connection, msg):
+    """Stream the history since start_time, then push states as they change.
+
+    The database is only queried once, new states come from the event bus.
+    """
+    start_time = dt_util.parse_datetime(msg["start_time"])
+    if start_time is None:
+        connection.send_error(msg["id"], "invalid_start_time", "Invalid start_time")
+        return
+    start_time = dt_util.as_utc(start_time)
+
+    entity_ids = _filtered_entity_ids(hass, msg["entity_ids"])
+    significant_changes_only = msg["significant_changes_only"]
+    minimal_response = msg["minimal_response"]
+    # States that change while the history is being streamed
+    pending_events = []
+
+    @callback
+    def _async_send_state(event):
+        """Send a new state of a subscribed entity."""
+        new_state = event.data.get("new_state")
+        if new_state is None:
+            return
+        state_changed = new_state.last_changed == new_state.last_updated
+        if (
+            significant_changes_only
+            and not state_changed
+            and new_state.domain not in SIGNIFICANT_DOMAINS
+        ):
+            return
+        if minimal_response and new_state.domain not in NEED_ATTRIBUTE_DOMAINS:
+            if not state_changed:
+                return
+            new_state = {
+                STATE_KEY: new_state.state,
+                LAST_CHANGED_KEY: new_state.last_changed.isoformat(),
+            }
+        connection.send_message(
+            websocket_api.event_message(
+                msg["id"], {"entity_id": event.data["entity_id"], "states": [new_state]}
+            )
+        )
+
+    @callback
+    def _async_forward_state_changed(event):
+        """Forward state changes of the subscribed entities."""
+        if pending_events is not None:
+            pending_events.append(event)
+            return
+        _async_send_state(event)
+
+    connection.subscriptions[msg["id"]] = hass.bus.async_listen_entities(
+        EVENT_STATE_CHANGED, _async_forward_state_changed, entity_ids
+    )
+    connection.send_result(msg["id"])
+
+    await _async_stream_history(
+        hass, connection, msg, entity_ids, start_time, dt_util.utcnow()
+    )
+
+    for event in pending_events:
+        _async_send_state(event)
+    pending_events = None
+
+
+def _filtered_entity_ids(hass, entity_ids):
+    """Return the entity ids that pass the configured include and exclude filters."""
+    entity_filter = hass.data[HISTORY_ENTITY_FILTER]
+    if entity_filter is None:
+        return list(entity_ids)
+    return [entity_id for entity_id in entity_ids if entity_filter(entity_id)]
+
+
+async def _async_stream_history(
+    hass, connection, msg, entity_ids, start_time, end_time
+):
+    """Send the history of the requested entities one entity at a time."""
+    for entity_id in entity_ids:
+        content = await hass.async_add_executor_job(
+            _history_stream_message,
+            hass,
+            msg["id"],
+            entity_id,
+            start_time,
+            end_time,
+            msg["include_start_time_state"],
+            msg["significant_changes_only"],
+            msg["minimal_response"],
+            msg.get("max_points"),
+        )
+        if content is not None:
+            connection.send_message(content)
+
+    connection.send_message(websocket_api.event_message(msg["id"], {"done": True}))
+
+
+def _history_stream_message(
+    hass,
+    msg_id,
+    entity_id,
+    start_time,
+    end_time,
+    include_start_time_state,
+    significant_changes_only,
+    minimal_response,
+    max_points,
+):
+    """Fetch the history of an entity as a serialized websocket message."""
+    with session_scope(hass=hass) as session:
+        result = _get_significant_states(
+            hass,
+            session,
+            start_time,
+            end_time,
+            [entity_id],
+            hass.data[HISTORY_FILTERS],
+            include_start_time_state,
+            significant_changes_only,
+            minimal_response,
+            max_points,
+        )
+
+    if entity_id not in result:
+        return None
+
+    return websocket_api.messages.message_to_json(
+        websocket_api.event_message(
+            msg_id, {"entity_id": entity_id, "states": result[entity_id]}
+        )
+    )
+
+
 class HistoryPeriodView(HomeAssistantView):
     """Handle history period requests."""
 
@@ -502,8 +758,35 @@ class HistoryPeriodView(HomeAssistantView):
 
         minimal_response = "minimal_response" in request.query
 
+        max_points = None
+        max_points_str = request.query.get("max_points")
+        if max_points_str:
+            try:
+                max_points = int(max_points_str)
+            except ValueError:
+                max_points = 0
+            if max_points < 2:
+                return self.json_message("Invalid max_points", HTTP_BAD_REQUEST)
+
         hass = request.app["hass"]
 
+        statistics_period = request.query.get("statistics")
+        if statistics_period is not None:
+            if statistics_period not in STATISTICS_TABLES:
+                return self.json_message("Invalid statistics", HTTP_BAD_REQUEST)
+            # Long ranges are served from the rollup tables which
+            # hold a fixed number of rows per entity and period
+            return self.json(
+                await hass.async_add_executor_job(
+                    statistics_during_period,
+                    hass,
+                    start_time,
+                    end_time,
+                    entity_ids,
+                    statistics_period,
+                )
+            )
+
         if (
             not include_start_time_state
             and entity_ids
@@ -522,6 +805,7 @@ class HistoryPeriodView(HomeAssistantView):
                 include_start_time_state,
                 significant_changes_only,
                 minimal_response,
+                max_points,
             ),
         )
 
@@ -534,6 +818,7 @@ class HistoryPeriodView(HomeAssistantView):
         include_start_time_state,
         significant_changes_only,
         minimal_response,
+        max_points,
     ):
         """Fetch significant stats from the database as json."""
         timer_start = time.perf_counter()
@@ -549,6 +834,7 @@ class HistoryPeriodView(HomeAssistantView):
                 include_start_time_state,
                 significant_changes_only,
                 minimal_response,
+                max_points,
             )
 
         result = list(result.values())
@@ -710,7 +996,9 @@ class LazyState(State):
         """State attributes."""
         if not self._attributes:
             try:
-                self._attributes = json.loads(self._row.attributes)
+                self._attributes = json.loads(
+                    self._row.shared_attrs or self._row.attributes
+                )
             except ValueError:
                 # When json.loads fails
                 _LOGGER.exception("Error converting row to state: %s", self)
@@ -480,7 +480,10 @@ def setup(hass, config):
 
     event_to_json = _generate_event_to_json(conf)
     max_tries = conf.get(CONF_RETRY_COUNT)
-    instance = hass.data[DOMAIN] = InfluxThread(hass, influx, event_to_json, max_tries)
+    entities = convert_include_exclude_filter(conf).entity_ids_and_domains
+    instance = hass.data[DOMAIN] = InfluxThread(
+        hass, influx, event_to_json, max_tries, entities
+    )
     instance.start()
 
     def shutdown(event):
@@ -497,8 +500,12 @@ def setup(hass, config):
 class InfluxThread(threading.Thread):
     """A threaded event handler class."""
 
-    def __init__(self, hass, influx, event_to_json, max_tries):
-        """Initialize the listener."""
+    def __init__(self, hass, influx, event_to_json, max_tries, entities=None):
+        """Initialize the listener.
+
+        Only listens for the state changes of the entity IDs and domains
+        in entities if given.
+        """
         threading.Thread.__init__(self, name=DOMAIN)
         self.queue = queue.Queue()
         self.influx = influx
@@ -506,7 +513,13 @@ class InfluxThread(threading.Thread):
         self.max_tries = max_tries
         self.write_errors = 0
         self.shutdown = False
-        hass.bus.listen(EVENT_STATE_CHANGED, self._event_listener)
+        if entities is None:
+            hass.bus.listen(EVENT_STATE_CHANGED, self._event_listener)
+        else:
+            entity_ids, domains = entities
+            hass.bus.listen_entities(
+                EVENT_STATE_CHANGED, self._event_listener, entity_ids, domains
+            )
 
     @callback
     def _event_listener(self, event):
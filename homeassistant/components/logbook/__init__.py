@@ -9,11 +9,13 @@ from sqlalchemy.orm import aliased
 from sqlalchemy.sql.expression import literal
 import voluptuous as vol
 
+from homeassistant.components import websocket_api
 from homeassistant.components.automation import EVENT_AUTOMATION_TRIGGERED
 from homeassistant.components.history import sqlalchemy_filter_from_include_exclude_conf
 from homeassistant.components.http import HomeAssistantView
 from homeassistant.components.recorder.models import (
     Events,
+    StateAttributes,
     States,
     process_timestamp_to_utc_isoformat,
 )
@@ -26,6 +28,7 @@ from homeassistant.const import (
     ATTR_ICON,
     ATTR_NAME,
     ATTR_SERVICE,
+    ATTR_UNIT_OF_MEASUREMENT,
     EVENT_CALL_SERVICE,
     EVENT_HOMEASSISTANT_START,
     EVENT_HOMEASSISTANT_STOP,
@@ -57,9 +60,13 @@ ATTR_MESSAGE = "message"
 CONTINUOUS_DOMAINS = ["proximity", "sensor"]
 
 DOMAIN = "logbook"
+DATA_FILTERS = "logbook_filters"
 
 GROUP_BY_MINUTES = 15
 
+# Contexts of live events that are kept to describe what caused an entry
+MAX_LIVE_CONTEXT_LOOKUP = 1000
+
 EMPTY_JSON_OBJECT = "{}"
 UNIT_OF_MEASUREMENT_JSON = '"unit_of_measurement":'
 
@@ -159,7 +166,9 @@ async def async_setup(hass, config):
         filters = None
         entities_filter = None
 
+    hass.data[DATA_FILTERS] = (filters, entities_filter)
     hass.http.register_view(LogbookView(conf, filters, entities_filter))
+    hass.components.websocket_api.async_register_command(ws_event_stream)
 
     hass.services.async_register(DOMAIN, "log", log_message, schema=LOG_MESSAGE_SCHEMA)
 
@@ -249,6 +258,135 @@ class LogbookView(HomeAssistantView):
         return await hass.async_add_executor_job(json_events)
 
 
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "logbook/event_stream",
+        vol.Required("start_time"): str,
+        vol.Optional("entity_ids"): [cv.entity_id],
+    }
+)
+@websocket_api.async_response
+async def ws_event_stream(hass, connection, msg):
+    """Send the logbook since start_time, then push entries as they happen.
+
+    The database is only queried once, new entries come from the event bus
+    and are filtered the same way as the entries from the database.
+    """
+    start_time = dt_util.parse_datetime(msg["start_time"])
+    if start_time is None:
+        connection.send_error(msg["id"], "invalid_start_time", "Invalid start_time")
+        return
+    start_time = dt_util.as_utc(start_time)
+
+    filters, entities_filter = hass.data[DATA_FILTERS]
+    entity_ids = msg.get("entity_ids")
+    if entity_ids is not None:
+        entities_filter = generate_filter([], entity_ids, [], [])
+
+    entity_attr_cache = EntityAttributeCache(hass)
+    context_lookup = {None: None}
+    # Events that are fired while the database is being queried
+    pending_events = []
+
+    @callback
+    def _async_send_event(event):
+        """Send the logbook entry of a live event."""
+        lazy_event = LiveEventPartialState(event)
+        context_lookup.setdefault(lazy_event.context_id, lazy_event)
+        _trim_context_lookup(context_lookup)
+        if not _keep_live_event(hass, lazy_event, entities_filter):
+            return
+        entries = list(humanify(hass, [lazy_event], entity_attr_cache, context_lookup))
+        if entries:
+            connection.send_message(
+                websocket_api.event_message(msg["id"], {"events": entries})
+            )
+
+    @callback
+    def _async_forward_event(event):
+        """Forward the events that can show up in the logbook."""
+        if pending_events is not None:
+            pending_events.append(event)
+            return
+        _async_send_event(event)
+
+    unsubs = [
+        hass.bus.async_listen(event_type, _async_forward_event)
+        for event_type in ALL_EVENT_TYPES_EXCEPT_STATE_CHANGED
+        + list(hass.data.get(DOMAIN, {}))
+    ]
+    if entity_ids is None:
+        unsubs.append(hass.bus.async_listen(EVENT_STATE_CHANGED, _async_forward_event))
+    else:
+        unsubs.append(
+            hass.bus.async_listen_entities(
+                EVENT_STATE_CHANGED, _async_forward_event, entity_ids
+            )
+        )
+
+    @callback
+    def _async_unsubscribe():
+        """Stop forwarding events."""
+        for unsub in unsubs:
+            unsub()
+
+    connection.subscriptions[msg["id"]] = _async_unsubscribe
+    connection.send_result(msg["id"])
+
+    end_time = dt_util.utcnow()
+
+    def _json_events():
+        """Fetch the entries from the database as a websocket message."""
+        events = _get_events(
+            hass,
+            start_time,
+            end_time,
+            entity_ids,
+            filters,
+            entities_filter,
+            entity_attr_cache=entity_attr_cache,
+            context_lookup=context_lookup,
+        )
+        _trim_context_lookup(context_lookup)
+        return websocket_api.messages.message_to_json(
+            websocket_api.event_message(msg["id"], {"events": events})
+        )
+
+    connection.send_message(await hass.async_add_executor_job(_json_events))
+
+    for event in pending_events:
+        _async_send_event(event)
+    pending_events = None
+
+
+def _trim_context_lookup(context_lookup):
+    """Forget the oldest contexts once there are too many."""
+    while len(context_lookup) > MAX_LIVE_CONTEXT_LOOKUP:
+        del context_lookup[next(key for key in context_lookup if key is not None)]
+
+
+def _keep_live_event(hass, event, entities_filter):
+    """Return if a live event matches the database query of the logbook."""
+    if event.event_type == EVENT_CALL_SERVICE:
+        return False
+
+    if event.event_type != EVENT_STATE_CHANGED:
+        return _keep_event(hass, event, entities_filter)
+
+    # Mirrors _missing_state_matcher and _continuous_entity_matcher
+    old_state = event.data.get("old_state")
+    new_state = event.data.get("new_state")
+    if old_state is None or new_state is None or old_state.state == new_state.state:
+        return False
+    if (
+        new_state.domain in CONTINUOUS_DOMAINS
+        and ATTR_UNIT_OF_MEASUREMENT in new_state.attributes
+    ):
+        return False
+
+    return entities_filter is None or entities_filter(new_state.entity_id)
+
+
 def humanify(hass, events, entity_attr_cache, context_lookup):
     """Generate a converted list of events into Entry objects.
 
@@ -413,10 +551,14 @@ def _get_events(
     filters=None,
     entities_filter=None,
     entity_matches_only=False,
+    entity_attr_cache=None,
+    context_lookup=None,
 ):
     """Get events for a period of time."""
-    entity_attr_cache = EntityAttributeCache(hass)
-    context_lookup = {None: None}
+    if entity_attr_cache is None:
+        entity_attr_cache = EntityAttributeCache(hass)
+    if context_lookup is None:
+        context_lookup = {None: None}
 
     def yield_events(query):
         """Yield Events that are not filtered away."""
@@ -480,6 +622,7 @@ def _generate_events_query(session):
         States.entity_id,
         States.domain,
         States.attributes,
+        StateAttributes.shared_attrs,
     )
 
 
@@ -490,6 +633,7 @@ def _generate_events_query_without_states(session):
         literal(None).label("entity_id"),
         literal(None).label("domain"),
         literal(None).label("attributes"),
+        literal(None).label("shared_attrs"),
     )
 
 
@@ -498,6 +642,9 @@ def _generate_states_query(session, start_day, end_day, old_state, entity_ids):
         _generate_events_query(session)
         .outerjoin(Events, (States.event_id == Events.event_id))
         .outerjoin(old_state, (States.old_state_id == old_state.state_id))
+        .outerjoin(
+            StateAttributes, (States.attributes_id == StateAttributes.attributes_id)
+        )
         .filter(_missing_state_matcher(old_state))
         .filter(_continuous_entity_matcher())
         .filter((States.last_updated > start_day) & (States.last_updated < end_day))
@@ -512,6 +659,9 @@ def _apply_events_types_and_states_filter(hass, query, old_state):
     events_query = (
         query.outerjoin(States, (Events.event_id == States.event_id))
         .outerjoin(old_state, (States.old_state_id == old_state.state_id))
+        .outerjoin(
+            StateAttributes, (States.attributes_id == StateAttributes.attributes_id)
+        )
         .filter(
             (Events.event_type != EVENT_STATE_CHANGED)
             | _missing_state_matcher(old_state)
@@ -541,7 +691,11 @@ def _continuous_entity_matcher():
     #
     return sqlalchemy.or_(
         sqlalchemy.not_(States.domain.in_(CONTINUOUS_DOMAINS)),
-        sqlalchemy.not_(States.attributes.contains(UNIT_OF_MEASUREMENT_JSON)),
+        sqlalchemy.not_(
+            sqlalchemy.func.coalesce(
+                StateAttributes.shared_attrs, States.attributes
+            ).contains(UNIT_OF_MEASUREMENT_JSON)
+        ),
     )
 
 
@@ -701,7 +855,9 @@ class LazyEventPartialState:
         if self._attributes:
             return self._attributes.get(ATTR_ICON)
 
-        result = ICON_JSON_EXTRACT.search(self._row.attributes)
+        result = ICON_JSON_EXTRACT.search(
+            self._row.shared_attrs or self._row.attributes or EMPTY_JSON_OBJECT
+        )
         return result and result.group(1)
 
     @property
@@ -726,13 +882,11 @@ class LazyEventPartialState:
     def attributes(self):
         """State attributes."""
         if not self._attributes:
-            if (
-                self._row.attributes is None
-                or self._row.attributes == EMPTY_JSON_OBJECT
-            ):
+            source = self._row.shared_attrs or self._row.attributes
+            if source is None or source == EMPTY_JSON_OBJECT:
                 self._attributes = {}
             else:
-                self._attributes = json.loads(self._row.attributes)
+                self._attributes = json.loads(source)
         return self._attributes
 
     @property
@@ -756,6 +910,61 @@ class LazyEventPartialState:
         return self._time_fired_isoformat
 
 
+class LiveEventPartialState:
+    """A core Event with the interface of LazyEventPartialState."""
+
+    __slots__ = [
+        "data",
+        "attributes",
+        "time_fired_isoformat",
+        "event_type",
+        "entity_id",
+        "state",
+        "domain",
+        "context_id",
+        "context_user_id",
+        "context_parent_id",
+        "time_fired_minute",
+    ]
+
+    def __init__(self, event):
+        """Init the live event."""
+        self.data = event.data
+        self.event_type = event.event_type
+        self.context_id = event.context.id
+        self.context_user_id = event.context.user_id
+        self.context_parent_id = event.context.parent_id
+        self.time_fired_minute = event.time_fired.minute
+        self.time_fired_isoformat = process_timestamp_to_utc_isoformat(event.time_fired)
+
+        new_state = None
+        if event.event_type == EVENT_STATE_CHANGED:
+            new_state = event.data.get("new_state")
+        if new_state is None:
+            self.attributes = {}
+            self.entity_id = self.state = self.domain = None
+        else:
+            self.attributes = new_state.attributes
+            self.entity_id = new_state.entity_id
+            self.state = new_state.state
+            self.domain = new_state.domain
+
+    @property
+    def attributes_icon(self):
+        """Extract the icon from the attributes."""
+        return self.attributes.get(ATTR_ICON)
+
+    @property
+    def data_entity_id(self):
+        """Extract the entity id from the data."""
+        return self.data.get(ATTR_ENTITY_ID)
+
+    @property
+    def data_domain(self):
+        """Extract the domain from the data."""
+        return self.data.get(ATTR_DOMAIN)
+
+
 class EntityAttributeCache:
     """A cache to lookup static entity_id attribute.
 
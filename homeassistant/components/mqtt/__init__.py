@@ -1,6 +1,6 @@
 """Support for MQTT message handling."""
 import asyncio
-from functools import lru_cache, partial, wraps
+from functools import partial, wraps
 import inspect
 from itertools import groupby
 import logging
@@ -8,7 +8,7 @@ from operator import attrgetter
 import os
 import ssl
 import time
-from typing import Any, Callable, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Union
 import uuid
 
 import attr
@@ -50,6 +50,7 @@ from .const import (
     CONF_BROKER,
     CONF_QOS,
     CONF_RETAIN,
+    CONF_SHARE_TEMPLATE_RENDERS,
     CONF_STATE_TOPIC,
     CONF_WILL_MESSAGE,
     DATA_MQTT_CONFIG,
@@ -58,6 +59,7 @@ from .const import (
     DEFAULT_PREFIX,
     DEFAULT_QOS,
     DEFAULT_RETAIN,
+    DEFAULT_SHARE_TEMPLATE_RENDERS,
     DEFAULT_WILL,
     DOMAIN,
     MQTT_CONNECTED,
@@ -65,7 +67,8 @@ from .const import (
     PROTOCOL_311,
 )
 from .discovery import LAST_DISCOVERY
-from .models import Message, MessageCallbackType, PublishPayloadType
+from .models import Message, MessageCallbackType, PayloadCache, PublishPayloadType
+from .topic_trie import TopicTrie
 from .util import _VALID_QOS_SCHEMA, valid_publish_topic, valid_subscribe_topic
 
 _LOGGER = logging.getLogger(__name__)
@@ -187,6 +190,10 @@ CONFIG_SCHEMA = vol.Schema(
                     vol.Optional(
                         CONF_DISCOVERY_PREFIX, default=DEFAULT_PREFIX
                     ): valid_publish_topic,
+                    vol.Optional(
+                        CONF_SHARE_TEMPLATE_RENDERS,
+                        default=DEFAULT_SHARE_TEMPLATE_RENDERS,
+                    ): cv.boolean,
                 }
             ),
         )
@@ -390,6 +397,7 @@ async def async_setup(hass: HomeAssistantType, config: ConfigType) -> bool:
     websocket_api.async_register_command(hass, websocket_subscribe)
     websocket_api.async_register_command(hass, websocket_remove_device)
     websocket_api.async_register_command(hass, websocket_mqtt_info)
+    websocket_api.async_register_command(hass, websocket_discovery_stats)
 
     if conf is None:
         # If we have a config entry, setup is done by that config entry.
@@ -529,7 +537,6 @@ class Subscription:
     """Class to hold data about an active subscription."""
 
     topic: str = attr.ib()
-    matcher: Any = attr.ib()
     job: HassJob = attr.ib()
     qos: int = attr.ib(default=0)
     encoding: str = attr.ib(default="utf-8")
@@ -553,6 +560,7 @@ class MQTT:
         self.config_entry = config_entry
         self.conf = conf
         self.subscriptions: List[Subscription] = []
+        self._subscriptions_trie = TopicTrie()
         self.connected = False
         self._ha_started = asyncio.Event()
         self._last_subscribe = time.time()
@@ -739,11 +747,9 @@ class MQTT:
         if not isinstance(topic, str):
             raise HomeAssistantError("Topic needs to be a string!")
 
-        subscription = Subscription(
-            topic, _matcher_for_topic(topic), HassJob(msg_callback), qos, encoding
-        )
+        subscription = Subscription(topic, HassJob(msg_callback), qos, encoding)
         self.subscriptions.append(subscription)
-        self._matching_subscriptions.cache_clear()
+        self._subscriptions_trie.add(topic, subscription)
 
         # Only subscribe if currently connected.
         if self.connected:
@@ -756,7 +762,7 @@ class MQTT:
             if subscription not in self.subscriptions:
                 raise HomeAssistantError("Can't remove subscription twice")
             self.subscriptions.remove(subscription)
-            self._matching_subscriptions.cache_clear()
+            self._subscriptions_trie.remove(topic, subscription)
 
             if any(other.topic == topic for other in self.subscriptions):
                 # Other subscriptions on topic remaining - don't unsubscribe.
@@ -849,14 +855,6 @@ class MQTT:
         """Message received callback."""
         self.hass.add_job(self._mqtt_handle_message, msg)
 
-    @lru_cache(2048)
-    def _matching_subscriptions(self, topic):
-        subscriptions = []
-        for subscription in self.subscriptions:
-            if subscription.matcher(topic):
-                subscriptions.append(subscription)
-        return subscriptions
-
     @callback
     def _mqtt_handle_message(self, msg) -> None:
         _LOGGER.debug(
@@ -867,33 +865,44 @@ class MQTT:
         )
         timestamp = dt_util.utcnow()
 
-        subscriptions = self._matching_subscriptions(msg.topic)
+        subscriptions = self._subscriptions_trie.match(msg.topic)
+        share_renders = self.conf.get(
+            CONF_SHARE_TEMPLATE_RENDERS, DEFAULT_SHARE_TEMPLATE_RENDERS
+        )
+        # Subscribers using the same encoding share the decoded payload
+        payload_caches: Dict[Optional[str], PayloadCache] = {}
 
         for subscription in subscriptions:
 
-            payload: SubscribePayloadType = msg.payload
-            if subscription.encoding is not None:
-                try:
-                    payload = msg.payload.decode(subscription.encoding)
-                except (AttributeError, UnicodeDecodeError):
-                    _LOGGER.warning(
-                        "Can't decode payload %s on %s with encoding %s (for %s)",
-                        msg.payload[0:8192],
-                        msg.topic,
-                        subscription.encoding,
-                        subscription.job,
-                    )
-                    continue
+            payload_cache = payload_caches.get(subscription.encoding)
+            if payload_cache is None:
+                payload: SubscribePayloadType = msg.payload
+                if subscription.encoding is not None:
+                    try:
+                        payload = msg.payload.decode(subscription.encoding)
+                    except (AttributeError, UnicodeDecodeError):
+                        _LOGGER.warning(
+                            "Can't decode payload %s on %s with encoding %s (for %s)",
+                            msg.payload[0:8192],
+                            msg.topic,
+                            subscription.encoding,
+                            subscription.job,
+                        )
+                        continue
+                payload_cache = payload_caches[subscription.encoding] = PayloadCache(
+                    payload, share_renders
+                )
 
             self.hass.async_run_hass_job(
                 subscription.job,
                 Message(
                     msg.topic,
-                    payload,
+                    payload_cache.payload,
                     msg.qos,
                     msg.retain,
                     subscription.topic,
                     timestamp,
+                    payload_cache,
                 ),
             )
 
@@ -967,16 +976,6 @@ def _raise_on_error(result_code: int) -> None:
         )
 
 
-def _matcher_for_topic(subscription: str) -> Any:
-    # pylint: disable=import-outside-toplevel
-    from paho.mqtt.matcher import MQTTMatcher
-
-    matcher = MQTTMatcher()
-    matcher[subscription] = True
-
-    return lambda topic: next(matcher.iter_match(topic), False)
-
-
 @websocket_api.websocket_command(
     {vol.Required("type"): "mqtt/device/debug_info", vol.Required("device_id"): str}
 )
@@ -989,6 +988,14 @@ async def websocket_mqtt_info(hass, connection, msg):
     connection.send_result(msg["id"], mqtt_info)
 
 
+@callback
+@websocket_api.require_admin
+@websocket_api.websocket_command({vol.Required("type"): "mqtt/discovery/stats"})
+def websocket_discovery_stats(hass, connection, msg):
+    """Get MQTT discovery throughput and backlog."""
+    connection.send_result(msg["id"], discovery.async_get_discovery_stats(hass))
+
+
 @websocket_api.websocket_command(
     {vol.Required("type"): "mqtt/device/remove", vol.Required("device_id"): str}
 )
@@ -94,6 +94,9 @@ async def _async_setup_entity(
 class MqttBinarySensor(MqttEntity, BinarySensorEntity):
     """Representation a binary sensor that is updated by MQTT."""
 
+    # Name and device class only change with the configuration
+    _cache_static_attributes = True
+
     def __init__(self, hass, config, config_entry, discovery_data):
         """Initialize the MQTT binary sensor."""
         self._state = None
@@ -114,6 +117,7 @@ class MqttBinarySensor(MqttEntity, BinarySensorEntity):
 
     def _setup_from_config(self, config):
         self._config = config
+        self.async_invalidate_static_attributes()
         value_template = self._config.get(CONF_VALUE_TEMPLATE)
         if value_template is not None:
             value_template.hass = self.hass
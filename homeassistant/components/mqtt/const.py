@@ -13,6 +13,7 @@ CONF_BROKER = "broker"
 CONF_BIRTH_MESSAGE = "birth_message"
 CONF_QOS = ATTR_QOS
 CONF_RETAIN = ATTR_RETAIN
+CONF_SHARE_TEMPLATE_RENDERS = "share_template_renders"
 CONF_STATE_TOPIC = "state_topic"
 CONF_WILL_MESSAGE = "will_message"
 
@@ -25,6 +26,7 @@ DEFAULT_QOS = 0
 DEFAULT_PAYLOAD_AVAILABLE = "online"
 DEFAULT_PAYLOAD_NOT_AVAILABLE = "offline"
 DEFAULT_RETAIN = False
+DEFAULT_SHARE_TEMPLATE_RENDERS = False
 
 DEFAULT_BIRTH = {
     ATTR_TOPIC: DEFAULT_BIRTH_WILL_TOPIC,
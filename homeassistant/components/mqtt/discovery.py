@@ -6,8 +6,11 @@ import json
 import logging
 import re
 import time
+from timeit import default_timer as timer
+from typing import Any, Dict, List, Tuple
 
 from homeassistant.const import CONF_DEVICE, CONF_PLATFORM
+from homeassistant.core import callback
 from homeassistant.helpers.dispatcher import (
     async_dispatcher_connect,
     async_dispatcher_send,
@@ -61,6 +64,7 @@ MQTT_DISCOVERY_UPDATED = "mqtt_discovery_updated_{}"
 MQTT_DISCOVERY_NEW = "mqtt_discovery_new_{}_{}"
 MQTT_DISCOVERY_DONE = "mqtt_discovery_done_{}"
 LAST_DISCOVERY = "mqtt_last_discovery"
+DISCOVERY_STATS = "mqtt_discovery_stats"
 
 TOPIC_BASE = "~"
 
@@ -79,14 +83,55 @@ class MQTTConfig(dict):
     """Dummy class to allow adding attributes."""
 
 
+class DiscoveryStats:
+    """Throughput and backlog of the discovery message processing."""
+
+    def __init__(self) -> None:
+        """Initialize the statistics."""
+        self.backlog = 0
+        self.max_backlog = 0
+        self.batches = 0
+        self.payloads = 0
+        self.max_batch_size = 0
+        self.processing_time = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the statistics as a dictionary."""
+        return {
+            "backlog": self.backlog,
+            "max_backlog": self.max_backlog,
+            "batches": self.batches,
+            "payloads": self.payloads,
+            "max_batch_size": self.max_batch_size,
+            "processing_time": self.processing_time,
+            "payloads_per_second": self.payloads / self.processing_time
+            if self.processing_time
+            else None,
+        }
+
+
+@callback
+def async_get_discovery_stats(hass: HomeAssistantType) -> Dict[str, Any]:
+    """Return the statistics of the discovery message processing."""
+    stats = hass.data.get(DISCOVERY_STATS)
+    return DiscoveryStats().as_dict() if stats is None else stats.as_dict()
+
+
 async def async_start(
     hass: HomeAssistantType, discovery_topic, config_entry=None
 ) -> bool:
     """Start MQTT Discovery."""
     mqtt_integrations = {}
-
-    async def async_discovery_message_received(msg):
-        """Process the received message."""
+    stats = hass.data[DISCOVERY_STATS] = DiscoveryStats()
+    # Discovery payloads waiting to be processed, they are processed in
+    # batches so a burst of retained config messages after (re)connecting
+    # sets up each platform once and adds its entities together.
+    queue: List[Tuple[str, str, MQTTConfig]] = []
+    batch_lock = asyncio.Lock()
+
+    @callback
+    def async_discovery_message_received(msg):
+        """Queue the received message for processing."""
         hass.data[LAST_DISCOVERY] = time.time()
         payload = msg.payload
         topic = msg.topic
@@ -148,17 +193,99 @@ async def async_start(
 
             payload[CONF_PLATFORM] = "mqtt"
 
-        if discovery_hash in hass.data[PENDING_DISCOVERED]:
-            pending = hass.data[PENDING_DISCOVERED][discovery_hash]["pending"]
-            pending.appendleft(payload)
-            _LOGGER.info(
-                "Component has already been discovered: %s %s, queuing update",
-                component,
-                discovery_id,
-            )
+        if not queue:
+            hass.async_create_task(async_process_discovery_batch())
+        queue.append((component, discovery_id, payload))
+        stats.backlog = len(queue)
+        stats.max_backlog = max(stats.max_backlog, stats.backlog)
+
+    async def async_process_discovery_batch():
+        """Process the queued discovery payloads in the order received.
+
+        A payload or platform that fails is logged and does not stop the
+        rest of the batch from being processed.
+        """
+        async with batch_lock:
+            batch = queue[:]
+            queue.clear()
+            stats.backlog = 0
+            start = timer()
+
+            try:
+                # Set up the platforms of new components before adding any of them
+                components = list(
+                    {
+                        component
+                        for component, _, payload in batch
+                        if payload
+                        and f"{component}.mqtt" not in hass.data[CONFIG_ENTRY_IS_SETUP]
+                    }
+                )
+                if components:
+                    async with hass.data[DATA_CONFIG_ENTRY_LOCK]:
+                        results = await asyncio.gather(
+                            *(async_setup_component_entry(comp) for comp in components),
+                            return_exceptions=True,
+                        )
+                    for component, result in zip(components, results):
+                        if isinstance(result, Exception):
+                            _LOGGER.error(
+                                "Error setting up the MQTT platform of %s",
+                                component,
+                                exc_info=result,
+                            )
+
+                for component, discovery_id, payload in batch:
+                    discovery_hash = (component, discovery_id)
+                    if discovery_hash in hass.data[PENDING_DISCOVERED]:
+                        pending = hass.data[PENDING_DISCOVERED][discovery_hash][
+                            "pending"
+                        ]
+                        pending.appendleft(payload)
+                        _LOGGER.info(
+                            "Component has already been discovered: %s %s, queuing update",
+                            component,
+                            discovery_id,
+                        )
+                        continue
+
+                    try:
+                        await async_process_discovery_payload(
+                            component, discovery_id, payload
+                        )
+                    except Exception:  # pylint: disable=broad-except
+                        _LOGGER.exception(
+                            "Error processing the discovery payload of %s %s",
+                            component,
+                            discovery_id,
+                        )
+            finally:
+                stats.batches += 1
+                stats.payloads += len(batch)
+                stats.max_batch_size = max(stats.max_batch_size, len(batch))
+                stats.processing_time += timer() - start
+
+    async def async_setup_component_entry(component):
+        """Set up the MQTT platform of a component."""
+        config_entries_key = f"{component}.mqtt"
+        if config_entries_key in hass.data[CONFIG_ENTRY_IS_SETUP]:
             return
 
-        await async_process_discovery_payload(component, discovery_id, payload)
+        if component == "device_automation":
+            # Local import to avoid circular dependencies
+            # pylint: disable=import-outside-toplevel
+            from . import device_automation
+
+            await device_automation.async_setup_entry(hass, config_entry)
+        elif component == "tag":
+            # Local import to avoid circular dependencies
+            # pylint: disable=import-outside-toplevel
+            from . import tag
+
+            await tag.async_setup_entry(hass, config_entry)
+        else:
+            await hass.config_entries.async_forward_entry_setup(config_entry, component)
+        hass.data[CONFIG_ENTRY_IS_SETUP].add(config_entries_key)
 
     async def async_process_discovery_payload(component, discovery_id, payload):
 
@@ -203,26 +330,8 @@ async def async_start(
             _LOGGER.info("Found new component: %s %s", component, discovery_id)
             hass.data[ALREADY_DISCOVERED][discovery_hash] = None
 
-            config_entries_key = f"{component}.mqtt"
             async with hass.data[DATA_CONFIG_ENTRY_LOCK]:
-                if config_entries_key not in hass.data[CONFIG_ENTRY_IS_SETUP]:
-                    if component == "device_automation":
-                        # Local import to avoid circular dependencies
-                        # pylint: disable=import-outside-toplevel
-                        from . import device_automation
-
-                        await device_automation.async_setup_entry(hass, config_entry)
-                    elif component == "tag":
-                        # Local import to avoid circular dependencies
-                        # pylint: disable=import-outside-toplevel
-                        from . import tag
-
-                        await tag.async_setup_entry(hass, config_entry)
-                    else:
-                        await hass.config_entries.async_forward_entry_setup(
-                            config_entry, component
-                        )
-                    hass.data[CONFIG_ENTRY_IS_SETUP].add(config_entries_key)
+                await async_setup_component_entry(component)
 
             async_dispatcher_send(
                 hass, MQTT_DISCOVERY_NEW.format(component, "mqtt"), payload
@@ -195,8 +195,10 @@ class MqttAttributes(Entity):
             try:
                 payload = msg.payload
                 if attr_tpl is not None:
-                    payload = attr_tpl.async_render_with_possible_json_value(payload)
-                json_dict = json.loads(payload)
+                    payload = msg.render_template(attr_tpl)
+                    json_dict = json.loads(payload)
+                else:
+                    json_dict = msg.payload_json()
                 if isinstance(json_dict, dict):
                     self._attributes = json_dict
                     self.async_write_ha_state()
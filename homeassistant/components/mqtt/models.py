@@ -1,11 +1,61 @@
 """Modesl used by multiple MQTT modules."""
 import datetime as dt
-from typing import Callable, Optional, Union
+import json
+from typing import Any, Callable, Dict, Optional, Union
 
 import attr
 
+from homeassistant.helpers.template import Template
+
 PublishPayloadType = Union[str, bytes, int, float, None]
 
+_SENTINEL = object()
+_RENDER_FAILED = object()
+
+
+class PayloadCache:
+    """Decoded payload of a received message shared by its subscribers.
+
+    The payload is parsed as JSON at most once, and when template renders are
+    shared, identical templates are rendered at most once per message.
+    """
+
+    __slots__ = ("payload", "share_renders", "_json", "_json_error", "_renders")
+
+    def __init__(self, payload: Any, share_renders: bool = False) -> None:
+        """Initialize the payload cache."""
+        self.payload = payload
+        self.share_renders = share_renders
+        self._json: Any = _SENTINEL
+        self._json_error: Optional[str] = None
+        self._renders: Dict[str, Any] = {}
+
+    def json(self) -> Any:
+        """Return the payload parsed as JSON."""
+        if self._json is _SENTINEL:
+            try:
+                self._json = json.loads(self.payload)
+            except (ValueError, TypeError) as err:
+                self._json = None
+                self._json_error = str(err)
+        if self._json_error is not None:
+            raise ValueError(self._json_error)
+        return self._json
+
+    def render(self, template: Template) -> Any:
+        """Render a template with the payload exposed.
+
+        Returns _RENDER_FAILED if the template could not be rendered.
+        """
+        result = self._renders.get(template.template, _SENTINEL)
+        if result is _SENTINEL:
+            result = self._renders[
+                template.template
+            ] = template.async_render_with_possible_json_value(
+                self.payload, _RENDER_FAILED
+            )
+        return result
+
 
 @attr.s(slots=True, frozen=True)
 class Message:
@@ -17,6 +67,34 @@ class Message:
     retain: bool = attr.ib()
     subscribed_topic: Optional[str] = attr.ib(default=None)
     timestamp: Optional[dt.datetime] = attr.ib(default=None)
+    payload_cache: Optional[PayloadCache] = attr.ib(default=None, eq=False, repr=False)
+
+    def payload_json(self) -> Any:
+        """Return the payload parsed as JSON.
+
+        The parsed value is shared with the other subscribers of the message
+        and must not be modified. Raises ValueError if the payload is not valid
+        JSON.
+        """
+        if self.payload_cache is None:
+            return json.loads(self.payload)  # type: ignore[arg-type]
+        return self.payload_cache.json()
+
+    def render_template(self, template: Template, error_value: Any = _SENTINEL) -> Any:
+        """Render a value template with the payload exposed.
+
+        If the MQTT integration is configured to share template renders, the
+        result is reused by the subscribers of the message rendering the same
+        template.
+        """
+        if self.payload_cache is not None and self.payload_cache.share_renders:
+            result = self.payload_cache.render(template)
+            if result is not _RENDER_FAILED:
+                return result
+        # Render again on failure so the error is handled as requested
+        if error_value is _SENTINEL:
+            return template.async_render_with_possible_json_value(self.payload)
+        return template.async_render_with_possible_json_value(self.payload, error_value)
 
 
 MessageCallbackType = Callable[[Message], None]
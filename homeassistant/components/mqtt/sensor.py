@@ -88,6 +88,9 @@ async def _async_setup_entity(
 class MqttSensor(MqttEntity, Entity):
     """Representation of a sensor that can be updated using MQTT."""
 
+    # Name, icon and device class only change with the configuration
+    _cache_static_attributes = True
+
     def __init__(self, hass, config, config_entry, discovery_data):
         """Initialize the sensor."""
         self._state = None
@@ -109,6 +112,7 @@ class MqttSensor(MqttEntity, Entity):
     def _setup_from_config(self, config):
         """(Re)Setup the entity."""
         self._config = config
+        self.async_invalidate_static_attributes()
         template = self._config.get(CONF_VALUE_TEMPLATE)
         if template is not None:
             template.hass = self.hass
@@ -141,9 +145,7 @@ class MqttSensor(MqttEntity, Entity):
 
             template = self._config.get(CONF_VALUE_TEMPLATE)
             if template is not None:
-                payload = template.async_render_with_possible_json_value(
-                    payload, self._state
-                )
+                payload = msg.render_template(template, self._state)
             self._state = payload
             self.async_write_ha_state()
 
@@ -0,0 +1,118 @@
+"""Match MQTT topics against subscription filters."""
+from operator import itemgetter
+from typing import Any, Dict, List, Tuple
+
+_SEQUENCE = itemgetter(0)
+
+
+class _TrieNode:
+    """A level of a topic filter."""
+
+    __slots__ = ("children", "items")
+
+    def __init__(self) -> None:
+        """Initialize the node."""
+        self.children: Dict[str, _TrieNode] = {}
+        self.items: List[Tuple[int, Any]] = []
+
+
+class TopicTrie:
+    """Trie of MQTT topic filters.
+
+    Each level of a filter is a node, wildcards included, so matching a
+    topic only visits the filters that can match it instead of testing
+    every filter. Matches follow the MQTT specification: "+" matches a
+    single level, "#" matches the parent level and any levels below it,
+    and wildcards at the first level don't match topics starting with "$".
+
+    Items are returned in the order they were added.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the trie."""
+        self._root = _TrieNode()
+        self._sequence = 0
+        self._len = 0
+
+    def __len__(self) -> int:
+        """Return the number of items in the trie."""
+        return self._len
+
+    def add(self, topic_filter: str, item: Any) -> None:
+        """Add an item for a topic filter."""
+        node = self._root
+        for level in topic_filter.split("/"):
+            child = node.children.get(level)
+            if child is None:
+                child = node.children[level] = _TrieNode()
+            node = child
+        self._sequence += 1
+        node.items.append((self._sequence, item))
+        self._len += 1
+
+    def remove(self, topic_filter: str, item: Any) -> None:
+        """Remove an item for a topic filter.
+
+        Raises KeyError if the item was not added for the filter.
+        """
+        path = [self._root]
+        for level in topic_filter.split("/"):
+            child = path[-1].children.get(level)
+            if child is None:
+                raise KeyError(topic_filter)
+            path.append(child)
+
+        items = path[-1].items
+        for idx, (_, other) in enumerate(items):
+            if other is item:
+                del items[idx]
+                break
+        else:
+            raise KeyError(topic_filter)
+        self._len -= 1
+
+        # Prune the nodes that no longer lead to any item
+        levels = topic_filter.split("/")
+        for idx in range(len(levels), 0, -1):
+            node = path[idx]
+            if node.items or node.children:
+                break
+            del path[idx - 1].children[levels[idx - 1]]
+
+    def match(self, topic: str) -> List[Any]:
+        """Return the items of all filters matching a topic."""
+        levels = topic.split("/")
+        wildcards = not topic.startswith("$")
+        matches: List[Tuple[int, Any]] = []
+        nodes = [self._root]
+
+        for level in levels:
+            next_nodes = []
+            for node in nodes:
+                children = node.children
+                if wildcards:
+                    multi_level = children.get("#")
+                    if multi_level is not None:
+                        matches.extend(multi_level.items)
+                    single_level = children.get("+")
+                    if single_level is not None:
+                        next_nodes.append(single_level)
+                child = children.get(level)
+                if child is not None:
+                    next_nodes.append(child)
+
+            if not next_nodes:
+                break
+            nodes = next_nodes
+            wildcards = True
+        else:
+            for node in nodes:
+                matches.extend(node.items)
+                # A filter ending in "#" also matches its parent level
+                multi_level = node.children.get("#")
+                if multi_level is not None:
+                    matches.extend(multi_level.items)
+
+        if len(matches) > 1:
+            matches.sort(key=_SEQUENCE)
+        return [item for _, item in matches]
@@ -1,5 +1,4 @@
 """Offer MQTT listening automation rules."""
-import json
 import logging
 
 import voluptuous as vol
@@ -66,7 +65,7 @@ async def async_attach_trigger(hass, config, action, automation_info):
             }
 
             try:
-                data["payload_json"] = json.loads(mqttmsg.payload)
+                data["payload_json"] = mqttmsg.payload_json()
             except ValueError:
                 pass
 
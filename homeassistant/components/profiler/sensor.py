@@ -0,0 +1,108 @@
+"""Sensors reporting the health of the event loop."""
+from datetime import timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import TIME_MILLISECONDS
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.loop_monitor import LoopMonitor, async_get_loop_monitor
+
+SCAN_INTERVAL = timedelta(seconds=10)
+
+ATTR_TOP_OFFENDERS = "top_offenders"
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: Callable[[List[Entity]], None],
+) -> None:
+    """Set up the event loop sensors."""
+    monitor = async_get_loop_monitor(hass)
+    async_add_entities(
+        [
+            EventLoopLagSensor(entry.entry_id, monitor),
+            EventLoopStallsSensor(entry.entry_id, monitor),
+        ]
+    )
+
+
+class EventLoopSensor(Entity):
+    """Base class of the event loop sensors."""
+
+    _name = ""
+    _key = ""
+
+    def __init__(self, entry_id: str, monitor: LoopMonitor) -> None:
+        """Initialize the sensor."""
+        self._entry_id = entry_id
+        self._monitor = monitor
+
+    @property
+    def name(self) -> str:
+        """Return the name of the sensor."""
+        return self._name
+
+    @property
+    def unique_id(self) -> str:
+        """Return the unique id of the sensor."""
+        return f"{self._entry_id}_{self._key}"
+
+
+class EventLoopLagSensor(EventLoopSensor):
+    """Largest lag of the event loop since the previous update."""
+
+    _name = "Event loop lag"
+    _key = "event_loop_lag"
+
+    def __init__(self, entry_id: str, monitor: LoopMonitor) -> None:
+        """Initialize the sensor."""
+        super().__init__(entry_id, monitor)
+        self._state: Optional[float] = None
+
+    @property
+    def state(self) -> Optional[float]:
+        """Return the largest lag in milliseconds."""
+        return self._state
+
+    @property
+    def unit_of_measurement(self) -> str:
+        """Return the unit of measurement."""
+        return TIME_MILLISECONDS
+
+    @property
+    def icon(self) -> str:
+        """Return the icon."""
+        return "mdi:timer-sand"
+
+    async def async_update(self) -> None:
+        """Collect the largest lag since the previous update."""
+        self._state = round(self._monitor.async_pop_max_lag() * 1000, 1)
+
+
+class EventLoopStallsSensor(EventLoopSensor):
+    """Number of times the event loop stalled."""
+
+    _name = "Event loop stalls"
+    _key = "event_loop_stalls"
+
+    @property
+    def state(self) -> int:
+        """Return the number of stalls."""
+        return self._monitor.stall_count
+
+    @property
+    def icon(self) -> str:
+        """Return the icon."""
+        return "mdi:speedometer-slow"
+
+    @property
+    def device_state_attributes(self) -> Dict[str, Any]:
+        """Return the integrations that stalled the event loop the longest."""
+        return {
+            ATTR_TOP_OFFENDERS: {
+                stalls.integration: stalls.count
+                for stalls in self._monitor.async_top_offenders()
+            }
+        }
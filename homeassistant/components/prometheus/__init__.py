@@ -1,4 +1,5 @@
 """Support for Prometheus metrics export."""
+from concurrent.futures import ThreadPoolExecutor
 import logging
 import string
 
@@ -18,6 +19,9 @@ from homeassistant.components.humidifier.const import (
     ATTR_HUMIDITY,
     ATTR_MODE,
 )
+from homeassistant.components.websocket_api.const import (
+    DATA_HANDLERS as WEBSOCKET_HANDLERS,
+)
 from homeassistant.const import (
     ATTR_BATTERY_LEVEL,
     ATTR_DEVICE_CLASS,
@@ -32,9 +36,18 @@ from homeassistant.const import (
     TEMP_CELSIUS,
     TEMP_FAHRENHEIT,
 )
+from homeassistant.core import callback
 from homeassistant.helpers import entityfilter, state as state_helper
 import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.entity_platform import DATA_ENTITY_PLATFORM
 from homeassistant.helpers.entity_values import EntityValues
+from homeassistant.helpers.event import async_template_render_stats
+from homeassistant.helpers.poll_scheduler import async_get_poll_scheduler
+from homeassistant.helpers.storage import async_get_storage_metrics
+from homeassistant.helpers.template import (
+    async_get_render_durations,
+    template_cache_stats,
+)
 from homeassistant.util.temperature import fahrenheit_to_celsius
 
 _LOGGER = logging.getLogger(__name__)
@@ -49,6 +62,12 @@ CONF_COMPONENT_CONFIG_GLOB = "component_config_glob"
 CONF_COMPONENT_CONFIG_DOMAIN = "component_config_domain"
 CONF_DEFAULT_METRIC = "default_metric"
 CONF_OVERRIDE_METRIC = "override_metric"
+CONF_INTERNAL_METRICS = "internal_metrics"
+
+# Prefix of the metrics of the Home Assistant runtime
+INTERNAL_PREFIX = "homeassistant_"
+# Key of the recorder instance, not imported as the recorder requires SQLAlchemy
+RECORDER_INSTANCE = "recorder_instance"
 COMPONENT_CONFIG_SCHEMA_ENTRY = vol.Schema(
     {vol.Optional(CONF_OVERRIDE_METRIC): cv.string}
 )
@@ -61,6 +80,7 @@ CONFIG_SCHEMA = vol.Schema(
                 vol.Optional(CONF_PROM_NAMESPACE): cv.string,
                 vol.Optional(CONF_DEFAULT_METRIC): cv.string,
                 vol.Optional(CONF_OVERRIDE_METRIC): cv.string,
+                vol.Optional(CONF_INTERNAL_METRICS, default=True): cv.boolean,
                 vol.Optional(CONF_COMPONENT_CONFIG, default={}): vol.Schema(
                     {cv.entity_id: COMPONENT_CONFIG_SCHEMA_ENTRY}
                 ),
@@ -79,8 +99,6 @@ CONFIG_SCHEMA = vol.Schema(
 
 def setup(hass, config):
     """Activate Prometheus component."""
-    hass.http.register_view(PrometheusView(prometheus_client))
-
     conf = config[DOMAIN]
     entity_filter = conf[CONF_FILTER]
     namespace = conf.get(CONF_PROM_NAMESPACE)
@@ -102,13 +120,42 @@ def setup(hass, config):
         override_metric,
         default_metric,
     )
-
-    hass.bus.listen(EVENT_STATE_CHANGED, metrics.handle_event)
+    runtime_metrics = None
+    if conf[CONF_INTERNAL_METRICS]:
+        runtime_metrics = RuntimeMetrics(hass, prometheus_client, namespace)
+
+    hass.http.register_view(PrometheusView(prometheus_client, metrics, runtime_metrics))
+
+    entities = entity_filter.entity_ids_and_domains
+    if entities is None:
+        hass.bus.listen(EVENT_STATE_CHANGED, metrics.handle_event)
+    else:
+        entity_ids, domains = entities
+        hass.bus.listen_entities(
+            EVENT_STATE_CHANGED, metrics.handle_event, entity_ids, domains
+        )
     return True
 
 
+class _SingleMetric:
+    """Collector of a single metric, to serialize it on its own."""
+
+    def __init__(self, metric):
+        """Initialize the collector."""
+        self._metric = metric
+
+    def collect(self):
+        """Return the metric families of the metric."""
+        return self._metric.collect()
+
+
 class PrometheusMetrics:
-    """Model all of the metrics which should be exposed to Prometheus."""
+    """Model all of the metrics which should be exposed to Prometheus.
+
+    The metrics are kept in their own registry and serialized one metric at a
+    time, so a scrape only serializes again the metrics that were updated
+    since the previous scrape.
+    """
 
     def __init__(
         self,
@@ -140,7 +187,24 @@ class PrometheusMetrics:
             self.metrics_prefix = ""
         self._metrics = {}
         self._climate_units = climate_units
+        self._registry = prometheus_cli.CollectorRegistry(auto_describe=True)
+        # Metrics updated since they were last serialized
+        self._dirty = set()
+        self._serialized = {}
+
+    def serialize(self):
+        """Return the metrics in the Prometheus text format.
+
+        This method must be run in the event loop.
+        """
+        for metric in self._dirty:
+            self._serialized[metric] = self.prometheus_cli.generate_latest(
+                _SingleMetric(self._metrics[metric])
+            )
+        self._dirty.clear()
+        return b"".join(self._serialized.values())
 
+    @callback
     def handle_event(self, event):
         """Listen for new messages on the bus, and add them to Prometheus."""
         state = event.data.get("new_state")
@@ -198,13 +262,16 @@ class PrometheusMetrics:
         if extra_labels is not None:
             labels.extend(extra_labels)
 
+        self._dirty.add(metric)
         try:
             return self._metrics[metric]
         except KeyError:
             full_metric_name = self._sanitize_metric_name(
                 f"{self.metrics_prefix}{metric}"
             )
-            self._metrics[metric] = factory(full_metric_name, documentation, labels)
+            self._metrics[metric] = factory(
+                full_metric_name, documentation, labels, registry=self._registry
+            )
             return self._metrics[metric]
 
     @staticmethod
@@ -473,21 +540,300 @@ class PrometheusMetrics:
         metric.labels(**self._labels(state)).inc()
 
 
+class RuntimeMetrics:
+    """Metrics of the Home Assistant runtime.
+
+    The metrics are read from the statistics kept by the event bus, the
+    recorder, the websocket API, the template engine, the executor, the
+    entity platforms, the poll scheduler and the stores when Prometheus
+    scrapes them.
+    """
+
+    def __init__(self, hass, prometheus_cli, namespace):
+        """Initialize the runtime metrics."""
+        self.hass = hass
+        self.prometheus_cli = prometheus_cli
+        self._prefix = (
+            f"{namespace}_{INTERNAL_PREFIX}" if namespace else INTERNAL_PREFIX
+        )
+        self._registry = prometheus_cli.CollectorRegistry(auto_describe=True)
+        self._registry.register(self)
+
+    def serialize(self):
+        """Return the metrics in the Prometheus text format.
+
+        This method must be run in the event loop.
+        """
+        return self.prometheus_cli.generate_latest(self._registry)
+
+    @staticmethod
+    def describe():
+        """Return no description so the registry does not collect on register."""
+        return []
+
+    def collect(self):
+        """Return the metric families read from the runtime."""
+        yield from self._collect_event_bus()
+        yield from self._collect_recorder()
+        yield from self._collect_websocket()
+        yield from self._collect_templates()
+        yield from self._collect_executor()
+        yield from self._collect_entity_platforms()
+        yield from self._collect_storage()
+
+    def _gauge(self, name, documentation, value=None, labels=None):
+        return self.prometheus_cli.metrics_core.GaugeMetricFamily(
+            f"{self._prefix}{name}", documentation, value=value, labels=labels
+        )
+
+    def _counter(self, name, documentation, value=None, labels=None):
+        return self.prometheus_cli.metrics_core.CounterMetricFamily(
+            f"{self._prefix}{name}", documentation, value=value, labels=labels
+        )
+
+    def _histogram(self, name, documentation, labels=None):
+        return self.prometheus_cli.metrics_core.HistogramMetricFamily(
+            f"{self._prefix}{name}", documentation, labels=labels
+        )
+
+    def _collect_event_bus(self):
+        fired = self._counter(
+            "events_fired",
+            "The number of events fired on the event bus",
+            labels=["event_type"],
+        )
+        for event_type, count in self.hass.bus.async_fired().items():
+            fired.add_metric([event_type], count)
+        yield fired
+
+        listeners = self._gauge(
+            "event_bus_listeners",
+            "The number of listeners of the event bus",
+            labels=["event_type"],
+        )
+        for event_type, count in self.hass.bus.async_listeners().items():
+            listeners.add_metric([event_type], count)
+        yield listeners
+
+    def _collect_recorder(self):
+        instance = self.hass.data.get(RECORDER_INSTANCE)
+        if instance is None:
+            return
+        yield self._gauge(
+            "recorder_queue_size",
+            "The number of events waiting to be recorded",
+            value=instance.queue.qsize(),
+        )
+        commits = self._histogram(
+            "recorder_commit_duration_seconds",
+            "The duration of the commits of the recorder",
+        )
+        durations = instance.commit_durations
+        commits.add_metric([], durations.cumulative_buckets(), durations.sum)
+        yield commits
+
+    def _collect_websocket(self):
+        handlers = self.hass.data.get(WEBSOCKET_HANDLERS, ())
+        pending = [
+            handler.async_get_stats()["pending_messages"] for handler in handlers
+        ]
+        yield self._gauge(
+            "websocket_connections",
+            "The number of open websocket connections",
+            value=len(pending),
+        )
+        yield self._gauge(
+            "websocket_send_queue_messages",
+            "The number of messages waiting to be sent to the websocket connections",
+            value=sum(pending),
+        )
+        yield self._gauge(
+            "websocket_send_queue_max_messages",
+            "The largest number of messages waiting to be sent to a connection",
+            value=max(pending, default=0),
+        )
+
+    def _collect_templates(self):
+        renders = self._histogram(
+            "template_render_duration_seconds",
+            "The duration of the template renders",
+        )
+        durations = async_get_render_durations(self.hass)
+        renders.add_metric([], durations.cumulative_buckets(), durations.sum)
+        yield renders
+
+        labels = ["environment"]
+        cache_size = self._gauge(
+            "template_cache_size",
+            "The number of compiled templates in the template cache",
+            labels=labels,
+        )
+        cache_hits = self._counter(
+            "template_cache_hits",
+            "The number of templates found compiled in the template cache",
+            labels=labels,
+        )
+        cache_misses = self._counter(
+            "template_cache_misses",
+            "The number of templates that were not in the template cache",
+            labels=labels,
+        )
+        cache_evictions = self._counter(
+            "template_cache_evictions",
+            "The number of compiled templates evicted from the template cache",
+            labels=labels,
+        )
+        for environment, cache_stats in template_cache_stats(self.hass).items():
+            cache_size.add_metric([environment], cache_stats["size"])
+            cache_hits.add_metric([environment], cache_stats["hits"])
+            cache_misses.add_metric([environment], cache_stats["misses"])
+            cache_evictions.add_metric([environment], cache_stats["evictions"])
+        yield from (cache_size, cache_hits, cache_misses, cache_evictions)
+
+        stats = async_template_render_stats(self.hass)
+        yield self._gauge(
+            "template_rerender_queue_size",
+            "The number of template trackers waiting to be re-rendered",
+            value=stats["queue_depth"],
+        )
+        yield self._gauge(
+            "template_rerender_queue_max_size",
+            "The largest number of template trackers re-rendered together",
+            value=stats["max_queue_depth"],
+        )
+        yield self._counter(
+            "template_rerenders_coalesced",
+            "The number of state changes merged into a pending template re-render",
+            value=stats["coalesced"],
+        )
+        yield self.prometheus_cli.metrics_core.SummaryMetricFamily(
+            f"{self._prefix}template_rerender_latency_seconds",
+            "The time from a state change until the templates it made dirty "
+            "were re-rendered",
+            count_value=stats["renders"],
+            sum_value=stats["total_latency"],
+        )
+
+    def _collect_executor(self):
+        # pylint: disable=protected-access
+        executor = getattr(self.hass.loop, "_default_executor", None)
+        if not isinstance(executor, ThreadPoolExecutor):
+            return
+        yield self._gauge(
+            "executor_max_workers",
+            "The largest number of threads of the executor",
+            value=executor._max_workers,
+        )
+        yield self._gauge(
+            "executor_threads",
+            "The number of threads of the executor",
+            value=len(executor._threads),
+        )
+        yield self._gauge(
+            "executor_queue_size",
+            "The number of jobs waiting for a thread of the executor",
+            value=executor._work_queue.qsize(),
+        )
+
+    def _collect_entity_platforms(self):
+        updates = self._histogram(
+            "entity_platform_update_duration_seconds",
+            "The duration of the updates of the polling entities of a platform",
+            labels=["domain", "platform"],
+        )
+        for platforms in self.hass.data.get(DATA_ENTITY_PLATFORM, {}).values():
+            for platform in platforms:
+                durations = platform.update_durations
+                if not durations.count:
+                    continue
+                updates.add_metric(
+                    [platform.domain, platform.platform_name],
+                    durations.cumulative_buckets(),
+                    durations.sum,
+                )
+        yield updates
+
+        labels = ["domain", "platform"]
+        polls = self._counter(
+            "entity_platform_polls",
+            "The number of polls of the entities of a platform",
+            labels=labels,
+        )
+        failures = self._counter(
+            "entity_platform_poll_failures",
+            "The number of polls of the entities of a platform that failed",
+            labels=labels,
+        )
+        overruns = self._counter(
+            "entity_platform_poll_overruns",
+            "The number of polls skipped because the previous one was still running",
+            labels=labels,
+        )
+        entities = self._gauge(
+            "entity_platform_polling_entities",
+            "The number of polling entities of a platform",
+            labels=labels,
+        )
+        backed_off = self._gauge(
+            "entity_platform_backed_off_entities",
+            "The number of entities of a platform polled less often than configured",
+            labels=labels,
+        )
+        for stats in async_get_poll_scheduler(self.hass).async_get_stats():
+            label_values = [stats["domain"], stats["platform"]]
+            polls.add_metric(label_values, stats["polls"])
+            failures.add_metric(label_values, stats["failures"])
+            overruns.add_metric(label_values, stats["overruns"])
+            entities.add_metric(label_values, stats["entities"])
+            backed_off.add_metric(label_values, stats["backed_off"])
+        yield from (polls, failures, overruns, entities, backed_off)
+
+    def _collect_storage(self):
+        labels = ["key"]
+        writes = self._counter(
+            "storage_writes", "The number of writes of a store", labels=labels
+        )
+        written = self._counter(
+            "storage_written_bytes",
+            "The number of bytes written by a store",
+            labels=labels,
+        )
+        last_write = self._gauge(
+            "storage_last_write_bytes",
+            "The size of the last write of a store",
+            labels=labels,
+        )
+        serialize = self._counter(
+            "storage_serialize_seconds",
+            "The time spent serializing the data of a store",
+            labels=labels,
+        )
+        for key, metrics in async_get_storage_metrics(self.hass).items():
+            writes.add_metric([key], metrics["write_count"])
+            written.add_metric([key], metrics["total_write_size"])
+            last_write.add_metric([key], metrics["last_write_size"])
+            serialize.add_metric([key], metrics["total_serialize_time"])
+        yield from (writes, written, last_write, serialize)
+
+
 class PrometheusView(HomeAssistantView):
     """Handle Prometheus requests."""
 
     url = API_ENDPOINT
     name = "api:prometheus"
 
-    def __init__(self, prometheus_cli):
+    def __init__(self, prometheus_cli, metrics, runtime_metrics=None):
         """Initialize Prometheus view."""
         self.prometheus_cli = prometheus_cli
+        self.metrics = metrics
+        self.runtime_metrics = runtime_metrics
 
     async def get(self, request):
         """Handle request for Prometheus metrics."""
         _LOGGER.debug("Received Prometheus metrics request")
 
-        return web.Response(
-            body=self.prometheus_cli.generate_latest(),
-            content_type=CONTENT_TYPE_TEXT_PLAIN,
-        )
+        body = self.prometheus_cli.generate_latest() + self.metrics.serialize()
+        if self.runtime_metrics is not None:
+            body += self.runtime_metrics.serialize()
+
+        return web.Response(body=body, content_type=CONTENT_TYPE_TEXT_PLAIN)
@@ -1,8 +1,8 @@
 """Support for recording details."""
 import asyncio
-from collections import namedtuple
+from collections import OrderedDict, namedtuple
 import concurrent.futures
-from datetime import datetime
+from datetime import datetime, timedelta
 import logging
 import queue
 import threading
@@ -31,12 +31,20 @@ from homeassistant.helpers.entityfilter import (
     INCLUDE_EXCLUDE_FILTER_SCHEMA_INNER,
     convert_include_exclude_filter,
 )
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.typing import ConfigType
 import homeassistant.util.dt as dt_util
-
-from . import migration, purge
-from .const import CONF_DB_INTEGRITY_CHECK, DATA_INSTANCE, DOMAIN, SQLITE_URL_PREFIX
-from .models import Base, Events, RecorderRuns, States
+from homeassistant.util.histogram import Histogram
+
+from . import bulk, migration, purge, statistics
+from .const import (
+    CONF_DB_INTEGRITY_CHECK,
+    DATA_INSTANCE,
+    DOMAIN,
+    EVENT_RECORDER_PURGE_PROGRESS,
+    SQLITE_URL_PREFIX,
+)
+from .models import Base, Events, RecorderRuns, StateAttributes, States
 from .util import session_scope, validate_or_move_away_sqlite_database
 
 _LOGGER = logging.getLogger(__name__)
@@ -45,14 +53,20 @@ SERVICE_PURGE = "purge"
 
 ATTR_KEEP_DAYS = "keep_days"
 ATTR_REPACK = "repack"
+ATTR_CHUNK_SIZE = "chunk_size"
 
 SERVICE_PURGE_SCHEMA = vol.Schema(
     {
         vol.Optional(ATTR_KEEP_DAYS): cv.positive_int,
         vol.Optional(ATTR_REPACK, default=False): cv.boolean,
+        vol.Optional(ATTR_CHUNK_SIZE): vol.All(vol.Coerce(int), vol.Range(min=1)),
     }
 )
 
+PURGE_STORAGE_KEY = f"{DOMAIN}.purge"
+PURGE_STORAGE_VERSION = 1
+PURGE_PROGRESS_SAVE_DELAY = 10
+
 DEFAULT_URL = "sqlite:///{hass_config_path}"
 DEFAULT_DB_FILE = "home-assistant_v2.db"
 DEFAULT_DB_INTEGRITY_CHECK = True
@@ -65,7 +79,12 @@ KEEPALIVE_TIME = 30
 # States and Events objects
 EXPIRE_AFTER_COMMITS = 120
 
+# The number of attribute ids to keep in memory
+STATE_ATTRIBUTES_ID_CACHE_SIZE = 2048
+
 CONF_AUTO_PURGE = "auto_purge"
+CONF_BULK_INSERT = "bulk_insert"
+CONF_PURGE_CHUNK_SIZE = "purge_chunk_size"
 CONF_DB_URL = "db_url"
 CONF_DB_MAX_RETRIES = "db_max_retries"
 CONF_DB_RETRY_WAIT = "db_retry_wait"
@@ -106,6 +125,10 @@ CONFIG_SCHEMA = vol.Schema(
                     vol.Optional(
                         CONF_DB_INTEGRITY_CHECK, default=DEFAULT_DB_INTEGRITY_CHECK
                     ): cv.boolean,
+                    vol.Optional(CONF_BULK_INSERT, default=False): cv.boolean,
+                    vol.Optional(CONF_PURGE_CHUNK_SIZE): vol.All(
+                        vol.Coerce(int), vol.Range(min=1)
+                    ),
                 }
             ),
         )
@@ -164,6 +187,8 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     db_max_retries = conf[CONF_DB_MAX_RETRIES]
     db_retry_wait = conf[CONF_DB_RETRY_WAIT]
     db_integrity_check = conf[CONF_DB_INTEGRITY_CHECK]
+    bulk_insert = conf[CONF_BULK_INSERT]
+    purge_chunk_size = conf.get(CONF_PURGE_CHUNK_SIZE)
 
     db_url = conf.get(CONF_DB_URL)
     if not db_url:
@@ -181,8 +206,11 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         entity_filter=entity_filter,
         exclude_t=exclude_t,
         db_integrity_check=db_integrity_check,
+        bulk_insert=bulk_insert,
+        purge_chunk_size=purge_chunk_size,
     )
     instance.async_initialize()
+    await instance.async_load_purge_progress()
     instance.start()
 
     async def async_handle_purge_service(service):
@@ -196,7 +224,11 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     return await instance.async_db_ready
 
 
-PurgeTask = namedtuple("PurgeTask", ["keep_days", "repack"])
+PurgeTask = namedtuple(
+    "PurgeTask", ["keep_days", "repack", "chunk_size"], defaults=[None]
+)
+
+ChunkedPurgeTask = namedtuple("ChunkedPurgeTask", ["progress"])
 
 
 class WaitTask:
@@ -218,6 +250,8 @@ class Recorder(threading.Thread):
         entity_filter: Callable[[str], bool],
         exclude_t: List[str],
         db_integrity_check: bool,
+        bulk_insert: bool = False,
+        purge_chunk_size: Optional[int] = None,
     ) -> None:
         """Initialize the recorder."""
         threading.Thread.__init__(self, name="Recorder")
@@ -227,11 +261,15 @@ class Recorder(threading.Thread):
         self.keep_days = keep_days
         self.commit_interval = commit_interval
         self.queue: Any = queue.SimpleQueue()
+        # Durations in seconds of the commits of the event session
+        self.commit_durations = Histogram()
         self.recording_start = dt_util.utcnow()
         self.db_url = uri
         self.db_max_retries = db_max_retries
         self.db_retry_wait = db_retry_wait
         self.db_integrity_check = db_integrity_check
+        self.bulk_insert = bulk_insert
+        self.purge_chunk_size = purge_chunk_size
         self.async_db_ready = asyncio.Future()
         self._queue_watch = threading.Event()
         self.engine: Any = None
@@ -245,6 +283,11 @@ class Recorder(threading.Thread):
         self._keepalive_count = 0
         self._old_states = {}
         self._pending_expunge = []
+        self._state_attributes_ids = OrderedDict()
+        self._pending_state_attributes = {}
+        self._statistics = statistics.StatisticsCompiler()
+        self._bulk_inserter: Optional[bulk.BulkInserter] = None
+        self._purge_store = Store(hass, PURGE_STORAGE_VERSION, PURGE_STORAGE_KEY)
         self.event_session = None
         self.get_session = None
         self._completed_database_setup = False
@@ -254,12 +297,20 @@ class Recorder(threading.Thread):
         """Initialize the recorder."""
         self.hass.bus.async_listen(MATCH_ALL, self.event_listener)
 
+    async def async_load_purge_progress(self):
+        """Resume a chunked purge that was interrupted by a restart."""
+        data = await self._purge_store.async_load()
+        if data:
+            _LOGGER.info("Resuming purge of data before %s", data["purge_before"])
+            self.queue.put(ChunkedPurgeTask(purge.PurgeProgress.from_dict(data)))
+
     def do_adhoc_purge(self, **kwargs):
         """Trigger an adhoc purge retaining keep_days worth of data."""
         keep_days = kwargs.get(ATTR_KEEP_DAYS, self.keep_days)
         repack = kwargs.get(ATTR_REPACK)
+        chunk_size = kwargs.get(ATTR_CHUNK_SIZE, self.purge_chunk_size)
 
-        self.queue.put(PurgeTask(keep_days, repack))
+        self.queue.put(PurgeTask(keep_days, repack, chunk_size))
 
     def run(self):
         """Start processing events to save."""
@@ -341,7 +392,11 @@ class Recorder(threading.Thread):
             @callback
             def async_purge(now):
                 """Trigger the purge."""
-                self.queue.put(PurgeTask(self.keep_days, repack=False))
+                self.queue.put(
+                    PurgeTask(
+                        self.keep_days, repack=False, chunk_size=self.purge_chunk_size
+                    )
+                )
 
             # Purge every night at 4:12am
             self.hass.helpers.event.track_time_change(
@@ -350,23 +405,59 @@ class Recorder(threading.Thread):
 
         self.event_session = self.get_session()
         self.event_session.expire_on_commit = False
+        if self.bulk_insert:
+            if self.engine.dialect.name in bulk.BULK_INSERT_DIALECTS:
+                self._bulk_inserter = bulk.BulkInserter(self)
+            else:
+                _LOGGER.warning(
+                    "Bulk insert is not supported for %s databases, "
+                    "using the regular write path",
+                    self.engine.dialect.name,
+                )
+        self._restore_statistics()
         # Use a session for the event read loop
         # with a commit every time the event time
         # has changed. This reduces the disk io.
         while True:
+            if self._bulk_insert_pending() and self.queue.empty():
+                # Without a commit interval the rows are written
+                # as soon as the queue has been drained
+                self._commit_event_session_or_retry()
             event = self.queue.get()
             if event is None:
                 self._close_run()
                 self._close_connection()
                 return
             if isinstance(event, PurgeTask):
+                # Make sure the purge sees every state that references
+                # shared attributes before unused ones are removed
+                self._commit_event_session_or_retry()
+                if event.chunk_size:
+                    self._run_purge_chunk(
+                        purge.PurgeProgress(
+                            purge_before=dt_util.utcnow()
+                            - timedelta(days=event.keep_days),
+                            repack=event.repack,
+                            chunk_size=event.chunk_size,
+                        )
+                    )
+                    continue
                 # Schedule a new purge task if this one didn't finish
                 if not purge.purge_old_data(self, event.keep_days, event.repack):
                     self.queue.put(PurgeTask(event.keep_days, event.repack))
+                else:
+                    self._state_attributes_ids.clear()
+                continue
+            if isinstance(event, ChunkedPurgeTask):
+                self._commit_event_session_or_retry()
+                self._run_purge_chunk(event.progress)
                 continue
             if isinstance(event, WaitTask):
+                if self._bulk_insert_pending():
+                    self._commit_event_session_or_retry()
                 self._queue_watch.set()
                 continue
+            self._compile_statistics(event.time_fired)
             if event.event_type == EVENT_TIME_CHANGED:
                 self._keepalive_count += 1
                 if self._keepalive_count >= KEEPALIVE_TIME:
@@ -386,6 +477,10 @@ class Recorder(threading.Thread):
                 if not self.entity_filter(entity_id):
                     continue
 
+            if self._bulk_inserter is not None:
+                self._bulk_insert_event(event)
+                continue
+
             try:
                 if event.event_type == EVENT_STATE_CHANGED:
                     dbevent = Events.from_event(event, event_data="{}")
@@ -413,7 +508,11 @@ class Recorder(threading.Thread):
                         dbstate.state = None
                     dbstate.event = dbevent
                     dbstate.created = event.time_fired
+                    self._set_state_attributes(dbstate, event)
                     self.event_session.add(dbstate)
+                    self._statistics.record_state(
+                        dbstate.entity_id, dbstate.state, event.time_fired
+                    )
                     if has_new_state:
                         self._old_states[dbstate.entity_id] = dbstate
                         self._pending_expunge.append(dbstate)
@@ -431,6 +530,111 @@ class Recorder(threading.Thread):
             if not self.commit_interval:
                 self._commit_event_session_or_retry()
 
+    def _run_purge_chunk(self, progress):
+        """Purge a chunk and queue the next one behind the pending events."""
+        if purge.purge_old_data_chunk(self, progress):
+            self._state_attributes_ids.clear()
+            self.hass.add_job(self._purge_store.async_remove)
+        else:
+            self.queue.put(ChunkedPurgeTask(progress))
+            self.hass.add_job(self._async_save_purge_progress, progress.as_dict())
+        self.hass.bus.fire(EVENT_RECORDER_PURGE_PROGRESS, progress.as_dict())
+
+    @callback
+    def _async_save_purge_progress(self, data):
+        """Store the progress of a chunked purge."""
+        self._purge_store.async_delay_save(lambda: data, PURGE_PROGRESS_SAVE_DELAY)
+
+    def _bulk_insert_event(self, event):
+        """Queue the event for the next bulk insert."""
+        try:
+            dbstate = self._bulk_inserter.add(event)
+        except Exception as err:  # pylint: disable=broad-except
+            # Must catch the exception to prevent the loop from collapsing
+            _LOGGER.exception("Error adding event: %s", err)
+            return
+
+        if dbstate is not None:
+            self._statistics.record_state(
+                dbstate["entity_id"], dbstate["state"], event.time_fired
+            )
+
+        if self._bulk_inserter.pending_events >= bulk.MAX_PENDING_EVENTS:
+            self._commit_event_session_or_retry()
+
+    def _bulk_insert_pending(self):
+        """Return if bulk rows wait for a commit that has no interval."""
+        return (
+            self._bulk_inserter is not None
+            and not self.commit_interval
+            and self._bulk_inserter.pending_events > 0
+        )
+
+    def _set_state_attributes(self, dbstate, event):
+        """Link the state to its shared attributes, adding them if needed."""
+        shared_attrs = StateAttributes.shared_attrs_from_event(event)
+
+        pending_attributes = self._pending_state_attributes.get(shared_attrs)
+        if pending_attributes is not None:
+            dbstate.state_attributes = pending_attributes
+            return
+
+        attributes_id = self.find_state_attributes_id(shared_attrs)
+        if attributes_id is not None:
+            dbstate.attributes_id = attributes_id
+            return
+
+        pending_attributes = StateAttributes.from_shared_attrs(shared_attrs)
+        self._pending_state_attributes[shared_attrs] = pending_attributes
+        dbstate.state_attributes = pending_attributes
+
+    def find_state_attributes_id(self, shared_attrs):
+        """Return the id of stored shared attributes or None."""
+        attributes_id = self._state_attributes_ids.get(shared_attrs)
+        if attributes_id is not None:
+            self._state_attributes_ids.move_to_end(shared_attrs)
+            return attributes_id
+
+        with self.event_session.no_autoflush:
+            attributes_id = (
+                self.event_session.query(StateAttributes.attributes_id)
+                .filter(
+                    StateAttributes.hash
+                    == StateAttributes.hash_shared_attrs(shared_attrs)
+                )
+                .filter(StateAttributes.shared_attrs == shared_attrs)
+                .scalar()
+            )
+        if attributes_id is not None:
+            self.cache_state_attributes_id(shared_attrs, attributes_id)
+        return attributes_id
+
+    def cache_state_attributes_id(self, shared_attrs, attributes_id):
+        """Remember the id of stored shared attributes."""
+        self._state_attributes_ids[shared_attrs] = attributes_id
+        if len(self._state_attributes_ids) > STATE_ATTRIBUTES_ID_CACHE_SIZE:
+            self._state_attributes_ids.popitem(last=False)
+
+    def _compile_statistics(self, now):
+        """Add the statistics of completed periods to the session."""
+        try:
+            self.event_session.add_all(self._statistics.compile(now))
+        except Exception as err:  # pylint: disable=broad-except
+            # Must catch the exception to prevent the loop from collapsing
+            _LOGGER.exception("Error compiling statistics: %s", err)
+
+    def _restore_statistics(self):
+        """Add the statistics of the periods open at the last stop to the session."""
+        try:
+            self.event_session.add_all(
+                statistics.restore_open_periods(
+                    self.event_session, self._statistics, dt_util.utcnow()
+                )
+            )
+        except Exception as err:  # pylint: disable=broad-except
+            # Must catch the exception to prevent the loop from collapsing
+            _LOGGER.exception("Error restoring statistics: %s", err)
+
     def _send_keep_alive(self):
         try:
             _LOGGER.debug("Sending keepalive")
@@ -451,7 +655,9 @@ class Recorder(threading.Thread):
                 time.sleep(self.db_retry_wait)
 
             try:
+                start = time.perf_counter()
                 self._commit_event_session()
+                self.commit_durations.observe(time.perf_counter() - start)
                 return
             except (exc.InternalError, exc.OperationalError) as err:
                 if err.connection_invalidated:
@@ -482,6 +688,9 @@ class Recorder(threading.Thread):
         self._reopen_event_session()
 
     def _reopen_event_session(self):
+        self._pending_state_attributes = {}
+        if self._bulk_inserter is not None:
+            self._bulk_inserter.reset()
         try:
             self.event_session.rollback()
         except Exception as err:  # pylint: disable=broad-except
@@ -505,6 +714,8 @@ class Recorder(threading.Thread):
         self._commits_without_expire += 1
 
         try:
+            if self._bulk_inserter is not None:
+                self._bulk_inserter.flush(self.event_session)
             if self._pending_expunge:
                 self.event_session.flush()
                 for dbstate in self._pending_expunge:
@@ -521,12 +732,23 @@ class Recorder(threading.Thread):
             )
             self.event_session.rollback()
             self._old_states = {}
+            self._state_attributes_ids.clear()
+            self._pending_state_attributes = {}
+            if self._bulk_inserter is not None:
+                self._bulk_inserter.reset()
             raise
         except Exception as err:
             _LOGGER.error("Error executing query: %s", err)
             self.event_session.rollback()
+            self._pending_state_attributes = {}
             raise
 
+        for shared_attrs, dbattributes in self._pending_state_attributes.items():
+            self.cache_state_attributes_id(shared_attrs, dbattributes.attributes_id)
+        self._pending_state_attributes = {}
+        if self._bulk_inserter is not None:
+            self._bulk_inserter.committed()
+
         # Expire is an expensive operation (frequently more expensive
         # than the flush and commit itself) so we only
         # do it after EXPIRE_AFTER_COMMITS commits
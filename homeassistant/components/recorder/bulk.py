@@ -0,0 +1,165 @@
+"""Bulk insert write path for the recorder."""
+import logging
+from typing import Dict, List, Optional
+
+from sqlalchemy import func
+
+from homeassistant.const import EVENT_STATE_CHANGED
+
+from .models import (
+    TABLE_EVENTS,
+    TABLE_STATE_ATTRIBUTES,
+    TABLE_STATES,
+    Base,
+    Events,
+    StateAttributes,
+    States,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Dialects that move their auto increment counters past
+# explicitly inserted primary keys
+BULK_INSERT_DIALECTS = ("sqlite", "mysql")
+
+# Flush pending rows when this many events are waiting
+MAX_PENDING_EVENTS = 1000
+
+
+class BulkInserter:
+    """Collect events and states and insert them with executemany.
+
+    The recorder is the only writer of the events, states and
+    state_attributes tables so the primary keys are assigned here.
+    This allows linking states to their event, old state and shared
+    attributes without a round trip to the database per row.
+    """
+
+    def __init__(self, instance) -> None:
+        """Initialize the bulk inserter."""
+        self._instance = instance
+        self._next_ids: Optional[Dict[str, int]] = None
+        self._old_state_ids: Dict[str, int] = {}
+        self._pending_attributes_ids: Dict[str, int] = {}
+        self._events: List[dict] = []
+        self._states: List[dict] = []
+        self._state_attributes: List[dict] = []
+
+    @property
+    def pending_events(self) -> int:
+        """Return the number of events waiting to be inserted."""
+        return len(self._events)
+
+    def _next_id(self, table: str) -> int:
+        """Return the next primary key for a table."""
+        if self._next_ids is None:
+            session = self._instance.event_session
+            self._next_ids = {
+                Events.__tablename__: session.query(func.max(Events.event_id)).scalar()
+                or 0,
+                States.__tablename__: session.query(func.max(States.state_id)).scalar()
+                or 0,
+                StateAttributes.__tablename__: session.query(
+                    func.max(StateAttributes.attributes_id)
+                ).scalar()
+                or 0,
+            }
+        self._next_ids[table] += 1
+        return self._next_ids[table]
+
+    def add(self, event) -> Optional[dict]:
+        """Queue an event and the state it carries for insertion.
+
+        Returns the column values of the state if there is one.
+        """
+        try:
+            if event.event_type == EVENT_STATE_CHANGED:
+                dbevent = Events.values_from_event(event, event_data="{}")
+            else:
+                dbevent = Events.values_from_event(event)
+        except (TypeError, ValueError):
+            _LOGGER.warning("Event is not JSON serializable: %s", event)
+            return None
+        dbevent["created"] = event.time_fired
+        dbevent["event_id"] = self._next_id(Events.__tablename__)
+        self._events.append(dbevent)
+
+        if event.event_type != EVENT_STATE_CHANGED:
+            return None
+
+        try:
+            dbstate = States.values_from_event(event)
+            attributes_id = self._attributes_id(
+                StateAttributes.shared_attrs_from_event(event)
+            )
+        except (TypeError, ValueError):
+            _LOGGER.warning(
+                "State is not JSON serializable: %s",
+                event.data.get("new_state"),
+            )
+            return None
+
+        entity_id = dbstate["entity_id"]
+        has_new_state = event.data.get("new_state")
+        if not has_new_state:
+            dbstate["state"] = None
+        dbstate["state_id"] = self._next_id(States.__tablename__)
+        dbstate["event_id"] = dbevent["event_id"]
+        dbstate["old_state_id"] = self._old_state_ids.pop(entity_id, None)
+        dbstate["attributes_id"] = attributes_id
+        dbstate["created"] = event.time_fired
+        self._states.append(dbstate)
+        if has_new_state:
+            self._old_state_ids[entity_id] = dbstate["state_id"]
+        return dbstate
+
+    def _attributes_id(self, shared_attrs: str) -> int:
+        """Return the id of the shared attributes, adding them if needed."""
+        attributes_id = self._pending_attributes_ids.get(shared_attrs)
+        if attributes_id is not None:
+            return attributes_id
+
+        attributes_id = self._instance.find_state_attributes_id(shared_attrs)
+        if attributes_id is not None:
+            return attributes_id
+
+        attributes_id = self._next_id(StateAttributes.__tablename__)
+        self._pending_attributes_ids[shared_attrs] = attributes_id
+        self._state_attributes.append(
+            {
+                "attributes_id": attributes_id,
+                "hash": StateAttributes.hash_shared_attrs(shared_attrs),
+                "shared_attrs": shared_attrs,
+            }
+        )
+        return attributes_id
+
+    def flush(self, session) -> None:
+        """Insert the pending rows within the session transaction."""
+        tables = Base.metadata.tables
+        if self._state_attributes:
+            session.execute(
+                tables[TABLE_STATE_ATTRIBUTES].insert(), self._state_attributes
+            )
+        if self._events:
+            session.execute(tables[TABLE_EVENTS].insert(), self._events)
+        if self._states:
+            session.execute(tables[TABLE_STATES].insert(), self._states)
+
+    def committed(self) -> None:
+        """Forget the rows once they have been committed."""
+        for shared_attrs, attributes_id in self._pending_attributes_ids.items():
+            self._instance.cache_state_attributes_id(shared_attrs, attributes_id)
+        self._pending_attributes_ids = {}
+        self._events = []
+        self._states = []
+        self._state_attributes = []
+
+    def reset(self) -> None:
+        """Drop the pending rows and reload the primary keys."""
+        self._next_ids = None
+        self._old_state_ids = {}
+        self._pending_attributes_ids = {}
+        self._events = []
+        self._states = []
+        self._state_attributes = []
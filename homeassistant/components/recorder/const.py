@@ -5,3 +5,5 @@ SQLITE_URL_PREFIX = "sqlite://"
 DOMAIN = "recorder"
 
 CONF_DB_INTEGRITY_CHECK = "db_integrity_check"
+
+EVENT_RECORDER_PURGE_PROGRESS = "recorder_purge_progress"
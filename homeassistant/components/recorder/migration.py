@@ -12,7 +12,15 @@ from sqlalchemy.exc import (
 from sqlalchemy.schema import AddConstraint, DropConstraint
 
 from .const import DOMAIN
-from .models import SCHEMA_VERSION, TABLE_STATES, Base, SchemaChanges
+from .models import (
+    SCHEMA_VERSION,
+    TABLE_STATE_ATTRIBUTES,
+    TABLE_STATES,
+    TABLE_STATISTICS,
+    TABLE_STATISTICS_SHORT_TERM,
+    Base,
+    SchemaChanges,
+)
 from .util import session_scope
 
 _LOGGER = logging.getLogger(__name__)
@@ -321,6 +329,24 @@ def _apply_update(engine, new_version, old_version):
     elif new_version == 11:
         _create_index(engine, "states", "ix_states_old_state_id")
         _update_states_table_with_foreign_key_options(engine)
+    elif new_version == 12:
+        # The tables are normally created by create_all when the
+        # connection is set up, make sure they exist anyway
+        Base.metadata.create_all(
+            engine,
+            tables=[
+                Base.metadata.tables[TABLE_STATISTICS],
+                Base.metadata.tables[TABLE_STATISTICS_SHORT_TERM],
+            ],
+        )
+    elif new_version == 13:
+        Base.metadata.create_all(
+            engine, tables=[Base.metadata.tables[TABLE_STATE_ATTRIBUTES]]
+        )
+        # Existing states keep their attributes inline, new states
+        # reference the deduplicated attributes instead
+        _add_columns(engine, "states", ["attributes_id INTEGER"])
+        _create_index(engine, "states", "ix_states_attributes_id")
     else:
         raise ValueError(f"No schema migration defined for version {new_version}")
 
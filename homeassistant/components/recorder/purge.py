@@ -1,13 +1,16 @@
 """Purge old data helper."""
-from datetime import timedelta
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
 import logging
 import time
+from typing import Any, Dict, Optional
 
+from sqlalchemy import func
 from sqlalchemy.exc import OperationalError, SQLAlchemyError
 
 import homeassistant.util.dt as dt_util
 
-from .models import Events, RecorderRuns, States
+from .models import Events, RecorderRuns, StateAttributes, States, StatisticsShortTerm
 from .util import execute, session_scope
 
 _LOGGER = logging.getLogger(__name__)
@@ -58,46 +61,211 @@ def purge_old_data(instance, purge_days: int, repack: bool) -> bool:
             )
             _LOGGER.debug("Deleted %s events", deleted_rows)
 
+            # Hourly statistics are kept, they are the long-term history
+            deleted_rows = (
+                session.query(StatisticsShortTerm)
+                .filter(StatisticsShortTerm.start < batch_purge_before)
+                .delete(synchronize_session=False)
+            )
+            _LOGGER.debug("Deleted %s short term statistics", deleted_rows)
+
             # If states or events purging isn't processing the purge_before yet,
             # return false, as we are not done yet.
             if batch_purge_before != purge_before:
                 _LOGGER.debug("Purging hasn't fully completed yet")
                 return False
 
-            # Recorder runs is small, no need to batch run it
-            deleted_rows = (
-                session.query(RecorderRuns)
-                .filter(RecorderRuns.start < purge_before)
-                .filter(RecorderRuns.run_id != instance.run_info.run_id)
-                .delete(synchronize_session=False)
-            )
-            _LOGGER.debug("Deleted %s recorder_runs", deleted_rows)
+            _purge_unused_data(instance, session, purge_before)
 
         if repack:
-            # Execute sqlite or postgresql vacuum command to free up space on disk
-            if instance.engine.driver in ("pysqlite", "postgresql"):
-                _LOGGER.debug("Vacuuming SQL DB to free space")
-                instance.engine.execute("VACUUM")
-            # Optimize mysql / mariadb tables to free up space on disk
-            elif instance.engine.driver in ("mysqldb", "pymysql"):
-                _LOGGER.debug("Optimizing SQL DB to free space")
-                instance.engine.execute("OPTIMIZE TABLE states, events, recorder_runs")
+            _repack_database(instance)
 
     except OperationalError as err:
-        # Retry when one of the following MySQL errors occurred:
-        # 1205: Lock wait timeout exceeded; try restarting transaction
-        # 1206: The total number of locks exceeds the lock table size
-        # 1213: Deadlock found when trying to get lock; try restarting transaction
-        if instance.engine.driver in ("mysqldb", "pymysql") and err.orig.args[0] in (
-            1205,
-            1206,
-            1213,
-        ):
-            _LOGGER.info("%s; purge not completed, retrying", err.orig.args[1])
-            time.sleep(instance.db_retry_wait)
-            return False
-
+        return _handle_operational_error(instance, err)
+    except SQLAlchemyError as err:
         _LOGGER.warning("Error purging history: %s", err)
+    return True
+
+
+@dataclass
+class PurgeProgress:
+    """Progress of a chunked purge.
+
+    Stored between chunks so an interrupted purge resumes after a restart.
+    """
+
+    purge_before: datetime
+    repack: bool
+    chunk_size: int
+    total: Optional[Dict[str, int]] = None
+    deleted: Dict[str, int] = field(default_factory=dict)
+    finished: bool = False
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PurgeProgress":
+        """Restore the progress from a dict."""
+        return cls(
+            purge_before=dt_util.parse_datetime(data["purge_before"]),
+            repack=data["repack"],
+            chunk_size=data["chunk_size"],
+            total=data.get("total"),
+            deleted=data.get("deleted", {}),
+        )
+
+    @property
+    def percentage(self) -> int:
+        """Return the percentage of rows that have been deleted."""
+        if self.finished:
+            return 100
+        total = sum((self.total or {}).values())
+        if not total:
+            return 0
+        return min(99, 100 * sum(self.deleted.values()) // total)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the progress as a dict."""
+        return {
+            "purge_before": self.purge_before.isoformat(),
+            "repack": self.repack,
+            "chunk_size": self.chunk_size,
+            "total": dict(self.total) if self.total is not None else None,
+            "deleted": dict(self.deleted),
+            "finished": self.finished,
+            "percentage": self.percentage,
+        }
+
+
+# Tables purged by a chunked purge in the order they are processed,
+# states before events because states reference their event
+CHUNKED_PURGE_TABLES = (
+    (States, States.state_id, States.last_updated),
+    (Events, Events.event_id, Events.time_fired),
+    (StatisticsShortTerm, StatisticsShortTerm.id, StatisticsShortTerm.start),
+)
+
+
+def purge_old_data_chunk(instance, progress: PurgeProgress) -> bool:
+    """Delete one chunk of the rows older than the purge target.
+
+    Rows are deleted by primary key so a chunk never holds more than
+    chunk_size rows in a transaction. Returns True once done.
+    """
+    purge_before = progress.purge_before
+
+    try:
+        with session_scope(session=instance.get_session()) as session:
+            if progress.total is None:
+                progress.total = {
+                    table.__tablename__: session.query(func.count(id_column))
+                    .filter(time_column < purge_before)
+                    .scalar()
+                    for table, id_column, time_column in CHUNKED_PURGE_TABLES
+                }
+                _LOGGER.debug(
+                    "Purging %s before %s in chunks of %s",
+                    progress.total,
+                    purge_before,
+                    progress.chunk_size,
+                )
+
+            for table, id_column, time_column in CHUNKED_PURGE_TABLES:
+                ids = [
+                    row[0]
+                    for row in session.query(id_column)
+                    .filter(time_column < purge_before)
+                    .order_by(id_column)
+                    .limit(progress.chunk_size)
+                ]
+                if not ids:
+                    continue
+
+                if table is States:
+                    # Newer states must not reference a deleted state
+                    session.query(States).filter(States.old_state_id.in_(ids)).update(
+                        {States.old_state_id: None}, synchronize_session=False
+                    )
+
+                deleted_rows = (
+                    session.query(table)
+                    .filter(id_column.in_(ids))
+                    .delete(synchronize_session=False)
+                )
+                _LOGGER.debug("Deleted %s %s", deleted_rows, table.__tablename__)
+                progress.deleted[table.__tablename__] = (
+                    progress.deleted.get(table.__tablename__, 0) + deleted_rows
+                )
+                return False
+
+            _purge_unused_data(instance, session, purge_before)
+
+        if progress.repack:
+            _repack_database(instance)
+
+    except OperationalError as err:
+        if not _handle_operational_error(instance, err):
+            return False
     except SQLAlchemyError as err:
         _LOGGER.warning("Error purging history: %s", err)
+
+    progress.finished = True
+    return True
+
+
+def _purge_unused_data(instance, session, purge_before: datetime) -> None:
+    """Purge the data that is no longer referenced by states or events."""
+    # Recorder runs is small, no need to batch run it
+    deleted_rows = (
+        session.query(RecorderRuns)
+        .filter(RecorderRuns.start < purge_before)
+        .filter(RecorderRuns.run_id != instance.run_info.run_id)
+        .delete(synchronize_session=False)
+    )
+    _LOGGER.debug("Deleted %s recorder_runs", deleted_rows)
+
+    # Attributes are shared between states so they can only
+    # be removed once no state references them anymore
+    deleted_rows = (
+        session.query(StateAttributes)
+        .filter(
+            ~StateAttributes.attributes_id.in_(
+                session.query(States.attributes_id).filter(
+                    States.attributes_id.isnot(None)
+                )
+            )
+        )
+        .delete(synchronize_session=False)
+    )
+    _LOGGER.debug("Deleted %s state_attributes", deleted_rows)
+
+
+def _repack_database(instance) -> None:
+    """Rewrite the database to free up disk space."""
+    # Execute sqlite or postgresql vacuum command to free up space on disk
+    if instance.engine.driver in ("pysqlite", "postgresql"):
+        _LOGGER.debug("Vacuuming SQL DB to free space")
+        instance.engine.execute("VACUUM")
+    # Optimize mysql / mariadb tables to free up space on disk
+    elif instance.engine.driver in ("mysqldb", "pymysql"):
+        _LOGGER.debug("Optimizing SQL DB to free space")
+        instance.engine.execute(
+            "OPTIMIZE TABLE states, state_attributes, events, recorder_runs"
+        )
+
+
+def _handle_operational_error(instance, err: OperationalError) -> bool:
+    """Handle an error while purging, return False to retry the purge."""
+    # Retry when one of the following MySQL errors occurred:
+    # 1205: Lock wait timeout exceeded; try restarting transaction
+    # 1206: The total number of locks exceeds the lock table size
+    # 1213: Deadlock found when trying to get lock; try restarting transaction
+    if instance.engine.driver in ("mysqldb", "pymysql") and err.orig.args[0] in (
+        1205,
+        1206,
+        1213,
+    ):
+        _LOGGER.info("%s; purge not completed, retrying", err.orig.args[1])
+        time.sleep(instance.db_retry_wait)
+        return False
+
+    _LOGGER.warning("Error purging history: %s", err)
     return True
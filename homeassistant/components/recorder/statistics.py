@@ -0,0 +1,320 @@
+"""Statistics rollups of numeric states."""
+from collections import defaultdict
+from datetime import datetime, timedelta
+import logging
+import math
+from typing import Dict, Optional
+
+from sqlalchemy import func
+
+import homeassistant.util.dt as dt_util
+
+from .models import (
+    RecorderRuns,
+    States,
+    Statistics,
+    StatisticsShortTerm,
+    process_timestamp,
+    process_timestamp_to_utc_isoformat,
+)
+from .util import execute, session_scope
+
+_LOGGER = logging.getLogger(__name__)
+
+PERIOD_5MINUTE = "5minute"
+PERIOD_HOUR = "hour"
+
+SHORT_TERM_PERIOD = timedelta(minutes=5)
+LONG_TERM_PERIOD = timedelta(hours=1)
+
+STATISTICS_TABLES = {
+    PERIOD_5MINUTE: StatisticsShortTerm,
+    PERIOD_HOUR: Statistics,
+}
+
+
+def state_as_float(state: Optional[str]) -> Optional[float]:
+    """Return the state as a finite float or None if it is not numeric."""
+    try:
+        value = float(state)  # type: ignore
+    except (TypeError, ValueError):
+        return None
+    if not math.isfinite(value):
+        return None
+    return value
+
+
+def floor_time(time: datetime, period: timedelta) -> datetime:
+    """Return the start of the period the time falls in."""
+    timestamp = time.timestamp()
+    return dt_util.utc_from_timestamp(timestamp - timestamp % period.total_seconds())
+
+
+class _TimeWeightedAccumulator:
+    """Accumulate a time weighted mean, min and max for a period."""
+
+    __slots__ = ("value", "last_time", "weighted_sum", "duration", "min", "max")
+
+    def __init__(self, value: Optional[float], start: datetime) -> None:
+        """Initialize the accumulator with the value held at start."""
+        self.value = value
+        self.last_time = start
+        self.weighted_sum = 0.0
+        self.duration = 0.0
+        self.min = value
+        self.max = value
+
+    def _advance(self, time: datetime) -> None:
+        """Account for the current value being held until time."""
+        if time <= self.last_time:
+            return
+        if self.value is not None:
+            seconds = (time - self.last_time).total_seconds()
+            self.weighted_sum += self.value * seconds
+            self.duration += seconds
+        self.last_time = time
+
+    def add(self, value: Optional[float], time: datetime) -> None:
+        """Add a new value that is held from time onwards."""
+        self._advance(time)
+        self.value = value
+        if value is None:
+            return
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def close(self, end: datetime) -> Optional[dict]:
+        """Finish the period and return the statistics."""
+        self._advance(end)
+        if not self.duration:
+            return None
+        return {
+            "mean": self.weighted_sum / self.duration,
+            "min": self.min,
+            "max": self.max,
+            "duration": self.duration,
+        }
+
+
+class _RollupAccumulator:
+    """Combine the statistics of shorter periods."""
+
+    __slots__ = ("weighted_sum", "duration", "min", "max")
+
+    def __init__(self) -> None:
+        """Initialize the accumulator."""
+        self.weighted_sum = 0.0
+        self.duration = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def add(self, stats: dict) -> None:
+        """Add the statistics of a shorter period."""
+        self.weighted_sum += stats["mean"] * stats["duration"]
+        self.duration += stats["duration"]
+        if self.min is None or stats["min"] < self.min:
+            self.min = stats["min"]
+        if self.max is None or stats["max"] > self.max:
+            self.max = stats["max"]
+
+    def close(self) -> dict:
+        """Return the combined statistics."""
+        return {
+            "mean": self.weighted_sum / self.duration,
+            "min": self.min,
+            "max": self.max,
+            "duration": self.duration,
+        }
+
+
+class StatisticsCompiler:
+    """Compile 5-minute and hourly statistics incrementally.
+
+    Lives in the recorder thread. States are fed in as they are
+    recorded and the rollups are returned as database objects
+    whenever a period has been completed.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the compiler."""
+        self._period_start: Optional[datetime] = None
+        self._short_term: Dict[str, _TimeWeightedAccumulator] = {}
+        self._long_term: Dict[str, _RollupAccumulator] = defaultdict(_RollupAccumulator)
+
+    def record_state(
+        self, entity_id: str, state: Optional[str], time: datetime
+    ) -> None:
+        """Record a state change."""
+        value = state_as_float(state)
+        accumulator = self._short_term.get(entity_id)
+        if accumulator is not None:
+            accumulator.add(value, time)
+        elif value is not None:
+            accumulator = self._short_term[entity_id] = _TimeWeightedAccumulator(
+                None, time
+            )
+            accumulator.add(value, time)
+
+    def compile(self, now: datetime) -> list:
+        """Return the rollups of the periods that ended before now."""
+        if self._period_start is None:
+            self._period_start = floor_time(now, SHORT_TERM_PERIOD)
+            return []
+
+        if now - self._period_start > LONG_TERM_PERIOD + SHORT_TERM_PERIOD:
+            # The clock jumped, do not emit rows for the whole gap
+            _LOGGER.debug(
+                "Restarting statistics, last period started at %s",
+                self._period_start,
+            )
+            self.restart(floor_time(now, SHORT_TERM_PERIOD))
+            return []
+
+        return self.compile_periods(now)
+
+    def restart(self, period_start: datetime) -> None:
+        """Drop what has been accumulated and start a period at period_start."""
+        self._period_start = period_start
+        self._short_term.clear()
+        self._long_term.clear()
+
+    def compile_periods(self, now: datetime) -> list:
+        """Return the rollups of the periods that ended before now.
+
+        Unlike compile, this does not guard against jumps of the clock.
+        """
+        assert self._period_start is not None
+        rows = []
+        while now >= self._period_start + SHORT_TERM_PERIOD:
+            start = self._period_start
+            end = start + SHORT_TERM_PERIOD
+            for entity_id, accumulator in list(self._short_term.items()):
+                stats = accumulator.close(end)
+                if accumulator.value is None:
+                    del self._short_term[entity_id]
+                else:
+                    self._short_term[entity_id] = _TimeWeightedAccumulator(
+                        accumulator.value, end
+                    )
+                if stats is None:
+                    continue
+                rows.append(StatisticsShortTerm.from_stats(entity_id, start, stats))
+                self._long_term[entity_id].add(stats)
+
+            if floor_time(end, LONG_TERM_PERIOD) == end:
+                hour_start = end - LONG_TERM_PERIOD
+                for entity_id, rollup in self._long_term.items():
+                    rows.append(
+                        Statistics.from_stats(entity_id, hour_start, rollup.close())
+                    )
+                self._long_term.clear()
+
+            self._period_start = end
+
+        return rows
+
+
+def restore_open_periods(session, compiler: StatisticsCompiler, now: datetime) -> list:
+    """Compile the periods that were open when the recorder stopped.
+
+    The accumulators only live in memory, so the current and the previous
+    hour are compiled again from the recorded states. The rollups that were
+    stored before the recorder stopped are not returned.
+    """
+    replay_start = floor_time(now, LONG_TERM_PERIOD) - LONG_TERM_PERIOD
+    compiler.restart(replay_start)
+
+    # The value every entity held when the replayed hours started. Every run
+    # records the states of all entities when it starts, so only the states
+    # since the start of the run recording at that time are searched.
+    run = (
+        session.query(RecorderRuns.start)
+        .filter((RecorderRuns.start < replay_start) & (RecorderRuns.end > replay_start))
+        .first()
+    )
+    if run is not None:
+        most_recent_ids = (
+            session.query(func.max(States.state_id).label("max_state_id"))
+            .filter(
+                (States.last_updated >= run.start)
+                & (States.last_updated < replay_start)
+            )
+            .group_by(States.entity_id)
+            .subquery()
+        )
+        held = session.query(States.entity_id, States.state).join(
+            most_recent_ids, States.state_id == most_recent_ids.c.max_state_id
+        )
+        for entity_id, state in execute(held):
+            compiler.record_state(entity_id, state, replay_start)
+
+    rows = []
+    changes = (
+        session.query(States.entity_id, States.state, States.last_updated)
+        .filter(States.last_updated >= replay_start)
+        .filter(States.last_updated < now)
+        .order_by(States.last_updated)
+    )
+    for entity_id, state, last_updated in execute(changes):
+        last_updated = process_timestamp(last_updated)
+        rows.extend(compiler.compile_periods(last_updated))
+        compiler.record_state(entity_id, state, last_updated)
+    rows.extend(compiler.compile_periods(now))
+
+    stored = set()
+    for table in STATISTICS_TABLES.values():
+        query = session.query(table.entity_id, table.start).filter(
+            table.start >= replay_start
+        )
+        stored.update(
+            (table, entity_id, process_timestamp(start))
+            for entity_id, start in execute(query)
+        )
+
+    return [row for row in rows if (type(row), row.entity_id, row.start) not in stored]
+
+
+def statistics_during_period(
+    hass, start_time, end_time=None, entity_ids=None, period=PERIOD_HOUR
+):
+    """Return the statistics rollups during UTC period start_time - end_time."""
+    table = STATISTICS_TABLES[period]
+
+    with session_scope(hass=hass) as session:
+        query = session.query(
+            table.entity_id, table.start, table.mean, table.min, table.max
+        ).filter(table.start >= start_time)
+
+        if end_time is not None:
+            query = query.filter(table.start < end_time)
+
+        if entity_ids is not None:
+            query = query.filter(table.entity_id.in_(entity_ids))
+
+        stats = execute(query.order_by(table.entity_id, table.start))
+
+        return _sorted_statistics_to_dict(stats, entity_ids)
+
+
+def _sorted_statistics_to_dict(stats, entity_ids):
+    """Convert SQL results into a JSON friendly data structure."""
+    result = defaultdict(list)
+    # Set all entity IDs to empty lists in result set to maintain the order
+    if entity_ids is not None:
+        for ent_id in entity_ids:
+            result[ent_id] = []
+
+    for db_stat in stats:
+        result[db_stat.entity_id].append(
+            {
+                "start": process_timestamp_to_utc_isoformat(db_stat.start),
+                "mean": db_stat.mean,
+                "min": db_stat.min,
+                "max": db_stat.max,
+            }
+        )
+
+    # Filter out the empty lists if some entities had 0 results.
+    return {key: val for key, val in result.items() if val}
@@ -1,11 +1,13 @@
 """Support for statistics for sensor values."""
 from collections import deque
 import logging
+import math
 import statistics
 
+from sqlalchemy import func
 import voluptuous as vol
 
-from homeassistant.components.recorder.models import States
+from homeassistant.components.recorder.models import States, process_timestamp
 from homeassistant.components.recorder.util import execute, session_scope
 from homeassistant.components.sensor import PLATFORM_SCHEMA
 from homeassistant.const import (
@@ -27,6 +29,7 @@ from homeassistant.helpers.reload import async_setup_reload_service
 from homeassistant.util import dt as dt_util
 
 from . import DOMAIN, PLATFORMS
+from .window import LongWindow
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -48,22 +51,35 @@ ATTR_VARIANCE = "variance"
 CONF_SAMPLING_SIZE = "sampling_size"
 CONF_MAX_AGE = "max_age"
 CONF_PRECISION = "precision"
+CONF_LONG_WINDOW = "long_window"
 
 DEFAULT_NAME = "Stats"
 DEFAULT_SIZE = 20
 DEFAULT_PRECISION = 2
 ICON = "mdi:calculator"
 
-PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(
-    {
-        vol.Required(CONF_ENTITY_ID): cv.entity_id,
-        vol.Optional(CONF_NAME, default=DEFAULT_NAME): cv.string,
-        vol.Optional(CONF_SAMPLING_SIZE, default=DEFAULT_SIZE): vol.All(
-            vol.Coerce(int), vol.Range(min=1)
-        ),
-        vol.Optional(CONF_MAX_AGE): cv.time_period,
-        vol.Optional(CONF_PRECISION, default=DEFAULT_PRECISION): vol.Coerce(int),
-    }
+
+def _validate_long_window(config):
+    """Validate a long window has a maximum age."""
+    if config[CONF_LONG_WINDOW] and CONF_MAX_AGE not in config:
+        raise vol.Invalid(f"{CONF_LONG_WINDOW} requires {CONF_MAX_AGE} to be set")
+    return config
+
+
+PLATFORM_SCHEMA = vol.All(
+    PLATFORM_SCHEMA.extend(
+        {
+            vol.Required(CONF_ENTITY_ID): cv.entity_id,
+            vol.Optional(CONF_NAME, default=DEFAULT_NAME): cv.string,
+            vol.Optional(CONF_SAMPLING_SIZE, default=DEFAULT_SIZE): vol.All(
+                vol.Coerce(int), vol.Range(min=1)
+            ),
+            vol.Optional(CONF_MAX_AGE): cv.time_period,
+            vol.Optional(CONF_PRECISION, default=DEFAULT_PRECISION): vol.Coerce(int),
+            vol.Optional(CONF_LONG_WINDOW, default=False): cv.boolean,
+        }
+    ),
+    _validate_long_window,
 )
 
 
@@ -77,18 +93,30 @@ async def async_setup_platform(hass, config, async_add_entities, discovery_info=
     sampling_size = config.get(CONF_SAMPLING_SIZE)
     max_age = config.get(CONF_MAX_AGE)
     precision = config.get(CONF_PRECISION)
+    long_window = config.get(CONF_LONG_WINDOW)
 
     async_add_entities(
-        [StatisticsSensor(entity_id, name, sampling_size, max_age, precision)], True
+        [
+            StatisticsSensor(
+                entity_id, name, sampling_size, max_age, precision, long_window
+            )
+        ],
+        True,
     )
 
     return True
 
 
 class StatisticsSensor(Entity):
-    """Representation of a Statistics sensor."""
+    """Representation of a Statistics sensor.
+
+    In long window mode the samples younger than max_age are aggregated
+    incrementally instead of being kept, and sampling_size is not used.
+    """
 
-    def __init__(self, entity_id, name, sampling_size, max_age, precision):
+    def __init__(
+        self, entity_id, name, sampling_size, max_age, precision, long_window=False
+    ):
         """Initialize the Statistics sensor."""
         self._entity_id = entity_id
         self.is_binary = self._entity_id.split(".")[0] == "binary_sensor"
@@ -99,6 +127,9 @@ class StatisticsSensor(Entity):
         self._unit_of_measurement = None
         self.states = deque(maxlen=self._sampling_size)
         self.ages = deque(maxlen=self._sampling_size)
+        self._window = LongWindow(max_age) if long_window else None
+        # States received while the long window is seeded from the database
+        self._pending_states = None
 
         self.count = 0
         self.mean = self.median = self.stdev = self.variance = None
@@ -121,6 +152,10 @@ class StatisticsSensor(Entity):
                 ATTR_UNIT_OF_MEASUREMENT
             )
 
+            if self._pending_states is not None:
+                self._pending_states.append(new_state)
+                return
+
             self._add_state_to_queue(new_state)
 
             self.async_schedule_update_ha_state(True)
@@ -138,7 +173,14 @@ class StatisticsSensor(Entity):
 
             if "recorder" in self.hass.config.components:
                 # Only use the database if it's configured
-                self.hass.async_create_task(self._async_initialize_from_database())
+                if self._window is not None:
+                    # Hold new states until the older ones have been added
+                    self._pending_states = []
+                    self.hass.async_create_task(
+                        self._async_initialize_window_from_database(dt_util.utcnow())
+                    )
+                else:
+                    self.hass.async_create_task(self._async_initialize_from_database())
 
         self.hass.bus.async_listen_once(
             EVENT_HOMEASSISTANT_START, async_stats_sensor_startup
@@ -150,12 +192,18 @@ class StatisticsSensor(Entity):
             return
 
         try:
-            if self.is_binary:
+            if self._window is not None:
+                self._window.add(
+                    None if self.is_binary else float(new_state.state),
+                    new_state.last_updated,
+                )
+            elif self.is_binary:
                 self.states.append(new_state.state)
             else:
                 self.states.append(float(new_state.state))
 
-            self.ages.append(new_state.last_updated)
+            if self._window is None:
+                self.ages.append(new_state.last_updated)
         except ValueError:
             _LOGGER.error(
                 "%s: parsing error, expected number and received %s",
@@ -213,6 +261,10 @@ class StatisticsSensor(Entity):
         """Remove states which are older than self._max_age."""
         now = dt_util.utcnow()
 
+        if self._window is not None:
+            self._window.purge(now)
+            return
+
         _LOGGER.debug(
             "%s: purging records older then %s(%s)",
             self.entity_id,
@@ -232,6 +284,8 @@ class StatisticsSensor(Entity):
 
     def _next_to_purge_timestamp(self):
         """Find the timestamp when the next purge would occur."""
+        if self._window is not None:
+            return self._window.next_expiry
         if self.ages and self._max_age:
             # Take the oldest entry from the ages list and add the configured max_age.
             # If executed after purging old states, the result is the next timestamp
@@ -245,6 +299,34 @@ class StatisticsSensor(Entity):
         if self._max_age is not None:
             self._purge_old()
 
+        if self._window is not None:
+            self._update_from_window()
+        else:
+            self._update_from_states()
+
+        # If max_age is set, ensure to update again after the defined interval.
+        next_to_purge_timestamp = self._next_to_purge_timestamp()
+        if next_to_purge_timestamp:
+            _LOGGER.debug(
+                "%s: scheduling update at %s", self.entity_id, next_to_purge_timestamp
+            )
+            if self._update_listener:
+                self._update_listener()
+                self._update_listener = None
+
+            @callback
+            def _scheduled_update(now):
+                """Timer callback for sensor update."""
+                _LOGGER.debug("%s: executing scheduled update", self.entity_id)
+                self.async_schedule_update_ha_state(True)
+                self._update_listener = None
+
+            self._update_listener = async_track_point_in_utc_time(
+                self.hass, _scheduled_update, next_to_purge_timestamp
+            )
+
+    def _update_from_states(self):
+        """Calculate the statistics of the states in the queue."""
         self.count = len(self.states)
 
         if not self.is_binary:
@@ -291,26 +373,52 @@ class StatisticsSensor(Entity):
                 self.change = self.average_change = STATE_UNKNOWN
                 self.change_rate = STATE_UNKNOWN
 
-        # If max_age is set, ensure to update again after the defined interval.
-        next_to_purge_timestamp = self._next_to_purge_timestamp()
-        if next_to_purge_timestamp:
-            _LOGGER.debug(
-                "%s: scheduling update at %s", self.entity_id, next_to_purge_timestamp
-            )
-            if self._update_listener:
-                self._update_listener()
-                self._update_listener = None
+    def _update_from_window(self):
+        """Read the statistics of the long window."""
+        window = self._window
+        self.count = window.count
 
-            @callback
-            def _scheduled_update(now):
-                """Timer callback for sensor update."""
-                _LOGGER.debug("%s: executing scheduled update", self.entity_id)
-                self.async_schedule_update_ha_state(True)
-                self._update_listener = None
+        if self.is_binary:
+            return
 
-            self._update_listener = async_track_point_in_utc_time(
-                self.hass, _scheduled_update, next_to_purge_timestamp
-            )
+        if window.count:
+            self.mean = round(window.mean, self._precision)
+            self.median = round(window.median, self._precision)
+            self.total = round(window.total, self._precision)
+            self.min = round(window.min, self._precision)
+            self.max = round(window.max, self._precision)
+
+            self.min_age, first_value = window.oldest
+            self.max_age, last_value = window.newest
+
+            self.change = last_value - first_value
+            self.average_change = self.change
+            self.change_rate = 0
+
+            if window.count > 1:
+                self.average_change /= window.count - 1
+
+                time_diff = (self.max_age - self.min_age).total_seconds()
+                if time_diff > 0:
+                    self.change_rate = self.change / time_diff
+
+            self.change = round(self.change, self._precision)
+            self.average_change = round(self.average_change, self._precision)
+            self.change_rate = round(self.change_rate, self._precision)
+
+        else:
+            self.mean = self.median = STATE_UNKNOWN
+            self.total = self.min = self.max = STATE_UNKNOWN
+            self.min_age = self.max_age = dt_util.utcnow()
+            self.change = self.average_change = STATE_UNKNOWN
+            self.change_rate = STATE_UNKNOWN
+
+        if window.count > 1:
+            variance = window.variance
+            self.stdev = round(math.sqrt(variance), self._precision)
+            self.variance = round(variance, self._precision)
+        else:
+            self.stdev = self.variance = STATE_UNKNOWN
 
     async def _async_initialize_from_database(self):
         """Initialize the list of states from the database.
@@ -352,3 +460,63 @@ class StatisticsSensor(Entity):
         self.async_schedule_update_ha_state(True)
 
         _LOGGER.debug("%s: initializing from database completed", self.entity_id)
+
+    async def _async_initialize_window_from_database(self, end):
+        """Seed the long window from aggregates computed by the database.
+
+        The states are counted by value within each bucket of the window, so
+        the number of rows loaded doesn't grow with the rate of the samples.
+        States from end on are received by the state listener.
+        """
+        _LOGGER.debug("%s: initializing window from the database", self.entity_id)
+
+        rows = await self.hass.async_add_executor_job(
+            self._query_window_aggregates, end
+        )
+
+        for state, count, first_time, last_time in rows:
+            if state in [STATE_UNKNOWN, STATE_UNAVAILABLE, None]:
+                continue
+            try:
+                value = None if self.is_binary else float(state)
+            except ValueError:
+                continue
+            self._window.add(
+                value,
+                process_timestamp(first_time),
+                process_timestamp(last_time),
+                count,
+            )
+
+        pending_states = self._pending_states
+        self._pending_states = None
+        for state in pending_states or ():
+            self._add_state_to_queue(state)
+
+        self.async_schedule_update_ha_state(True)
+
+        _LOGGER.debug("%s: initializing from database completed", self.entity_id)
+
+    def _query_window_aggregates(self, end):
+        """Count the states of each value in the buckets of the window."""
+        boundaries = self._window.bucket_starts(end - self._max_age, end)
+        rows = []
+
+        with session_scope(hass=self.hass) as session:
+            for start, stop in zip(boundaries, boundaries[1:]):
+                query = (
+                    session.query(
+                        States.state,
+                        func.count(States.state_id),
+                        func.min(States.last_updated),
+                        func.max(States.last_updated),
+                    )
+                    .filter(States.entity_id == self._entity_id.lower())
+                    .filter(States.last_updated >= start)
+                    .filter(States.last_updated < stop)
+                    .group_by(States.state)
+                    .order_by(func.min(States.last_updated))
+                )
+                rows.extend(query.all())
+
+        return rows
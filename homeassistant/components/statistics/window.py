@@ -0,0 +1,279 @@
+"""Incremental aggregates over a long time window."""
+from collections import deque
+from datetime import datetime, timedelta
+import math
+from typing import Deque, Dict, List, Optional, Tuple
+
+from homeassistant.util import dt as dt_util
+
+# Number of buckets a window is divided into
+WINDOW_BUCKETS = 60
+# Relative error of the quantiles estimated by the sketch
+SKETCH_RELATIVE_ACCURACY = 0.01
+
+SketchKey = Tuple[int, int]
+
+
+class QuantileSketch:
+    """Sketch of a distribution of values that supports removing values.
+
+    Values are counted in bins whose width grows logarithmically with the
+    magnitude of the value, so quantiles have a bounded relative error while
+    the number of bins only depends on the range of the values.
+    """
+
+    def __init__(self, relative_accuracy: float = SKETCH_RELATIVE_ACCURACY) -> None:
+        """Initialize the sketch."""
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.bins: Dict[SketchKey, int] = {}
+        self.count = 0
+
+    def key(self, value: float) -> SketchKey:
+        """Return the key of the bin of a value, ordered like the values."""
+        if value == 0:
+            return (0, 0)
+        index = math.ceil(math.log(abs(value)) / self._log_gamma)
+        if value > 0:
+            return (1, index)
+        return (-1, -index)
+
+    def add(self, value: float, count: int = 1) -> SketchKey:
+        """Add a value and return the key of its bin."""
+        key = self.key(value)
+        self.bins[key] = self.bins.get(key, 0) + count
+        self.count += count
+        return key
+
+    def remove_bins(self, bins: Dict[SketchKey, int]) -> None:
+        """Remove the values counted in bins."""
+        for key, count in bins.items():
+            remaining = self.bins[key] - count
+            if remaining:
+                self.bins[key] = remaining
+            else:
+                del self.bins[key]
+            self.count -= count
+
+    def quantile(self, quantile: float) -> Optional[float]:
+        """Return an estimate of a quantile."""
+        if not self.count:
+            return None
+
+        # Interpolate between the values around the rank like statistics does
+        rank = quantile * (self.count - 1)
+        low_rank = math.floor(rank)
+        high_rank = math.ceil(rank)
+        low = high = None
+        seen = 0
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if low is None and seen > low_rank:
+                low = self._value(key)
+            if seen > high_rank:
+                high = self._value(key)
+                break
+
+        return low + (high - low) * (rank - low_rank)
+
+    def _value(self, key: SketchKey) -> float:
+        """Return the value representing a bin."""
+        sign, index = key
+        if not sign:
+            return 0.0
+        return sign * 2 * self._gamma ** (sign * index) / (self._gamma + 1)
+
+
+class _WindowBucket:
+    """Aggregates of the samples of a slice of the window."""
+
+    __slots__ = (
+        "start",
+        "count",
+        "total",
+        "total_squares",
+        "bins",
+        "first_time",
+        "first_value",
+        "last_time",
+        "last_value",
+    )
+
+    def __init__(self, start: float, first_time: datetime) -> None:
+        """Initialize the bucket."""
+        self.start = start
+        self.count = 0
+        self.total = 0.0
+        self.total_squares = 0.0
+        self.bins: Dict[SketchKey, int] = {}
+        self.first_time = self.last_time = first_time
+        self.first_value: Optional[float] = None
+        self.last_value: Optional[float] = None
+
+
+class LongWindow:
+    """Statistics of the samples of a time window, updated incrementally.
+
+    The window is divided in buckets holding the aggregates of their samples,
+    and samples expire a bucket at a time once all the samples of a bucket are
+    older than the maximum age. The running sums are kept relative to the
+    first value seen to limit the loss of precision of the variance.
+    """
+
+    def __init__(self, max_age: timedelta, buckets: int = WINDOW_BUCKETS) -> None:
+        """Initialize the window."""
+        self._max_age = max_age
+        self._width = max_age.total_seconds() / buckets
+        self._buckets: Deque[_WindowBucket] = deque()
+        self._sketch = QuantileSketch()
+        # Monotonic deques of (bucket start, value) holding the candidates
+        # for the minimum and maximum once older buckets expire
+        self._min: Deque[Tuple[float, float]] = deque()
+        self._max: Deque[Tuple[float, float]] = deque()
+        self._shift: Optional[float] = None
+        self._total = 0.0
+        self._total_squares = 0.0
+        self.count = 0
+
+    def bucket_starts(self, start: datetime, end: datetime) -> List[datetime]:
+        """Return the boundaries of the buckets between two points in time."""
+        bucket_start = math.floor(start.timestamp() / self._width) * self._width
+        boundaries = [start]
+        while True:
+            bucket_start += self._width
+            if bucket_start >= end.timestamp():
+                break
+            boundaries.append(dt_util.utc_from_timestamp(bucket_start))
+        boundaries.append(end)
+        return boundaries
+
+    def add(
+        self,
+        value: Optional[float],
+        first_time: datetime,
+        last_time: Optional[datetime] = None,
+        count: int = 1,
+    ) -> None:
+        """Add samples with the same value.
+
+        The value is None for samples that are only counted. Samples older
+        than the newest bucket are added to it.
+        """
+        if last_time is None:
+            last_time = first_time
+
+        start = math.floor(first_time.timestamp() / self._width) * self._width
+        if self._buckets and start <= self._buckets[-1].start:
+            bucket = self._buckets[-1]
+        else:
+            bucket = _WindowBucket(start, first_time)
+            bucket.first_value = value
+            self._buckets.append(bucket)
+
+        bucket.count += count
+        self.count += count
+        if first_time < bucket.first_time:
+            bucket.first_time = first_time
+            bucket.first_value = value
+        if last_time >= bucket.last_time:
+            bucket.last_time = last_time
+            bucket.last_value = value
+
+        if value is None:
+            return
+
+        if self._shift is None:
+            self._shift = value
+        shifted = value - self._shift
+        bucket.total += shifted * count
+        bucket.total_squares += shifted * shifted * count
+        self._total += shifted * count
+        self._total_squares += shifted * shifted * count
+
+        key = self._sketch.add(value, count)
+        bucket.bins[key] = bucket.bins.get(key, 0) + count
+
+        # Only the extreme value of a bucket matters as buckets expire at once
+        while self._min and self._min[-1][1] >= value:
+            self._min.pop()
+        if not self._min or self._min[-1][0] != bucket.start:
+            self._min.append((bucket.start, value))
+        while self._max and self._max[-1][1] <= value:
+            self._max.pop()
+        if not self._max or self._max[-1][0] != bucket.start:
+            self._max.append((bucket.start, value))
+
+    def purge(self, now: datetime) -> None:
+        """Remove the buckets whose samples are all older than the maximum age."""
+        while self._buckets and (now - self._buckets[0].last_time) > self._max_age:
+            bucket = self._buckets.popleft()
+            self.count -= bucket.count
+            self._total -= bucket.total
+            self._total_squares -= bucket.total_squares
+            self._sketch.remove_bins(bucket.bins)
+            while self._min and self._min[0][0] <= bucket.start:
+                self._min.popleft()
+            while self._max and self._max[0][0] <= bucket.start:
+                self._max.popleft()
+
+        if not self._buckets:
+            # Drop the rounding errors accumulated by the removals
+            self._total = self._total_squares = 0.0
+
+    @property
+    def next_expiry(self) -> Optional[datetime]:
+        """Return when the oldest bucket expires."""
+        if not self._buckets:
+            return None
+        return self._buckets[0].last_time + self._max_age
+
+    @property
+    def oldest(self) -> Tuple[Optional[datetime], Optional[float]]:
+        """Return the time and value of the oldest sample."""
+        if not self._buckets:
+            return None, None
+        return self._buckets[0].first_time, self._buckets[0].first_value
+
+    @property
+    def newest(self) -> Tuple[Optional[datetime], Optional[float]]:
+        """Return the time and value of the newest sample."""
+        if not self._buckets:
+            return None, None
+        return self._buckets[-1].last_time, self._buckets[-1].last_value
+
+    @property
+    def total(self) -> Optional[float]:
+        """Return the sum of the values."""
+        if not self.count or self._shift is None:
+            return None
+        return self._shift * self.count + self._total
+
+    @property
+    def mean(self) -> Optional[float]:
+        """Return the mean of the values."""
+        if not self.count or self._shift is None:
+            return None
+        return self._shift + self._total / self.count
+
+    @property
+    def variance(self) -> Optional[float]:
+        """Return the sample variance of the values."""
+        if self.count < 2 or self._shift is None:
+            return None
+        squares = self._total_squares - self._total * self._total / self.count
+        return max(squares, 0.0) / (self.count - 1)
+
+    @property
+    def median(self) -> Optional[float]:
+        """Return an estimate of the median of the values."""
+        return self._sketch.quantile(0.5)
+
+    @property
+    def min(self) -> Optional[float]:
+        """Return the smallest value."""
+        return self._min[0][1] if self._min else None
+
+    @property
+    def max(self) -> Optional[float]:
+        """Return the largest value."""
+        return self._max[0][1] if self._max else None
@@ -259,7 +259,7 @@ class TemplateEntity(Entity):
                 attribute.async_setup()
 
         result_info = async_track_template_result(
-            self.hass, template_var_tups, self._handle_results
+            self.hass, template_var_tups, self._handle_results, coalesce=True
         )
         self.async_on_remove(result_info.async_remove)
         self._async_update = result_info.async_refresh
@@ -1,4 +1,6 @@
 """Handle the auth of a connection."""
+from typing import Dict, Optional
+
 import voluptuous as vol
 from voluptuous.humanize import humanize_error
 
@@ -7,6 +9,7 @@ from homeassistant.components.http.ban import process_success_login, process_wro
 from homeassistant.const import __version__
 
 from .connection import ActiveConnection
+from .const import FEATURE_COALESCE_MESSAGES
 from .error import Disconnect
 
 # mypy: allow-untyped-calls, allow-untyped-defs
@@ -21,13 +24,19 @@ AUTH_MESSAGE_SCHEMA = vol.Schema(
         vol.Required("type"): TYPE_AUTH,
         vol.Exclusive("api_password", "auth"): str,
         vol.Exclusive("access_token", "auth"): str,
+        vol.Optional("supported_features"): vol.Schema(
+            {vol.Optional(FEATURE_COALESCE_MESSAGES): bool}, extra=vol.REMOVE_EXTRA
+        ),
     }
 )
 
 
-def auth_ok_message():
+def auth_ok_message(supported_features=None):
     """Return an auth_ok message."""
-    return {"type": TYPE_AUTH_OK, "ha_version": __version__}
+    message = {"type": TYPE_AUTH_OK, "ha_version": __version__}
+    if supported_features is not None:
+        message["supported_features"] = supported_features
+    return message
 
 
 def auth_required_message():
@@ -70,19 +79,33 @@ class AuthPhase:
                 msg["access_token"]
             )
             if refresh_token is not None:
-                return await self._async_finish_auth(refresh_token.user, refresh_token)
+                return await self._async_finish_auth(
+                    refresh_token.user, refresh_token, msg.get("supported_features")
+                )
 
         self._send_message(auth_invalid_message("Invalid access token or password"))
         await process_wrong_login(self._request)
         raise Disconnect
 
     async def _async_finish_auth(
-        self, user: User, refresh_token: RefreshToken
+        self,
+        user: User,
+        refresh_token: RefreshToken,
+        supported_features: Optional[Dict[str, bool]] = None,
     ) -> ActiveConnection:
-        """Create an active connection."""
+        """Create an active connection.
+
+        The features requested by the client are confirmed in the auth_ok
+        message and take effect once it has been sent.
+        """
         self._logger.debug("Auth OK")
         await process_success_login(self._request)
-        self._send_message(auth_ok_message())
+        self._send_message(auth_ok_message(supported_features))
         return ActiveConnection(
-            self._logger, self._hass, self._send_message, user, refresh_token
+            self._logger,
+            self._hass,
+            self._send_message,
+            user,
+            refresh_token,
+            supported_features,
         )
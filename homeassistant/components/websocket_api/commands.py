@@ -6,7 +6,7 @@ import voluptuous as vol
 from homeassistant.auth.permissions.const import CAT_ENTITIES, POLICY_READ
 from homeassistant.components.websocket_api.const import ERR_NOT_FOUND
 from homeassistant.const import EVENT_STATE_CHANGED, EVENT_TIME_CHANGED, MATCH_ALL
-from homeassistant.core import DOMAIN as HASS_DOMAIN, callback
+from homeassistant.core import DOMAIN as HASS_DOMAIN, callback, split_entity_id
 from homeassistant.exceptions import (
     HomeAssistantError,
     ServiceNotFound,
@@ -18,6 +18,7 @@ from homeassistant.helpers.event import TrackTemplate, async_track_template_resu
 from homeassistant.helpers.service import async_get_all_descriptions
 from homeassistant.helpers.template import Template
 from homeassistant.loader import IntegrationNotFound, async_get_integration
+from homeassistant.setup import async_get_setup_timeline
 
 from . import const, decorators, messages
 
@@ -29,6 +30,7 @@ def async_register_commands(hass, async_reg):
     """Register commands."""
     async_reg(hass, handle_subscribe_events)
     async_reg(hass, handle_unsubscribe_events)
+    async_reg(hass, handle_subscribe_entities)
     async_reg(hass, handle_call_service)
     async_reg(hass, handle_get_states)
     async_reg(hass, handle_get_services)
@@ -40,6 +42,8 @@ def async_register_commands(hass, async_reg):
     async_reg(hass, handle_entity_source)
     async_reg(hass, handle_subscribe_trigger)
     async_reg(hass, handle_test_condition)
+    async_reg(hass, handle_startup_timeline)
+    async_reg(hass, handle_connection_stats)
 
 
 def pong_message(iden):
@@ -94,6 +98,63 @@ def handle_subscribe_events(hass, connection, msg):
     connection.send_message(messages.result_message(msg["id"]))
 
 
+@callback
+@decorators.websocket_command(
+    {
+        vol.Required("type"): "subscribe_entities",
+        vol.Optional("entity_ids"): cv.entity_ids,
+        vol.Optional("domains"): vol.All(cv.ensure_list, [cv.string]),
+    }
+)
+def handle_subscribe_entities(hass, connection, msg):
+    """Handle subscribe entities command.
+
+    Sends the current states of the entities, followed by the changes of
+    each entity compared to its previous state.
+    """
+    entity_ids = set(msg.get("entity_ids", ()))
+    domains = set(msg.get("domains", ()))
+    entity_perm = connection.user.permissions.check_entity
+
+    @callback
+    def include_entity(entity_id):
+        """Return if the changes of an entity are sent."""
+        if (entity_ids or domains) and not (
+            entity_id in entity_ids or split_entity_id(entity_id)[0] in domains
+        ):
+            return False
+        return entity_perm(entity_id, POLICY_READ)
+
+    @callback
+    def forward_entity_changes(event):
+        """Forward entity state changes to websocket."""
+        if not include_entity(event.data["entity_id"]):
+            return
+
+        connection.send_message(messages.cached_state_diff_message(msg["id"], event))
+
+    if entity_ids or domains:
+        connection.subscriptions[msg["id"]] = hass.bus.async_listen_entities(
+            EVENT_STATE_CHANGED, forward_entity_changes, entity_ids, domains
+        )
+    else:
+        connection.subscriptions[msg["id"]] = hass.bus.async_listen(
+            EVENT_STATE_CHANGED, forward_entity_changes
+        )
+    connection.send_result(msg["id"])
+
+    connection.send_message(
+        messages.entities_snapshot_message(
+            msg["id"],
+            [
+                state
+                for state in hass.states.async_all()
+                if include_entity(state.entity_id)
+            ],
+        )
+    )
+
+
 @callback
 @decorators.websocket_command(
     {
@@ -188,7 +249,7 @@ def handle_get_states(hass, connection, msg):
             if entity_perm(state.entity_id, "read")
         ]
 
-    connection.send_message(messages.result_message(msg["id"], states))
+    connection.send_message(messages.states_result_message(msg["id"], states))
 
 
 @decorators.websocket_command({vol.Required("type"): "get_services"})
@@ -236,6 +297,40 @@ async def handle_manifest_get(hass, connection, msg):
         connection.send_error(msg["id"], const.ERR_NOT_FOUND, "Integration not found")
 
 
+@callback
+@decorators.require_admin
+@decorators.websocket_command(
+    {
+        vol.Required("type"): "startup_timeline",
+        vol.Optional("format", default="timeline"): vol.In(
+            ["timeline", "chrome_trace"]
+        ),
+    }
+)
+def handle_startup_timeline(hass, connection, msg):
+    """Handle startup timeline command."""
+    timeline = async_get_setup_timeline(hass)
+    if msg["format"] == "chrome_trace":
+        result = timeline.as_chrome_trace()
+    else:
+        result = timeline.as_dict()
+    connection.send_result(msg["id"], result)
+
+
+@callback
+@decorators.require_admin
+@decorators.websocket_command({vol.Required("type"): "connection_stats"})
+def handle_connection_stats(hass, connection, msg):
+    """Handle connection stats command."""
+    connection.send_result(
+        msg["id"],
+        [
+            handler.async_get_stats()
+            for handler in hass.data.get(const.DATA_HANDLERS, ())
+        ],
+    )
+
+
 @callback
 @decorators.websocket_command({vol.Required("type"): "ping"})
 def handle_ping(hass, connection, msg):
@@ -15,7 +15,9 @@ from . import const, messages
 class ActiveConnection:
     """Handle an active websocket client connection."""
 
-    def __init__(self, logger, hass, send_message, user, refresh_token):
+    def __init__(
+        self, logger, hass, send_message, user, refresh_token, supported_features=None
+    ):
         """Initialize an active connection."""
         self.logger = logger
         self.hass = hass
@@ -25,6 +27,7 @@ class ActiveConnection:
             self.refresh_token_id = refresh_token.id
         else:
             self.refresh_token_id = None
+        self.supported_features: Dict[str, bool] = supported_features or {}
 
         self.subscriptions: Dict[Hashable, Callable[[], Any]] = {}
         self.last_id = 0
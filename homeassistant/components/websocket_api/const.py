@@ -2,11 +2,10 @@
 import asyncio
 from concurrent import futures
 from functools import partial
-import json
 from typing import TYPE_CHECKING, Callable
 
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.json import JSONEncoder
+from homeassistant.helpers.json import json_dumps
 
 if TYPE_CHECKING:
     from .connection import ActiveConnection  # noqa
@@ -33,6 +32,9 @@ ERR_TEMPLATE_ERROR = "template_error"
 
 TYPE_RESULT = "result"
 
+# Protocol features a client can enable when authenticating
+FEATURE_COALESCE_MESSAGES = "coalesce_messages"
+
 # Define the possible errors that occur when connections are cancelled.
 # Originally, this was just asyncio.CancelledError, but issue #9546 showed
 # that futures.CancelledErrors can also occur in some situations.
@@ -44,5 +46,8 @@ SIGNAL_WEBSOCKET_DISCONNECTED = "websocket_disconnected"
 
 # Data used to store the current connection list
 DATA_CONNECTIONS = f"{DOMAIN}.connections"
+# Data used to store the handlers of the open connections
+DATA_HANDLERS = f"{DOMAIN}.handlers"
 
-JSON_DUMP = partial(json.dumps, cls=JSONEncoder, allow_nan=False)
+# Messages serialize NaN and infinite floats as null
+JSON_DUMP = partial(json_dumps, nan_as_null=True)
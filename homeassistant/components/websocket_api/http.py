@@ -2,7 +2,7 @@
 import asyncio
 from contextlib import suppress
 import logging
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from aiohttp import WSMsgType, web
 import async_timeout
@@ -16,6 +16,8 @@ from .auth import AuthPhase, auth_required_message
 from .const import (
     CANCELLATION_ERRORS,
     DATA_CONNECTIONS,
+    DATA_HANDLERS,
+    FEATURE_COALESCE_MESSAGES,
     MAX_PENDING_MSG,
     PENDING_MSG_PEAK,
     PENDING_MSG_PEAK_TIME,
@@ -63,9 +65,19 @@ class WebSocketHandler:
         self._writer_task = None
         self._logger = WebSocketAdapter(_WS_LOGGER, {"connid": id(self)})
         self._peak_checker_unsub = None
+        self._connection = None
+        self._coalesce_messages = False
+        self._max_pending = 0
+        self._messages_sent = 0
+        self._frames_sent = 0
+        self._peak_checks = 0
 
     async def _writer(self):
-        """Write outgoing messages."""
+        """Write outgoing messages.
+
+        When the client enabled coalescing, the messages queued by the time the
+        writer runs are sent as a single frame holding a JSON array.
+        """
         # Exceptions if Socket disconnected or cancelled by connection handler
         with suppress(RuntimeError, ConnectionResetError, *CANCELLATION_ERRORS):
             while not self.wsock.closed:
@@ -73,12 +85,31 @@ class WebSocketHandler:
                 if message is None:
                     break
 
-                self._logger.debug("Sending %s", message)
+                messages = [message]
+                if self._coalesce_messages:
+                    while not self._to_write.empty():
+                        message = self._to_write.get_nowait()
+                        if message is None:
+                            break
+                        messages.append(message)
 
-                if not isinstance(message, str):
-                    message = message_to_json(message)
+                self._logger.debug("Sending %s", messages)
 
-                await self.wsock.send_str(message)
+                payloads = [
+                    msg if isinstance(msg, str) else message_to_json(msg)
+                    for msg in messages
+                ]
+
+                if len(payloads) == 1:
+                    await self.wsock.send_str(payloads[0])
+                else:
+                    await self.wsock.send_str(f"[{','.join(payloads)}]")
+
+                self._messages_sent += len(payloads)
+                self._frames_sent += 1
+
+                if message is None:
+                    break
 
         # Clean up the peaker checker when we shut down the writer
         if self._peak_checker_unsub:
@@ -102,7 +133,11 @@ class WebSocketHandler:
 
             self._cancel()
 
-        if self._to_write.qsize() < PENDING_MSG_PEAK:
+        pending = self._to_write.qsize()
+        if pending > self._max_pending:
+            self._max_pending = pending
+
+        if pending < PENDING_MSG_PEAK:
             if self._peak_checker_unsub:
                 self._peak_checker_unsub()
                 self._peak_checker_unsub = None
@@ -117,6 +152,7 @@ class WebSocketHandler:
     def _check_write_peak(self, _):
         """Check that we are no longer above the write peak."""
         self._peak_checker_unsub = None
+        self._peak_checks += 1
 
         if self._to_write.qsize() < PENDING_MSG_PEAK:
             return
@@ -128,6 +164,24 @@ class WebSocketHandler:
         )
         self._cancel()
 
+    @callback
+    def async_get_stats(self) -> Dict[str, Any]:
+        """Return statistics about the outgoing messages of the connection."""
+        connection = self._connection
+        return {
+            "connection_id": id(self),
+            "user_id": None
+            if connection is None or connection.user is None
+            else connection.user.id,
+            "coalesce_messages": self._coalesce_messages,
+            "pending_messages": self._to_write.qsize(),
+            "max_pending_messages": self._max_pending,
+            "messages_sent": self._messages_sent,
+            "frames_sent": self._frames_sent,
+            "peak_checks": self._peak_checks,
+            "peak_check_scheduled": self._peak_checker_unsub is not None,
+        }
+
     @callback
     def _cancel(self):
         """Cancel the connection."""
@@ -154,6 +208,8 @@ class WebSocketHandler:
         # As the webserver is now started before the start
         # event we do not want to block for websocket responses
         self._writer_task = asyncio.create_task(self._writer())
+        handlers = self.hass.data.setdefault(DATA_HANDLERS, set())
+        handlers.add(self)
 
         auth = AuthPhase(self._logger, self.hass, self._send_message, request)
         connection = None
@@ -184,7 +240,10 @@ class WebSocketHandler:
                 raise Disconnect from err
 
             self._logger.debug("Received %s", msg_data)
-            connection = await auth.async_handle(msg_data)
+            connection = self._connection = await auth.async_handle(msg_data)
+            self._coalesce_messages = connection.supported_features.get(
+                FEATURE_COALESCE_MESSAGES, False
+            )
             self.hass.data[DATA_CONNECTIONS] = (
                 self.hass.data.get(DATA_CONNECTIONS, 0) + 1
             )
@@ -223,6 +282,7 @@ class WebSocketHandler:
 
         finally:
             unsub_stop()
+            handlers.discard(self)
 
             if connection is not None:
                 connection.async_close()
@@ -2,17 +2,16 @@
 
 from functools import lru_cache
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, Iterable, Union
 
 import voluptuous as vol
 
-from homeassistant.core import Event
+from homeassistant.core import Event, State
 from homeassistant.helpers import config_validation as cv
 from homeassistant.util.json import (
     find_paths_unserializable_data,
     format_unserializable_data,
 )
-from homeassistant.util.yaml.loader import JSON_TYPE
 
 from . import const
 
@@ -30,6 +29,20 @@ BASE_COMMAND_MESSAGE_SCHEMA = vol.Schema({vol.Required("id"): cv.positive_int})
 
 IDEN_TEMPLATE = "__IDEN__"
 IDEN_JSON_TEMPLATE = '"__IDEN__"'
+STATES_TEMPLATE = "__STATES__"
+STATES_JSON_TEMPLATE = '"__STATES__"'
+
+# Keys of the compressed states sent to entity subscriptions
+COMPRESSED_STATE_STATE = "s"
+COMPRESSED_STATE_ATTRIBUTES = "a"
+COMPRESSED_STATE_CONTEXT = "c"
+COMPRESSED_STATE_LAST_CHANGED = "lc"
+COMPRESSED_STATE_LAST_UPDATED = "lu"
+
+# Keys of the entity subscription events
+ENTITY_EVENT_ADD = "a"
+ENTITY_EVENT_REMOVE = "r"
+ENTITY_EVENT_CHANGE = "c"
 
 
 def result_message(iden: int, result: Any = None) -> Dict:
@@ -47,7 +60,7 @@ def error_message(iden: int, code: str, message: str) -> Dict:
     }
 
 
-def event_message(iden: JSON_TYPE, event: Any) -> Dict:
+def event_message(iden: Union[int, str], event: Any) -> Dict:
     """Return an event message."""
     return {"id": iden, "type": "event", "event": event}
 
@@ -74,6 +87,122 @@ def _cached_event_message(event: Event) -> str:
     return message_to_json(event_message(IDEN_TEMPLATE, event))
 
 
+def states_result_message(iden: int, states: Iterable[State]) -> str:
+    """Return a result message with a list of states serialized to json.
+
+    Reuses the json that each state caches, so states that did not change
+    since the previous request are not serialized again.
+    """
+    states = list(states)
+    try:
+        states_json = ",".join([state.as_json() for state in states])
+    except (ValueError, TypeError):
+        # Let message_to_json report the data that is not serializable
+        return message_to_json(result_message(iden, states))
+
+    return message_to_json(result_message(iden, STATES_TEMPLATE)).replace(
+        STATES_JSON_TEMPLATE, f"[{states_json}]", 1
+    )
+
+
+def compressed_state_dict(state: State) -> Dict[str, Any]:
+    """Return a compressed representation of a state.
+
+    Last updated is only included when it differs from last changed.
+    """
+    compressed = {
+        COMPRESSED_STATE_STATE: state.state,
+        COMPRESSED_STATE_ATTRIBUTES: dict(state.attributes),
+        COMPRESSED_STATE_CONTEXT: state.context.id,
+        COMPRESSED_STATE_LAST_CHANGED: state.last_changed.timestamp(),
+    }
+    if state.last_changed != state.last_updated:
+        compressed[COMPRESSED_STATE_LAST_UPDATED] = state.last_updated.timestamp()
+    return compressed
+
+
+def compressed_state_diff(old_state: State, new_state: State) -> Dict[str, Any]:
+    """Return the difference between two states of an entity.
+
+    Changed values are listed under "+" and removed attribute keys under "-".
+    """
+    additions: Dict[str, Any] = {}
+    diff: Dict[str, Any] = {}
+
+    if old_state.state != new_state.state:
+        additions[COMPRESSED_STATE_STATE] = new_state.state
+    if old_state.last_changed != new_state.last_changed:
+        additions[COMPRESSED_STATE_LAST_CHANGED] = new_state.last_changed.timestamp()
+    elif old_state.last_updated != new_state.last_updated:
+        additions[COMPRESSED_STATE_LAST_UPDATED] = new_state.last_updated.timestamp()
+    if old_state.context.id != new_state.context.id:
+        additions[COMPRESSED_STATE_CONTEXT] = new_state.context.id
+
+    old_attributes = old_state.attributes
+    new_attributes = new_state.attributes
+    if old_attributes != new_attributes:
+        added = {
+            key: value
+            for key, value in new_attributes.items()
+            if key not in old_attributes or old_attributes[key] != value
+        }
+        if added:
+            additions[COMPRESSED_STATE_ATTRIBUTES] = added
+        removed = [key for key in old_attributes if key not in new_attributes]
+        if removed:
+            diff["-"] = {COMPRESSED_STATE_ATTRIBUTES: removed}
+
+    if additions:
+        diff["+"] = additions
+    return diff
+
+
+def entities_snapshot_message(iden: int, states: Iterable[State]) -> Dict:
+    """Return an entity subscription event adding the current states."""
+    return event_message(
+        iden,
+        {
+            ENTITY_EVENT_ADD: {
+                state.entity_id: compressed_state_dict(state) for state in states
+            }
+        },
+    )
+
+
+def cached_state_diff_message(iden: int, event: Event) -> str:
+    """Return an entity subscription event for a state changed event.
+
+    Serialize to json once per message.
+    """
+    return _cached_state_diff_message(event).replace(IDEN_JSON_TEMPLATE, str(iden), 1)
+
+
+@lru_cache(maxsize=128)
+def _cached_state_diff_message(event: Event) -> str:
+    """Cache and serialize the entity subscription event to json.
+
+    The IDEN_TEMPLATE is used which will be replaced
+    with the actual iden in cached_state_diff_message
+    """
+    entity_id = event.data["entity_id"]
+    old_state = event.data["old_state"]
+    new_state = event.data["new_state"]
+
+    entity_event: Dict[str, Any]
+    if new_state is None:
+        entity_event = {ENTITY_EVENT_REMOVE: [entity_id]}
+    elif old_state is None:
+        entity_event = {ENTITY_EVENT_ADD: {entity_id: compressed_state_dict(new_state)}}
+    else:
+        entity_event = {
+            ENTITY_EVENT_CHANGE: {
+                entity_id: compressed_state_diff(old_state, new_state)
+            }
+        }
+
+    return message_to_json(event_message(IDEN_TEMPLATE, entity_event))
+
+
 def message_to_json(message: Any) -> str:
     """Serialize a websocket message to json."""
     try:
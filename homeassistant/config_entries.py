@@ -16,7 +16,12 @@ from homeassistant.exceptions import ConfigEntryNotReady, HomeAssistantError
 from homeassistant.helpers import entity_registry
 from homeassistant.helpers.event import Event
 from homeassistant.helpers.typing import UNDEFINED, UndefinedType
-from homeassistant.setup import async_process_deps_reqs, async_setup_component
+from homeassistant.setup import (
+    PHASE_CONFIG_ENTRY,
+    async_get_setup_timeline,
+    async_process_deps_reqs,
+    async_setup_component,
+)
 from homeassistant.util.decorator import Registry
 import homeassistant.util.uuid as uuid_util
 
@@ -238,7 +243,10 @@ class ConfigEntry:
                 return
 
         try:
-            result = await component.async_setup_entry(hass, self)  # type: ignore
+            with async_get_setup_timeline(hass).async_track(
+                integration.domain, PHASE_CONFIG_ENTRY, self.title
+            ):
+                result = await component.async_setup_entry(hass, self)  # type: ignore
 
             if not isinstance(result, bool):
                 _LOGGER.error(
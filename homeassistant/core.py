@@ -12,6 +12,7 @@ import logging
 import os
 import pathlib
 import re
+import sys
 import threading
 from time import monotonic
 from types import MappingProxyType
@@ -40,6 +41,7 @@ import yarl
 from homeassistant import block_async_io, loader, util
 from homeassistant.const import (
     ATTR_DOMAIN,
+    ATTR_ENTITY_ID,
     ATTR_FRIENDLY_NAME,
     ATTR_NOW,
     ATTR_SECONDS,
@@ -69,6 +71,7 @@ from homeassistant.exceptions import (
     ServiceNotFound,
     Unauthorized,
 )
+from homeassistant.helpers.json import json_dumps
 from homeassistant.util import location
 from homeassistant.util.async_ import (
     fire_coroutine_threadsafe,
@@ -662,6 +665,11 @@ class EventBus:
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize a new event bus."""
         self._listeners: Dict[str, List[HassJob]] = {}
+        # Listeners by event type and then by entity_id or domain
+        self._entity_listeners: Dict[str, Dict[str, List[HassJob]]] = {}
+        self._domain_listeners: Dict[str, Dict[str, List[HassJob]]] = {}
+        # Number of events fired by event type
+        self._fired: Dict[str, int] = {}
         self._hass = hass
 
     @callback
@@ -670,13 +678,29 @@ class EventBus:
 
         This method must be run in the event loop.
         """
-        return {key: len(self._listeners[key]) for key in self._listeners}
+        listeners = {key: len(self._listeners[key]) for key in self._listeners}
+        indexed_jobs: Dict[str, Set[HassJob]] = {}
+        for index in (self._entity_listeners, self._domain_listeners):
+            for event_type, indexed_listeners in index.items():
+                for indexed_jobs_list in indexed_listeners.values():
+                    indexed_jobs.setdefault(event_type, set()).update(indexed_jobs_list)
+        for event_type, jobs in indexed_jobs.items():
+            listeners[event_type] = listeners.get(event_type, 0) + len(jobs)
+        return listeners
 
     @property
     def listeners(self) -> Dict[str, int]:
         """Return dictionary with events and the number of listeners."""
         return run_callback_threadsafe(self._hass.loop, self.async_listeners).result()
 
+    @callback
+    def async_fired(self) -> Dict[str, int]:
+        """Return dictionary with events and the number of times they were fired.
+
+        This method must be run in the event loop.
+        """
+        return dict(self._fired)
+
     def fire(
         self,
         event_type: str,
@@ -702,6 +726,7 @@ class EventBus:
 
         This method must be run in the event loop.
         """
+        self._fired[event_type] = self._fired.get(event_type, 0) + 1
         listeners = self._listeners.get(event_type, [])
 
         # EVENT_HOMEASSISTANT_CLOSE should go only to his listeners
@@ -709,6 +734,13 @@ class EventBus:
         if match_all_listeners is not None and event_type != EVENT_HOMEASSISTANT_CLOSE:
             listeners = match_all_listeners + listeners
 
+        if event_data and (
+            event_type in self._entity_listeners or event_type in self._domain_listeners
+        ):
+            indexed_listeners = self._async_indexed_listeners(event_type, event_data)
+            if indexed_listeners:
+                listeners = listeners + indexed_listeners
+
         event = Event(event_type, event_data, origin, time_fired, context)
 
         if event_type != EVENT_TIME_CHANGED:
@@ -720,6 +752,28 @@ class EventBus:
         for job in listeners:
             self._hass.async_add_hass_job(job, event)
 
+    @callback
+    def _async_indexed_listeners(
+        self, event_type: str, event_data: Dict[str, Any]
+    ) -> List[HassJob]:
+        """Return the listeners for the entity_id in the event data."""
+        entity_id = event_data.get(ATTR_ENTITY_ID)
+        if not isinstance(entity_id, str):
+            return []
+
+        jobs: List[HassJob] = []
+        entity_listeners = self._entity_listeners.get(event_type)
+        if entity_listeners and entity_id in entity_listeners:
+            jobs.extend(entity_listeners[entity_id])
+
+        domain_listeners = self._domain_listeners.get(event_type)
+        if domain_listeners:
+            domain = entity_id.partition(".")[0]
+            if domain in domain_listeners:
+                jobs.extend(job for job in domain_listeners[domain] if job not in jobs)
+
+        return jobs
+
     def listen(self, event_type: str, listener: Callable) -> CALLBACK_TYPE:
         """Listen for all events or events of a specific type.
 
@@ -757,6 +811,72 @@ class EventBus:
 
         return remove_listener
 
+    def listen_entities(
+        self,
+        event_type: str,
+        listener: Callable,
+        entity_ids: Optional[Iterable[str]] = None,
+        domains: Optional[Iterable[str]] = None,
+    ) -> CALLBACK_TYPE:
+        """Listen for events of a specific type about some entities or domains."""
+        async_remove_listener = run_callback_threadsafe(
+            self._hass.loop,
+            self.async_listen_entities,
+            event_type,
+            listener,
+            entity_ids,
+            domains,
+        ).result()
+
+        def remove_listener() -> None:
+            """Remove the listener."""
+            run_callback_threadsafe(self._hass.loop, async_remove_listener).result()
+
+        return remove_listener
+
+    @callback
+    def async_listen_entities(
+        self,
+        event_type: str,
+        listener: Callable,
+        entity_ids: Optional[Iterable[str]] = None,
+        domains: Optional[Iterable[str]] = None,
+    ) -> CALLBACK_TYPE:
+        """Listen for events of a specific type about some entities or domains.
+
+        The listener is called for events with an entity_id in their data
+        that is one of entity_ids or in one of domains. The listeners are
+        looked up by entity_id so firing an event does not walk the
+        listeners of all other entities.
+
+        This method must be run in the event loop.
+        """
+        job = HassJob(listener)
+        entity_id_keys = {entity_id.lower() for entity_id in entity_ids or ()}
+        domain_keys = {domain.lower() for domain in domains or ()}
+
+        # Empty indexes are not created, they would slow down async_fire
+        if entity_id_keys:
+            entity_listeners = self._entity_listeners.setdefault(event_type, {})
+            for entity_id in entity_id_keys:
+                entity_listeners.setdefault(entity_id, []).append(job)
+
+        if domain_keys:
+            domain_listeners = self._domain_listeners.setdefault(event_type, {})
+            for domain in domain_keys:
+                domain_listeners.setdefault(domain, []).append(job)
+
+        def remove_listener() -> None:
+            """Remove the listener."""
+            self._async_remove_indexed_listener(
+                self._entity_listeners, event_type, entity_id_keys, job
+            )
+            self._async_remove_indexed_listener(
+                self._domain_listeners, event_type, domain_keys, job
+            )
+
+        return remove_listener
+
     def listen_once(self, event_type: str, listener: Callable) -> CALLBACK_TYPE:
         """Listen once for event of a specific type.
 
@@ -825,6 +945,35 @@ class EventBus:
             # ValueError if listener did not exist within event_type
             _LOGGER.exception("Unable to remove unknown job listener %s", hassjob)
 
+    @staticmethod
+    @callback
+    def _async_remove_indexed_listener(
+        index: Dict[str, Dict[str, List[HassJob]]],
+        event_type: str,
+        keys: Iterable[str],
+        hassjob: HassJob,
+    ) -> None:
+        """Remove a listener indexed by entity_id or domain.
+
+        This method must be run in the event loop.
+        """
+        if not keys:
+            return
+
+        listeners = index.get(event_type, {})
+
+        for key in keys:
+            try:
+                listeners[key].remove(hassjob)
+            except (KeyError, ValueError):
+                _LOGGER.exception("Unable to remove unknown job listener %s", hassjob)
+                continue
+            if not listeners[key]:
+                del listeners[key]
+
+        if not listeners:
+            index.pop(event_type, None)
+
 
 class State:
     """Object to represent a state within the state machine.
@@ -837,6 +986,10 @@ class State:
     context: Context in which it was created
     domain: Domain of this state.
     object_id: Object id of this state.
+
+    The entity id and state strings are interned as they repeat across the
+    states held in memory, and an attributes mapping passed as a
+    MappingProxyType is shared instead of wrapped again.
     """
 
     __slots__ = [
@@ -849,6 +1002,7 @@ class State:
         "domain",
         "object_id",
         "_as_dict",
+        "_as_json",
     ]
 
     def __init__(
@@ -876,14 +1030,20 @@ class State:
                 "State max length is 255 characters."
             )
 
-        self.entity_id = entity_id.lower()
-        self.state = state
-        self.attributes = MappingProxyType(attributes or {})
+        self.entity_id = sys.intern(entity_id.lower())
+        self.state = sys.intern(state)
+        if isinstance(attributes, MappingProxyType):
+            self.attributes = attributes
+        else:
+            self.attributes = MappingProxyType(attributes or {})
         self.last_updated = last_updated or dt_util.utcnow()
         self.last_changed = last_changed or self.last_updated
         self.context = context or Context()
-        self.domain, self.object_id = split_entity_id(self.entity_id)
+        domain, object_id = split_entity_id(self.entity_id)
+        self.domain = sys.intern(domain)
+        self.object_id = sys.intern(object_id)
         self._as_dict: Optional[Dict[str, Collection[Any]]] = None
+        self._as_json: Optional[str] = None
 
     @property
     def name(self) -> str:
@@ -916,6 +1076,19 @@ class State:
             }
         return self._as_dict
 
+    def as_json(self) -> str:
+        """Return the JSON representation of the State.
+
+        Async friendly.
+
+        The JSON is serialized once per State, with NaN and infinite floats
+        as null when orjson is installed. Raises TypeError or ValueError if
+        the attributes are not serializable.
+        """
+        if self._as_json is None:
+            self._as_json = json_dumps(self.as_dict(), nan_as_null=True)
+        return self._as_json
+
     @classmethod
     def from_dict(cls, json_dict: Dict) -> Any:
         """Initialize a state from a dict.
@@ -1174,7 +1347,12 @@ class StateMachine:
             last_changed = None
         else:
             same_state = old_state.state == new_state and not force_update
-            same_attr = old_state.attributes == MappingProxyType(attributes)
+            # A changed state is written anyway, so its attributes are not
+            # compared. Callers share the read only attributes of the old
+            # state by passing them.
+            same_attr = attributes is old_state.attributes or (
+                same_state and old_state.attributes == attributes
+            )
             last_changed = old_state.last_changed if same_state else None
 
         if same_state and same_attr:
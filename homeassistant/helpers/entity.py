@@ -5,7 +5,8 @@ from datetime import datetime, timedelta
 import functools as ft
 import logging
 from timeit import default_timer as timer
-from typing import Any, Awaitable, Dict, Iterable, List, Optional
+from types import MappingProxyType
+from typing import Any, Awaitable, Dict, Iterable, List, Mapping, Optional, Tuple
 
 from homeassistant.config import DATA_CUSTOMIZE
 from homeassistant.const import (
@@ -29,6 +30,7 @@ from homeassistant.exceptions import HomeAssistantError, NoEntitySpecifiedError
 from homeassistant.helpers.entity_platform import EntityPlatform
 from homeassistant.helpers.entity_registry import RegistryEntry
 from homeassistant.helpers.event import Event, async_track_entity_registry_updated_event
+from homeassistant.helpers.poll_scheduler import async_get_poll_scheduler
 from homeassistant.helpers.typing import StateType
 from homeassistant.loader import bind_hass
 from homeassistant.util import dt as dt_util, ensure_unique_string, slugify
@@ -122,6 +124,22 @@ class Entity(ABC):
     # If entity is added to an entity platform
     _added = False
 
+    # If the static attributes (name, icon, device class and capability
+    # attributes) are cached between state writes. Entities enabling this
+    # call async_invalidate_static_attributes when these change, and return
+    # a new dict from state_attributes and device_state_attributes when those
+    # change. The attributes are only assembled and compared again when one
+    # of these is a different object than at the previous write.
+    _cache_static_attributes = False
+    _static_attributes: Optional[
+        Tuple[Optional[Mapping[str, Any]], Dict[str, Any]]
+    ] = None
+    # Sources, values and the attributes last written by entities caching
+    # their static attributes
+    _cached_attributes: Optional[
+        Tuple[Tuple[Any, ...], Tuple[Any, ...], Mapping[str, Any]]
+    ] = None
+
     @property
     def should_poll(self) -> bool:
         """Return True if entity has to be polled for state.
@@ -294,6 +312,34 @@ class Entity(ABC):
 
         self._async_write_ha_state()
 
+    @callback
+    def async_invalidate_static_attributes(self) -> None:
+        """Recalculate the cached static attributes on the next state write."""
+        self._static_attributes = None
+
+    @callback
+    def _async_calculate_static_attributes(
+        self,
+    ) -> Tuple[Optional[Mapping[str, Any]], Dict[str, Any]]:
+        """Return the capability attributes and the other static attributes."""
+        attr: Dict[str, Any] = {}
+
+        entry = self.registry_entry
+        # pylint: disable=consider-using-ternary
+        name = (entry and entry.name) or self.name
+        if name is not None:
+            attr[ATTR_FRIENDLY_NAME] = name
+
+        icon = (entry and entry.icon) or self.icon
+        if icon is not None:
+            attr[ATTR_ICON] = icon
+
+        device_class = self.device_class
+        if device_class is not None:
+            attr[ATTR_DEVICE_CLASS] = str(device_class)
+
+        return self.capability_attributes, attr
+
     @callback
     def _async_write_ha_state(self) -> None:
         """Write the state to the state machine."""
@@ -310,46 +356,27 @@ class Entity(ABC):
 
         start = timer()
 
-        attr = self.capability_attributes
-        attr = dict(attr) if attr else {}
+        if not self._cache_static_attributes:
+            static_attributes = self._async_calculate_static_attributes()
+        elif self._static_attributes is None:
+            static_attributes = self._async_calculate_static_attributes()
+            self._static_attributes = static_attributes
+        else:
+            static_attributes = self._static_attributes
 
         if not self.available:
             state = STATE_UNAVAILABLE
+            state_attr = device_attr = None
         else:
             sstate = self.state
             state = STATE_UNKNOWN if sstate is None else str(sstate)
-            attr.update(self.state_attributes or {})
-            attr.update(self.device_state_attributes or {})
+            state_attr = self.state_attributes
+            device_attr = self.device_state_attributes
 
         unit_of_measurement = self.unit_of_measurement
-        if unit_of_measurement is not None:
-            attr[ATTR_UNIT_OF_MEASUREMENT] = unit_of_measurement
-
-        entry = self.registry_entry
-        # pylint: disable=consider-using-ternary
-        name = (entry and entry.name) or self.name
-        if name is not None:
-            attr[ATTR_FRIENDLY_NAME] = name
-
-        icon = (entry and entry.icon) or self.icon
-        if icon is not None:
-            attr[ATTR_ICON] = icon
-
         entity_picture = self.entity_picture
-        if entity_picture is not None:
-            attr[ATTR_ENTITY_PICTURE] = entity_picture
-
         assumed_state = self.assumed_state
-        if assumed_state:
-            attr[ATTR_ASSUMED_STATE] = assumed_state
-
         supported_features = self.supported_features
-        if supported_features is not None:
-            attr[ATTR_SUPPORTED_FEATURES] = supported_features
-
-        device_class = self.device_class
-        if device_class is not None:
-            attr[ATTR_DEVICE_CLASS] = str(device_class)
 
         end = timer()
 
@@ -376,15 +403,60 @@ class Entity(ABC):
                 extra,
             )
 
-        # Overwrite properties that have been set in the config file.
         assert self.hass is not None
+        customize = None
         if DATA_CUSTOMIZE in self.hass.data:
-            attr.update(self.hass.data[DATA_CUSTOMIZE].get(self.entity_id))
+            customize = self.hass.data[DATA_CUSTOMIZE].get(self.entity_id)
+        units = self.hass.config.units
+
+        # The attributes are assembled from these, the objects are compared by
+        # identity and the values by equality
+        sources = (static_attributes, state_attr, device_attr, customize, units)
+        values = (
+            unit_of_measurement,
+            entity_picture,
+            assumed_state,
+            supported_features,
+        )
+
+        attributes: Mapping[str, Any]
+        cached = self._cached_attributes
+        if (
+            cached is not None
+            and cached[1] == values
+            and all(source is cached[0][idx] for idx, source in enumerate(sources))
+        ):
+            attributes = cached[2]
+        else:
+            capability_attr, static_attr = static_attributes
+            attr = dict(capability_attr) if capability_attr else {}
+            attr.update(state_attr or {})
+            attr.update(device_attr or {})
+
+            if unit_of_measurement is not None:
+                attr[ATTR_UNIT_OF_MEASUREMENT] = unit_of_measurement
+
+            attr.update(static_attr)
+
+            if entity_picture is not None:
+                attr[ATTR_ENTITY_PICTURE] = entity_picture
+
+            if assumed_state:
+                attr[ATTR_ASSUMED_STATE] = assumed_state
+
+            if supported_features is not None:
+                attr[ATTR_SUPPORTED_FEATURES] = supported_features
+
+            # Overwrite properties that have been set in the config file.
+            if customize is not None:
+                attr.update(customize)
+
+            attributes = attr
 
         # Convert temperature if we detect one
+        converted = False
         try:
-            unit_of_measure = attr.get(ATTR_UNIT_OF_MEASUREMENT)
-            units = self.hass.config.units
+            unit_of_measure = attributes.get(ATTR_UNIT_OF_MEASUREMENT)
             if (
                 unit_of_measure in (TEMP_CELSIUS, TEMP_FAHRENHEIT)
                 and unit_of_measure != units.temperature_unit
@@ -392,11 +464,28 @@ class Entity(ABC):
                 prec = len(state) - state.index(".") - 1 if "." in state else 0
                 temp = units.temperature(float(state), unit_of_measure)
                 state = str(round(temp) if prec == 0 else round(temp, prec))
-                attr[ATTR_UNIT_OF_MEASUREMENT] = units.temperature_unit
+                attributes = {
+                    **attributes,
+                    ATTR_UNIT_OF_MEASUREMENT: units.temperature_unit,
+                }
+                converted = True
         except ValueError:
             # Could not convert state to float
             pass
 
+        if cached is None or attributes is not cached[2]:
+            # Share the read only attributes of the current state when they
+            # are equal, so consecutive states hold one mapping
+            current = self.hass.states.get(self.entity_id)
+            if current is not None and current.attributes == attributes:
+                attributes = current.attributes
+            else:
+                # The new state keeps the read only mapping it is given
+                attributes = MappingProxyType(attributes)
+            # Converted attributes depend on the state, so they are not kept
+            if self._cache_static_attributes and not converted:
+                self._cached_attributes = (sources, values, attributes)
+
         if (
             self._context_set is not None
             and dt_util.utcnow() - self._context_set > self.context_recent_time
@@ -405,7 +494,7 @@ class Entity(ABC):
             self._context_set = None
 
         self.hass.states.async_set(
-            self.entity_id, state, attr, self.force_update, self._context
+            self.entity_id, state, attributes, self.force_update, self._context
         )
 
     def schedule_update_ha_state(self, force_refresh: bool = False) -> None:
@@ -451,12 +540,19 @@ class Entity(ABC):
         # Process update sequential
         if self.parallel_updates:
             await self.parallel_updates.acquire()
+        executor_updates: Optional[asyncio.Semaphore] = None
 
         try:
             # pylint: disable=no-member
             if hasattr(self, "async_update"):
                 task = self.hass.async_create_task(self.async_update())  # type: ignore
             elif hasattr(self, "update"):
+                # Limit the executor threads used by the updates of all platforms
+                hass = self.hass
+                assert hass is not None
+                semaphore = async_get_poll_scheduler(hass).executor_updates
+                await semaphore.acquire()
+                executor_updates = semaphore
                 task = self.hass.async_add_executor_job(self.update)  # type: ignore
             else:
                 return
@@ -481,6 +577,8 @@ class Entity(ABC):
             await task
         finally:
             self._update_staged = False
+            if executor_updates:
+                executor_updates.release()
             if self.parallel_updates:
                 self.parallel_updates.release()
 
@@ -633,6 +731,7 @@ class Entity(ABC):
         old = self.registry_entry
         self.registry_entry = ent_reg.async_get(data["entity_id"])
         assert self.registry_entry is not None
+        self.async_invalidate_static_attributes()
 
         if self.registry_entry.disabled:
             await self.async_remove()
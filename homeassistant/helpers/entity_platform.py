@@ -3,8 +3,9 @@ from __future__ import annotations
 
 import asyncio
 from contextvars import ContextVar
-from datetime import datetime, timedelta
+from datetime import timedelta
 from logging import Logger
+from timeit import default_timer as timer
 from types import ModuleType
 from typing import TYPE_CHECKING, Callable, Coroutine, Dict, Iterable, List, Optional
 
@@ -20,10 +21,13 @@ from homeassistant.core import (
 from homeassistant.exceptions import HomeAssistantError, PlatformNotReady
 from homeassistant.helpers import config_validation as cv, service
 from homeassistant.helpers.typing import HomeAssistantType
+from homeassistant.setup import PHASE_PLATFORM, async_get_setup_timeline
 from homeassistant.util.async_ import run_callback_threadsafe
+from homeassistant.util.histogram import Histogram
 
 from .entity_registry import DISABLED_INTEGRATION
-from .event import async_call_later, async_track_time_interval
+from .event import async_call_later
+from .poll_scheduler import async_get_poll_scheduler
 
 if TYPE_CHECKING:
     from .entity import Entity
@@ -64,13 +68,15 @@ class EntityPlatform:
         self.config_entry: Optional[config_entries.ConfigEntry] = None
         self.entities: Dict[str, Entity] = {}  # pylint: disable=used-before-assignment
         self._tasks: List[asyncio.Future] = []
+        # Entities waiting for their add task, by update_before_add
+        self._pending_entities: Dict[bool, List[Entity]] = {}
         # Stop tracking tasks after setup is completed
         self._setup_complete = False
-        # Method to cancel the state change listener
-        self._async_unsub_polling: Optional[CALLBACK_TYPE] = None
         # Method to cancel the retry of setup
         self._async_cancel_retry_setup: Optional[CALLBACK_TYPE] = None
-        self._process_updates: Optional[asyncio.Lock] = None
+        self.poll_scheduler = async_get_poll_scheduler(hass)
+        # Durations in seconds of the updates of the polling entities
+        self.update_durations = Histogram()
 
         self.parallel_updates: Optional[asyncio.Semaphore] = None
 
@@ -184,6 +190,7 @@ class EntityPlatform:
         full_name = f"{self.domain}.{self.platform_name}"
 
         logger.info("Setting up %s", full_name)
+        start = timer()
         warn_task = hass.loop.call_later(
             SLOW_SETUP_WARNING,
             logger.warning,
@@ -245,6 +252,9 @@ class EntityPlatform:
             return False
         finally:
             warn_task.cancel()
+            async_get_setup_timeline(hass).async_add(
+                self.platform_name, PHASE_PLATFORM, start, timer(), self.domain
+            )
 
     def _schedule_add_entities(
         self, new_entities: Iterable[Entity], update_before_add: bool = False
@@ -261,14 +271,31 @@ class EntityPlatform:
     def _async_schedule_add_entities(
         self, new_entities: Iterable[Entity], update_before_add: bool = False
     ) -> None:
-        """Schedule adding entities for a single platform async."""
+        """Schedule adding entities for a single platform async.
+
+        Entities scheduled before the add task runs are added by the same
+        task, so a burst of discovered entities is added as one batch.
+        """
+        pending = self._pending_entities.get(update_before_add)
+        if pending is not None:
+            pending.extend(new_entities)
+            return
+
+        self._pending_entities[update_before_add] = list(new_entities)
         task = self.hass.async_create_task(
-            self.async_add_entities(new_entities, update_before_add=update_before_add),
+            self._async_add_pending_entities(update_before_add)
         )
 
         if not self._setup_complete:
             self._tasks.append(task)
 
+    async def _async_add_pending_entities(self, update_before_add: bool) -> None:
+        """Add the entities scheduled for adding."""
+        await self.async_add_entities(
+            self._pending_entities.pop(update_before_add),
+            update_before_add=update_before_add,
+        )
+
     def add_entities(
         self, new_entities: Iterable[Entity], update_before_add: bool = False
     ) -> None:
@@ -330,17 +357,6 @@ class EntityPlatform:
             )
             raise
 
-        if self._async_unsub_polling is not None or not any(
-            entity.should_poll for entity in self.entities.values()
-        ):
-            return
-
-        self._async_unsub_polling = async_track_time_interval(
-            self.hass,
-            self._update_entity_states,
-            self.scan_interval,
-        )
-
     async def _async_add_entity(  # type: ignore[no-untyped-def]
         self, entity, update_before_add, entity_registry, device_registry
     ):
@@ -504,6 +520,9 @@ class EntityPlatform:
             self.hass.states.async_reserve(entity.entity_id)
 
         entity.async_on_remove(lambda: self.entities.pop(entity_id))
+        # Entities can start polling after they are added, so the scheduler
+        # checks should_poll when their poll is due
+        entity.async_on_remove(self.poll_scheduler.async_add_entity(self, entity))
 
         await entity.add_to_platform_finish()
 
@@ -523,9 +542,6 @@ class EntityPlatform:
 
         await asyncio.gather(*tasks)
 
-        if self._async_unsub_polling is not None:
-            self._async_unsub_polling()
-            self._async_unsub_polling = None
         self._setup_complete = False
 
     async def async_destroy(self) -> None:
@@ -540,13 +556,6 @@ class EntityPlatform:
         """Remove entity id from platform."""
         await self.entities[entity_id].async_remove()
 
-        # Clean up polling job if no longer needed
-        if self._async_unsub_polling is not None and not any(
-            entity.should_poll for entity in self.entities.values()
-        ):
-            self._async_unsub_polling()
-            self._async_unsub_polling = None
-
     async def async_extract_from_service(
         self, service_call: ServiceCall, expand_group: bool = True
     ) -> List[Entity]:
@@ -590,35 +599,6 @@ class EntityPlatform:
             self.platform_name, name, handle_service, schema
         )
 
-    async def _update_entity_states(self, now: datetime) -> None:
-        """Update the states of all the polling entities.
-
-        To protect from flooding the executor, we will update async entities
-        in parallel and other entities sequential.
-
-        This method must be run in the event loop.
-        """
-        if self._process_updates is None:
-            self._process_updates = asyncio.Lock()
-        if self._process_updates.locked():
-            self.logger.warning(
-                "Updating %s %s took longer than the scheduled update interval %s",
-                self.platform_name,
-                self.domain,
-                self.scan_interval,
-            )
-            return
-
-        async with self._process_updates:
-            tasks = []
-            for entity in self.entities.values():
-                if not entity.should_poll:
-                    continue
-                tasks.append(entity.async_update_ha_state(True))
-
-            if tasks:
-                await asyncio.gather(*tasks)
-
 
 current_platform: ContextVar[Optional[EntityPlatform]] = ContextVar(
     "current_platform", default=None
@@ -1,7 +1,7 @@
 """Helper class to implement include/exclude of entities and domains."""
 import fnmatch
 import re
-from typing import Callable, Dict, List, Pattern
+from typing import Any, Callable, Dict, List, Optional, Pattern, Tuple
 
 import voluptuous as vol
 
@@ -19,19 +19,52 @@ CONF_EXCLUDE_ENTITIES = "exclude_entities"
 CONF_ENTITY_GLOBS = "entity_globs"
 
 
-def convert_filter(config: Dict[str, List[str]]) -> Callable[[str], bool]:
+class EntityFilter:
+    """Filter of entity IDs built from a filter configuration."""
+
+    def __init__(self, config: Dict[str, List[str]]) -> None:
+        """Initialize the filter."""
+        self.config: Dict[str, Any] = config
+        self.empty_filter = sum(len(val) for val in config.values()) == 0
+        self.entity_ids_and_domains = _entity_ids_and_domains(config)
+        self._filter = generate_filter(
+            config[CONF_INCLUDE_DOMAINS],
+            config[CONF_INCLUDE_ENTITIES],
+            config[CONF_EXCLUDE_DOMAINS],
+            config[CONF_EXCLUDE_ENTITIES],
+            config[CONF_INCLUDE_ENTITY_GLOBS],
+            config[CONF_EXCLUDE_ENTITY_GLOBS],
+        )
+
+    def __call__(self, entity_id: str) -> bool:
+        """Return if the entity passes the filter."""
+        return self._filter(entity_id)
+
+
+def convert_filter(config: Dict[str, List[str]]) -> EntityFilter:
     """Convert the filter schema into a filter."""
-    filt = generate_filter(
-        config[CONF_INCLUDE_DOMAINS],
-        config[CONF_INCLUDE_ENTITIES],
-        config[CONF_EXCLUDE_DOMAINS],
-        config[CONF_EXCLUDE_ENTITIES],
-        config[CONF_INCLUDE_ENTITY_GLOBS],
-        config[CONF_EXCLUDE_ENTITY_GLOBS],
-    )
-    setattr(filt, "config", config)
-    setattr(filt, "empty_filter", sum(len(val) for val in config.values()) == 0)
-    return filt
+    return EntityFilter(config)
+
+
+def _entity_ids_and_domains(
+    config: Dict[str, List[str]]
+) -> Optional[Tuple[List[str], List[str]]]:
+    """Return the only entity IDs and domains the filter can pass.
+
+    Returns None if the filter can pass other entities, for example
+    because it has include globs or only excludes. The result can be
+    passed to EventBus.async_listen_entities.
+    """
+    include_d = config[CONF_INCLUDE_DOMAINS]
+    include_e = config[CONF_INCLUDE_ENTITIES]
+    if config[CONF_INCLUDE_ENTITY_GLOBS] or not (include_d or include_e):
+        return None
+    # Case 4b of generate_filter passes all entities not excluded
+    if not include_d and (
+        config[CONF_EXCLUDE_DOMAINS] or config[CONF_EXCLUDE_ENTITY_GLOBS]
+    ):
+        return None
+    return list(include_e), list(include_d)
 
 
 BASE_FILTER_SCHEMA = vol.Schema(
@@ -58,7 +91,7 @@ FILTER_SCHEMA = vol.All(BASE_FILTER_SCHEMA, convert_filter)
 
 def convert_include_exclude_filter(
     config: Dict[str, Dict[str, List[str]]]
-) -> Callable[[str], bool]:
+) -> EntityFilter:
     """Convert the include exclude filter schema into a filter."""
     include = config[CONF_INCLUDE]
     exclude = config[CONF_EXCLUDE]
@@ -72,7 +105,7 @@ def convert_include_exclude_filter(
             CONF_EXCLUDE_ENTITIES: exclude[CONF_ENTITIES],
         }
     )
-    setattr(filt, "config", config)
+    filt.config = config
     return filt
 
 
@@ -62,6 +62,8 @@ TRACK_STATE_REMOVED_DOMAIN_LISTENER = "track_state_removed_domain_listener"
 TRACK_ENTITY_REGISTRY_UPDATED_CALLBACKS = "track_entity_registry_updated_callbacks"
 TRACK_ENTITY_REGISTRY_UPDATED_LISTENER = "track_entity_registry_updated_listener"
 
+TEMPLATE_RENDER_SCHEDULER = "template_render_scheduler"
+
 _ALL_LISTENER = "all"
 _DOMAINS_LISTENER = "domains"
 _ENTITIES_LISTENER = "entities"
@@ -730,6 +732,107 @@ def async_track_template(
 track_template = threaded_listener_factory(async_track_template)
 
 
+class _TemplateRenderScheduler:
+    """Coalesce the re-renders of tracked templates.
+
+    State changes only mark the templates of the trackers that coalesce
+    their renders as dirty. The dirty templates are rendered once in a task
+    that runs after all the state changes of the current loop iteration have
+    been processed.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the scheduler."""
+        self.hass = hass
+        self._pending: Dict["_TrackTemplateResultInfo", float] = {}
+        self._flush_scheduled = False
+        self.flushes = 0
+        self.renders = 0
+        self.coalesced = 0
+        self.max_queue_depth = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    @callback
+    def async_schedule(self, tracker: "_TrackTemplateResultInfo") -> None:
+        """Schedule rendering the dirty templates of a tracker."""
+        if tracker in self._pending:
+            self.coalesced += 1
+            return
+
+        self._pending[tracker] = time.monotonic()
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            self.hass.async_create_task(self._async_flush())
+
+    @callback
+    def async_cancel(self, tracker: "_TrackTemplateResultInfo") -> None:
+        """Forget about a tracker that has been removed."""
+        self._pending.pop(tracker, None)
+
+    async def _async_flush(self) -> None:
+        """Render the dirty templates of all pending trackers."""
+        self._flush_scheduled = False
+        pending = self._pending
+        self._pending = {}
+        self.flushes += 1
+        self.max_queue_depth = max(self.max_queue_depth, len(pending))
+
+        # pylint: disable=protected-access
+        for tracker, queued in pending.items():
+            try:
+                tracker._async_render_dirty()
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception(
+                    "Error while rendering templates %s", tracker._track_templates
+                )
+            latency = time.monotonic() - queued
+            self.renders += 1
+            self.total_latency += latency
+            self.max_latency = max(self.max_latency, latency)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the queue depth and render latency statistics."""
+        return {
+            "queue_depth": len(self._pending),
+            "max_queue_depth": self.max_queue_depth,
+            "flushes": self.flushes,
+            "renders": self.renders,
+            "coalesced": self.coalesced,
+            "average_latency": self.total_latency / self.renders
+            if self.renders
+            else 0.0,
+            "max_latency": self.max_latency,
+            "total_latency": self.total_latency,
+        }
+
+
+@callback
+def _async_get_template_render_scheduler(
+    hass: HomeAssistant,
+) -> _TemplateRenderScheduler:
+    """Return the template render scheduler."""
+    scheduler: Optional[_TemplateRenderScheduler] = hass.data.get(
+        TEMPLATE_RENDER_SCHEDULER
+    )
+    if scheduler is None:
+        scheduler = hass.data[TEMPLATE_RENDER_SCHEDULER] = _TemplateRenderScheduler(
+            hass
+        )
+    return scheduler
+
+
+@callback
+@bind_hass
+def async_template_render_stats(hass: HomeAssistant) -> Dict[str, Any]:
+    """Return the statistics of the coalesced template re-renders.
+
+    Latencies are in seconds from the first state change that made a
+    template dirty until it was rendered.
+    """
+    return _async_get_template_render_scheduler(hass).stats()
+
+
 class _TrackTemplateResultInfo:
     """Handle removal / refresh of tracker."""
 
@@ -738,6 +841,7 @@ class _TrackTemplateResultInfo:
         hass: HomeAssistant,
         track_templates: Iterable[TrackTemplate],
         action: Callable,
+        coalesce: bool = False,
     ):
         """Handle removal / refresh of tracker init."""
         self.hass = hass
@@ -754,6 +858,13 @@ class _TrackTemplateResultInfo:
         self._track_state_changes: Optional[_TrackStateChangeFiltered] = None
         self._time_listeners: Dict[Template, Callable] = {}
 
+        self._scheduler: Optional[_TemplateRenderScheduler] = (
+            _async_get_template_render_scheduler(hass) if coalesce else None
+        )
+        # Ids of the TrackTemplates waiting for the scheduler to render them
+        self._dirty: Set[int] = set()
+        self._dirty_event: Optional[Event] = None
+
     def async_setup(self, raise_on_template_error: bool) -> None:
         """Activation of template tracking."""
         for track_template_ in self._track_templates:
@@ -827,20 +938,46 @@ class _TrackTemplateResultInfo:
         self._rate_limit.async_remove()
         for template in list(self._time_listeners):
             self._time_listeners.pop(template)()
+        if self._scheduler is not None:
+            self._scheduler.async_cancel(self)
+        self._dirty = set()
+        self._dirty_event = None
 
     @callback
     def async_refresh(self) -> None:
         """Force recalculate the template."""
         self._refresh(None)
 
+    @callback
+    def _async_render_dirty(self) -> None:
+        """Render the templates that were marked dirty by state changes."""
+        dirty = self._dirty
+        event = self._dirty_event
+        self._dirty = set()
+        self._dirty_event = None
+        if dirty:
+            self._refresh(
+                event,
+                [
+                    track_template_
+                    for track_template_ in self._track_templates
+                    if id(track_template_) in dirty
+                ],
+                coalesced=True,
+            )
+
     def _render_template_if_ready(
         self,
         track_template_: TrackTemplate,
         now: datetime,
         event: Optional[Event],
+        defer: bool = False,
     ) -> Union[bool, TrackTemplateResult]:
         """Re-render the template if conditions match.
 
+        If defer is True the template is marked dirty instead of being
+        rendered, the scheduler renders it later.
+
         Returns False if the template was not be re-rendered
 
         Returns True if the template re-rendered and did not
@@ -876,6 +1013,11 @@ class _TrackTemplateResultInfo:
                 event,
             )
 
+            if defer:
+                self._dirty.add(id(track_template_))
+                self._dirty_event = event
+                return False
+
         self._rate_limit.async_triggered(template, now)
         self._info[template] = info = template.async_render_to_info(
             track_template_.variables
@@ -903,6 +1045,7 @@ class _TrackTemplateResultInfo:
         event: Optional[Event],
         track_templates: Optional[Iterable[TrackTemplate]] = None,
         replayed: Optional[bool] = False,
+        coalesced: bool = False,
     ) -> None:
         """Refresh the template.
 
@@ -915,13 +1058,31 @@ class _TrackTemplateResultInfo:
 
         replayed is True if the event is being replayed because the
         rate limit was hit.
+
+        coalesced is True if the templates were marked dirty by state
+        changes and are now rendered by the scheduler. Other state
+        changes only mark the templates dirty if the tracker coalesces
+        its renders.
         """
         updates = []
         info_changed = False
-        now = event.time_fired if not replayed and event else dt_util.utcnow()
+        now = (
+            event.time_fired
+            if not replayed and not coalesced and event
+            else dt_util.utcnow()
+        )
+        defer = (
+            self._scheduler is not None
+            and event is not None
+            and not replayed
+            and not coalesced
+        )
+        render_event = None if coalesced else event
 
         for track_template_ in track_templates or self._track_templates:
-            update = self._render_template_if_ready(track_template_, now, event)
+            update = self._render_template_if_ready(
+                track_template_, now, render_event, defer
+            )
             if not update:
                 continue
 
@@ -951,6 +1112,10 @@ class _TrackTemplateResultInfo:
                 self.listeners,
             )
 
+        if defer and self._dirty:
+            assert self._scheduler is not None
+            self._scheduler.async_schedule(self)
+
         if not updates:
             return
 
@@ -986,6 +1151,7 @@ def async_track_template_result(
     track_templates: Iterable[TrackTemplate],
     action: TrackTemplateResultListener,
     raise_on_template_error: bool = False,
+    coalesce: bool = False,
 ) -> _TrackTemplateResultInfo:
     """Add a listener that fires when the result of a template changes.
 
@@ -1014,13 +1180,19 @@ def async_track_template_result(
         processing the template during setup, the system
         will raise the exception instead of setting up
         tracking.
+    coalesce
+        When set to True, state changes only mark the templates
+        dirty and the templates are rendered once after all the
+        state changes of the current loop iteration. The action
+        will not see a state that changed and changed back within
+        the same iteration.
 
     Returns
     -------
     Info object used to unregister the listener, and refresh the template.
 
     """
-    tracker = _TrackTemplateResultInfo(hass, track_templates, action)
+    tracker = _TrackTemplateResultInfo(hass, track_templates, action, coalesce)
     tracker.async_setup(raise_on_template_error)
     return tracker
 
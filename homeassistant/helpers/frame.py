@@ -3,6 +3,7 @@ import asyncio
 import functools
 import logging
 from traceback import FrameSummary, extract_stack
+from types import FrameType
 from typing import Any, Callable, Optional, Tuple, TypeVar, cast
 
 from homeassistant.exceptions import HomeAssistantError
@@ -14,13 +15,18 @@ CALLABLE_T = TypeVar("CALLABLE_T", bound=Callable)  # pylint: disable=invalid-na
 
 def get_integration_frame(
     exclude_integrations: Optional[set] = None,
+    stack_frame: Optional[FrameType] = None,
 ) -> Tuple[FrameSummary, str, str]:
-    """Return the frame, integration and integration path of the current stack frame."""
+    """Return the frame, integration and integration path of the current stack frame.
+
+    Pass stack_frame to inspect the stack ending at that frame instead, for
+    example the current frame of another thread.
+    """
     found_frame = None
     if not exclude_integrations:
         exclude_integrations = set()
 
-    for frame in reversed(extract_stack()):
+    for frame in reversed(extract_stack(stack_frame)):
         for path in ("custom_components/", "homeassistant/components/"):
             try:
                 index = frame.filename.index(path)
@@ -1,7 +1,15 @@
 """Helpers to help with encoding Home Assistant objects in JSON."""
 from datetime import datetime
+from functools import partial
 import json
-from typing import Any
+from typing import Any, Callable
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    HAS_ORJSON = False
+else:
+    HAS_ORJSON = True
 
 
 class JSONEncoder(json.JSONEncoder):
@@ -20,3 +28,52 @@ class JSONEncoder(json.JSONEncoder):
             return o.as_dict()
 
         return json.JSONEncoder.default(self, o)
+
+
+def json_encoder_default(obj: Any) -> Any:
+    """Convert Home Assistant objects for orjson.
+
+    Datetimes are serialized by orjson itself. Tuple subclasses like
+    namedtuples become lists, as they do with the standard library.
+    """
+    if isinstance(obj, (set, tuple)):
+        return list(obj)
+    if hasattr(obj, "as_dict"):
+        return obj.as_dict()
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def json_dumps(data: Any, nan_as_null: bool = False) -> str:
+    """Serialize data to JSON.
+
+    NaN and infinite floats are rejected with a ValueError, like the standard
+    library does. orjson serializes them as null and cannot reject them, so
+    it is only used when the caller opts in with nan_as_null. The standard
+    library is used when orjson is not installed, in which case they are
+    still rejected, or when orjson cannot serialize the data, like integers
+    wider than 64 bits.
+    """
+    if nan_as_null and HAS_ORJSON:
+        try:
+            serialized: bytes = orjson.dumps(
+                data, option=orjson.OPT_NON_STR_KEYS, default=json_encoder_default
+            )
+        except TypeError:
+            # orjson.JSONEncodeError is a TypeError
+            pass
+        else:
+            return serialized.decode("utf-8")
+    return stdlib_json_dumps(data)
+
+
+# Files keep the 4 space indentation they always had
+json_dumps_pretty: Callable[[Any], str] = partial(
+    json.dumps, cls=JSONEncoder, indent=4
+)
+
+# Serializer using the standard library, also the fallback of json_dumps
+stdlib_json_dumps: Callable[[Any], str] = partial(
+    json.dumps, cls=JSONEncoder, allow_nan=False
+)
@@ -0,0 +1,262 @@
+"""Monitor the lag of the event loop and attribute stalls to integrations."""
+from collections import deque
+import logging
+import sys
+import threading
+import time
+from types import FrameType
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.frame import MissingIntegrationFrame, get_integration_frame
+from homeassistant.loader import bind_hass
+import homeassistant.util.dt as dt_util
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_LOOP_MONITOR = "loop_monitor"
+
+# Seconds between two heartbeats scheduled on the event loop
+HEARTBEAT_INTERVAL = 0.5
+# Seconds a heartbeat can be late before the loop is considered stalled
+STALL_THRESHOLD = 0.25
+# Shortest number of seconds between two checks of the watchdog thread
+WATCHDOG_INTERVAL = 0.05
+# Number of stalls kept in the ring buffer
+RECENT_STALLS = 50
+# Number of integrations reported as top offenders
+TOP_OFFENDERS = 10
+
+# Source of the stalls that could not be attributed to an integration
+SOURCE_CORE = "core"
+
+
+class IntegrationStalls:
+    """Stalls of the event loop caused by an integration."""
+
+    __slots__ = ("integration", "count", "total", "max")
+
+    def __init__(self, integration: str) -> None:
+        """Initialize the stalls."""
+        self.integration = integration
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return a dictionary representation of the stalls."""
+        return {
+            "integration": self.integration,
+            "count": self.count,
+            "total": round(self.total, 3),
+            "max": round(self.max, 3),
+        }
+
+
+class LoopMonitor:
+    """Measure the lag of the event loop and attribute its stalls.
+
+    A heartbeat is scheduled on the event loop and the lag is how late it
+    runs. A watchdog thread wakes up when a heartbeat is due to be late and
+    samples the stack of the event loop thread. The stall is attributed to
+    the innermost integration on that stack, without adding any cost to the
+    jobs themselves. The stack only holds the frames of the callback or
+    coroutine that is running, so work that core helpers do on behalf of an
+    integration is attributed to core.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        threshold: float = STALL_THRESHOLD,
+        heartbeat_interval: float = HEARTBEAT_INTERVAL,
+    ) -> None:
+        """Initialize the monitor."""
+        self.hass = hass
+        self.threshold = threshold
+        self.heartbeat_interval = heartbeat_interval
+        self.lag = 0.0
+        self.max_lag = 0.0
+        self.stall_count = 0
+        self.recent_stalls: Deque[Dict[str, Any]] = deque(maxlen=RECENT_STALLS)
+        self.offenders: Dict[str, IntegrationStalls] = {}
+        self._window_max_lag = 0.0
+        self._beat = 0
+        self._expected: Optional[float] = None
+        # Integration and location sampled by the watchdog for a heartbeat
+        self._sample: Optional[Tuple[int, str, str]] = None
+        self._loop_thread_id: Optional[int] = None
+        self._handle: Optional[Any] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @callback
+    def async_start(self) -> None:
+        """Start monitoring the event loop."""
+        self._loop_thread_id = threading.get_ident()
+        self._stop.clear()
+        self._async_schedule_heartbeat()
+        self._thread = threading.Thread(
+            target=self._watchdog, name="LoopMonitor", daemon=True
+        )
+        self._thread.start()
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop monitoring the event loop."""
+        self._stop.set()
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        self._expected = None
+
+    async def async_shutdown(self) -> None:
+        """Stop monitoring and wait for the watchdog thread to exit."""
+        self.async_stop()
+        if self._thread is not None:
+            await self.hass.async_add_executor_job(self._thread.join)
+            self._thread = None
+
+    @callback
+    def async_pop_max_lag(self) -> float:
+        """Return the largest lag since the previous call."""
+        max_lag, self._window_max_lag = self._window_max_lag, 0.0
+        return max_lag
+
+    @callback
+    def async_top_offenders(self) -> List[IntegrationStalls]:
+        """Return the integrations that stalled the event loop the longest."""
+        return sorted(
+            self.offenders.values(), key=lambda stalls: stalls.total, reverse=True
+        )[:TOP_OFFENDERS]
+
+    @callback
+    def async_as_dict(self) -> Dict[str, Any]:
+        """Return a dictionary representation of the health of the loop."""
+        return {
+            "lag": round(self.lag, 3),
+            "max_lag": round(self.max_lag, 3),
+            "stall_threshold": self.threshold,
+            "stall_count": self.stall_count,
+            "top_offenders": [
+                stalls.as_dict() for stalls in self.async_top_offenders()
+            ],
+            "recent_stalls": list(self.recent_stalls),
+        }
+
+    @callback
+    def _async_schedule_heartbeat(self) -> None:
+        """Schedule the next heartbeat."""
+        self._expected = time.monotonic() + self.heartbeat_interval
+        self._handle = self.hass.loop.call_later(
+            self.heartbeat_interval, self._async_heartbeat
+        )
+
+    @callback
+    def _async_heartbeat(self) -> None:
+        """Measure how late the heartbeat runs."""
+        assert self._expected is not None
+        lag = max(time.monotonic() - self._expected, 0.0)
+        sample, self._sample = self._sample, None
+        self.lag = lag
+        if lag > self.max_lag:
+            self.max_lag = lag
+        if lag > self._window_max_lag:
+            self._window_max_lag = lag
+
+        if lag >= self.threshold:
+            if sample is None or sample[0] != self._beat:
+                sample = (self._beat, SOURCE_CORE, "")
+            self._async_record_stall(lag, sample[1], sample[2])
+
+        self._beat += 1
+        self._async_schedule_heartbeat()
+
+    @callback
+    def _async_record_stall(self, lag: float, integration: str, location: str) -> None:
+        """Record a stall of the event loop."""
+        self.stall_count += 1
+        stalls = self.offenders.get(integration)
+        if stalls is None:
+            stalls = self.offenders[integration] = IntegrationStalls(integration)
+        stalls.count += 1
+        stalls.total += lag
+        if lag > stalls.max:
+            stalls.max = lag
+
+        self.recent_stalls.append(
+            {
+                "time": dt_util.utcnow().isoformat(),
+                "duration": round(lag, 3),
+                "integration": integration,
+                "location": location,
+            }
+        )
+        _LOGGER.debug(
+            "Event loop stalled for %.3f seconds by %s at %s",
+            lag,
+            integration,
+            location,
+        )
+
+    def _watchdog(self) -> None:
+        """Sample the event loop stack when a heartbeat is late."""
+        while not self._stop.wait(self._watchdog_check()):
+            pass
+
+    def _watchdog_check(self) -> float:
+        """Sample the stack if the heartbeat is late.
+
+        Returns the number of seconds until the next check.
+        """
+        # Read the beat first so a heartbeat running meanwhile makes the
+        # sample stale rather than attributed to the next heartbeat
+        beat = self._beat
+        expected = self._expected
+        if expected is None:
+            return self.heartbeat_interval
+        late = time.monotonic() - expected
+        if late < self.threshold:
+            return max(self.threshold - late, WATCHDOG_INTERVAL)
+        sample = self._sample
+        if sample is not None and sample[0] == beat:
+            return WATCHDOG_INTERVAL
+
+        frame = sys._current_frames().get(  # pylint: disable=protected-access
+            self._loop_thread_id  # type: ignore[arg-type]
+        )
+        if frame is not None:
+            integration, location = _attribute_frame(frame)
+            self._sample = (beat, integration, location)
+        return WATCHDOG_INTERVAL
+
+
+def _attribute_frame(frame: FrameType) -> Tuple[str, str]:
+    """Return the integration and the location of the code running a frame."""
+    try:
+        found_frame, integration, path = get_integration_frame(stack_frame=frame)
+    except MissingIntegrationFrame:
+        return SOURCE_CORE, f"{frame.f_code.co_filename}:{frame.f_lineno}"
+
+    index = found_frame.filename.index(path)
+    return integration, f"{found_frame.filename[index:]}:{found_frame.lineno}"
+
+
+@callback
+@bind_hass
+def async_get_loop_monitor(hass: HomeAssistant) -> LoopMonitor:
+    """Return the monitor of the event loop, starting it on first use.
+
+    The monitor runs until Home Assistant stops.
+    """
+    monitor: Optional[LoopMonitor] = hass.data.get(DATA_LOOP_MONITOR)
+    if monitor is None:
+        monitor = hass.data[DATA_LOOP_MONITOR] = LoopMonitor(hass)
+        monitor.async_start()
+
+        async def _async_stop_monitor(_: Event) -> None:
+            await monitor.async_shutdown()  # type: ignore[union-attr]
+
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_stop_monitor)
+    return monitor
@@ -0,0 +1,241 @@
+"""Schedule the polls of the entities of all entity platforms."""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta
+from functools import partial
+import random
+from timeit import default_timer as timer
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from homeassistant.core import CALLBACK_TYPE, HassJob, State, callback
+from homeassistant.helpers.typing import HomeAssistantType
+from homeassistant.loader import bind_hass
+import homeassistant.util.dt as dt_util
+
+from .event import async_track_point_in_utc_time
+
+if TYPE_CHECKING:
+    from .entity import Entity
+    from .entity_platform import EntityPlatform
+
+DATA_POLL_SCHEDULER = "poll_scheduler"
+
+# Fraction of the scan interval over which the first polls are spread
+POLL_SPREAD = 0.5
+# Consecutive polls without a state change before the interval is doubled
+UNCHANGED_POLLS_BEFORE_BACKOFF = 10
+# Consecutive failed polls before the interval is doubled
+FAILED_POLLS_BEFORE_BACKOFF = 3
+# Largest multiple of the scan interval between two polls of an entity
+MAX_POLL_BACKOFF = 4
+# Backing off never makes the interval longer than this or the scan interval
+MAX_BACKOFF_INTERVAL = timedelta(minutes=5)
+# Executor bound updates running at the same time, half of the executor
+MAX_EXECUTOR_UPDATES = 32
+
+
+class EntityPoll:
+    """Polling state of an entity."""
+
+    __slots__ = (
+        "entity",
+        "job",
+        "due",
+        "backoff",
+        "unchanged",
+        "failures",
+        "last_state",
+        "polling",
+        "cancel",
+    )
+
+    def __init__(self, entity: Entity, due: datetime) -> None:
+        """Initialize the polling state."""
+        self.entity = entity
+        self.job: Optional[HassJob] = None
+        self.due = due
+        self.backoff = 1
+        self.unchanged = 0
+        self.failures = 0
+        self.last_state: Optional[State] = None
+        self.polling = False
+        self.cancel: Optional[CALLBACK_TYPE] = None
+
+
+class PlatformPolls:
+    """Polls of the entities of an entity platform."""
+
+    __slots__ = ("platform", "entities", "polls", "failures", "overruns")
+
+    def __init__(self, platform: EntityPlatform) -> None:
+        """Initialize the polls."""
+        self.platform = platform
+        self.entities: Dict[str, EntityPoll] = {}
+        self.polls = 0
+        self.failures = 0
+        self.overruns = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return a dictionary representation of the polls."""
+        return {
+            "domain": self.platform.domain,
+            "platform": self.platform.platform_name,
+            "scan_interval": self.platform.scan_interval.total_seconds(),
+            "entities": sum(
+                1 for poll in self.entities.values() if poll.entity.should_poll
+            ),
+            "backed_off": sum(1 for poll in self.entities.values() if poll.backoff > 1),
+            "polls": self.polls,
+            "failures": self.failures,
+            "overruns": self.overruns,
+        }
+
+
+class PollScheduler:
+    """Poll the entities of all platforms.
+
+    Every entity is polled on a timer of its own. The timers of entities that
+    do not poll keep running and skip the update, as an entity can start
+    polling after it is added. The first poll of an
+    entity is spread over the end of the scan interval, so the entities of a
+    platform and the platforms set up together do not poll at the same
+    moment. Entities whose state does not change or whose update keeps
+    failing are polled less often, up to MAX_POLL_BACKOFF times the scan
+    interval, until their state changes again.
+    """
+
+    def __init__(self, hass: HomeAssistantType) -> None:
+        """Initialize the scheduler."""
+        self.hass = hass
+        # Shared by the executor bound updates of the entities of all platforms
+        self.executor_updates = asyncio.Semaphore(MAX_EXECUTOR_UPDATES)
+        self._platforms: Dict[EntityPlatform, PlatformPolls] = {}
+
+    @callback
+    def async_add_entity(
+        self, platform: EntityPlatform, entity: Entity
+    ) -> CALLBACK_TYPE:
+        """Start polling an entity and return a method to stop polling it."""
+        if platform not in self._platforms:
+            self._platforms[platform] = PlatformPolls(platform)
+        platform_polls = self._platforms[platform]
+
+        entity_id = entity.entity_id
+        assert entity_id is not None
+        offset = platform.scan_interval * POLL_SPREAD * random.random()
+        poll = EntityPoll(entity, dt_util.utcnow() + platform.scan_interval - offset)
+        poll.job = HassJob(partial(self._async_poll_due, platform_polls, poll))
+        platform_polls.entities[entity_id] = poll
+        self._async_schedule(poll)
+
+        @callback
+        def async_remove_entity() -> None:
+            """Stop polling the entity."""
+            cancel = poll.cancel
+            if cancel is not None:
+                poll.cancel = None
+                cancel()
+            if platform_polls.entities.get(entity_id) is poll:
+                del platform_polls.entities[entity_id]
+            if not platform_polls.entities:
+                self._platforms.pop(platform, None)
+
+        return async_remove_entity
+
+    @callback
+    def async_get_stats(self) -> List[Dict[str, Any]]:
+        """Return the polls of the entities per platform."""
+        return [platform_polls.as_dict() for platform_polls in self._platforms.values()]
+
+    @callback
+    def _async_schedule(self, poll: EntityPoll) -> None:
+        """Schedule the next poll of an entity."""
+        assert poll.job is not None
+        poll.cancel = async_track_point_in_utc_time(self.hass, poll.job, poll.due)
+
+    @callback
+    def _async_poll_due(
+        self, platform_polls: PlatformPolls, poll: EntityPoll, now: datetime
+    ) -> None:
+        """Start the poll of an entity and schedule the next one."""
+        platform = platform_polls.platform
+        interval = platform.scan_interval
+        if poll.backoff > 1:
+            interval = max(min(interval * poll.backoff, MAX_BACKOFF_INTERVAL), interval)
+        poll.due += interval
+        # Do not catch up on the polls missed while the loop was blocked
+        if poll.due <= now:
+            poll.due = now + interval
+        self._async_schedule(poll)
+
+        entity = poll.entity
+        if not entity.should_poll:
+            return
+
+        if poll.polling:
+            platform_polls.overruns += 1
+            platform.logger.warning(
+                "Updating %s took longer than the scheduled update interval %s",
+                entity.entity_id,
+                interval,
+            )
+            return
+
+        poll.polling = True
+        self.hass.async_create_task(self._async_poll(platform_polls, poll))
+
+    async def _async_poll(
+        self, platform_polls: PlatformPolls, poll: EntityPoll
+    ) -> None:
+        """Update an entity and adapt its interval to the result."""
+        platform = platform_polls.platform
+        entity = poll.entity
+        entity_id = entity.entity_id
+        start = timer()
+        try:
+            await entity.async_device_update()
+        except Exception:  # pylint: disable=broad-except
+            platform.logger.exception("Update for %s fails", entity_id)
+            failed = True
+        else:
+            # The entity could have been removed while it was updating
+            if platform_polls.entities.get(entity_id) is not poll:
+                return
+            entity.async_write_ha_state()
+            failed = not entity.available
+        finally:
+            poll.polling = False
+            platform.update_durations.observe(timer() - start)
+
+        platform_polls.polls += 1
+        state = self.hass.states.get(entity_id)
+        changed = state is not poll.last_state
+        poll.last_state = state
+
+        if failed:
+            platform_polls.failures += 1
+            poll.failures += 1
+            poll.unchanged = 0
+            if poll.failures >= FAILED_POLLS_BEFORE_BACKOFF:
+                poll.failures = 0
+                poll.backoff = min(poll.backoff * 2, MAX_POLL_BACKOFF)
+        elif changed or entity.force_update:
+            poll.failures = poll.unchanged = 0
+            poll.backoff = 1
+        else:
+            poll.failures = 0
+            poll.unchanged += 1
+            if poll.unchanged >= UNCHANGED_POLLS_BEFORE_BACKOFF:
+                poll.unchanged = 0
+                poll.backoff = min(poll.backoff * 2, MAX_POLL_BACKOFF)
+
+
+@callback
+@bind_hass
+def async_get_poll_scheduler(hass: HomeAssistantType) -> PollScheduler:
+    """Return the scheduler of the polls of the entities."""
+    scheduler: Optional[PollScheduler] = hass.data.get(DATA_POLL_SCHEDULER)
+    if scheduler is None:
+        scheduler = hass.data[DATA_POLL_SCHEDULER] = PollScheduler(hass)
+    return scheduler
@@ -4,7 +4,7 @@ from __future__ import annotations
 import asyncio
 from datetime import datetime, timedelta
 import logging
-from typing import Any, Dict, List, Optional, Set, cast
+from typing import Any, Dict, List, Optional, Set, Tuple, cast
 
 from homeassistant.const import EVENT_HOMEASSISTANT_START, EVENT_HOMEASSISTANT_STOP
 from homeassistant.core import (
@@ -28,6 +28,7 @@ DATA_RESTORE_STATE_TASK = "restore_state_task"
 _LOGGER = logging.getLogger(__name__)
 
 STORAGE_KEY = "core.restore_state"
+DELTA_STORAGE_KEY = "core.restore_state_delta"
 STORAGE_VERSION = 1
 
 # How long between periodically saving the current states to disk
@@ -36,6 +37,15 @@ STATE_DUMP_INTERVAL = timedelta(minutes=15)
 # How long should a saved state be preserved if the entity no longer exists
 STATE_EXPIRATION = timedelta(days=7)
 
+# How long between saving all the states, in between only the states that
+# changed are saved to the delta store. This keeps the last seen time of the
+# current entities well within STATE_EXPIRATION
+STATE_DUMP_REFRESH_INTERVAL = timedelta(days=1)
+
+# Largest share of the states the delta store holds before all the states are
+# saved again. This keeps the delta small compared to the main store
+STATE_DUMP_DELTA_RATIO = 0.25
+
 
 class StoredState:
     """Object to represent a stored state."""
@@ -60,6 +70,56 @@ class StoredState:
         return cls(State.from_dict(json_dict["state"]), last_seen)
 
 
+class _LazyStoredState(StoredState):
+    """Stored state from the previous run that is decoded on first use.
+
+    Most of the stored states are never restored, or only after the
+    integration providing them has been set up. Until then the stored
+    dict is kept as is and written back unchanged.
+    """
+
+    def __init__(  # pylint: disable=super-init-not-called
+        self, json_dict: Dict
+    ) -> None:
+        """Initialize a stored state from a dict."""
+        self._json_dict = json_dict
+        self._state: Optional[State] = None
+        self._last_seen: Optional[datetime] = None
+
+    @property
+    def state(self) -> State:
+        """Return the stored state."""
+        if self._state is None:
+            self._state = State.from_dict(self._json_dict["state"])
+        return self._state
+
+    @state.setter
+    def state(self, state: State) -> None:
+        """Replace the stored state."""
+        self._state = state
+        self._json_dict = {**self._json_dict, "state": state.as_dict()}
+
+    @property
+    def last_seen(self) -> datetime:
+        """Return when the entity was last seen."""
+        if self._last_seen is None:
+            last_seen = self._json_dict["last_seen"]
+            if isinstance(last_seen, str):
+                last_seen = dt_util.parse_datetime(last_seen)
+            self._last_seen = last_seen
+        return self._last_seen
+
+    @last_seen.setter
+    def last_seen(self, last_seen: datetime) -> None:
+        """Replace when the entity was last seen."""
+        self._last_seen = last_seen
+        self._json_dict = {**self._json_dict, "last_seen": last_seen}
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return a dict representation of the stored state."""
+        return self._json_dict
+
+
 class RestoreStateData:
     """Helper class for managing the helper saved data."""
 
@@ -78,15 +138,26 @@ class RestoreStateData:
                 _LOGGER.error("Error loading last states", exc_info=exc)
                 stored_states = None
 
+            try:
+                delta = await data.delta_store.async_load()
+            except HomeAssistantError as exc:
+                _LOGGER.error("Error loading changed last states", exc_info=exc)
+                delta = None
+
             if stored_states is None:
                 _LOGGER.debug("Not creating cache - no saved states found")
                 data.last_states = {}
             else:
                 data.last_states = {
-                    item["state"]["entity_id"]: StoredState.from_dict(item)
+                    item["state"]["entity_id"]: _LazyStoredState(item)
                     for item in stored_states
                     if valid_entity_id(item["state"]["entity_id"])
                 }
+
+            if delta is not None:
+                data.async_apply_delta(delta)
+
+            if data.last_states:
                 _LOGGER.debug("Created cache with %s", list(data.last_states))
 
             if hass.state == CoreState.running:
@@ -106,8 +177,42 @@ class RestoreStateData:
         self.store: Store = Store(
             hass, STORAGE_VERSION, STORAGE_KEY, encoder=JSONEncoder
         )
+        self.delta_store: Store = Store(
+            hass, STORAGE_VERSION, DELTA_STORAGE_KEY, encoder=JSONEncoder
+        )
         self.last_states: Dict[str, StoredState] = {}
         self.entity_ids: Set[str] = set()
+        # The objects the saved states were created from by entity id
+        self._dumped_sources: Optional[Dict[str, Any]] = None
+        # When all the states were last saved
+        self._dumped_time: Optional[datetime] = None
+        # The states saved to the delta store since then
+        self._delta_changed: Dict[str, Dict[str, Any]] = {}
+        self._delta_removed: Dict[str, datetime] = {}
+
+    @callback
+    def async_apply_delta(self, delta: Dict[str, Any]) -> None:
+        """Apply the changed states that were saved to the delta store.
+
+        A changed or removed state only replaces a stored state that was
+        last seen before it. A delta that was left behind by a full save
+        therefore never undoes the newer states of the main store.
+        """
+        for item in delta["changed"]:
+            entity_id = item["state"]["entity_id"]
+            if not valid_entity_id(entity_id):
+                continue
+            changed = _LazyStoredState(item)
+            stored_state = self.last_states.get(entity_id)
+            if stored_state is None or stored_state.last_seen <= changed.last_seen:
+                self.last_states[entity_id] = changed
+
+        for entity_id, removed in delta["removed"].items():
+            stored_state = self.last_states.get(entity_id)
+            if stored_state is not None and stored_state.last_seen <= cast(
+                datetime, dt_util.parse_datetime(removed)
+            ):
+                del self.last_states[entity_id]
 
     @callback
     def async_get_stored_states(self) -> List[StoredState]:
@@ -117,7 +222,23 @@ class RestoreStateData:
         stored states from the previous run, which have not been created as
         entities on this run, and have not expired.
         """
-        now = dt_util.utcnow()
+        return [
+            stored_state
+            for stored_state, _ in self._async_get_stored_states(
+                dt_util.utcnow()
+            ).values()
+        ]
+
+    @callback
+    def _async_get_stored_states(
+        self, now: datetime
+    ) -> Dict[str, Tuple[StoredState, Any]]:
+        """Get the states which should be stored and what they were created from.
+
+        Current states are wrapped in a new stored state on every call, so
+        their state object is returned as the source. The stored states of
+        the previous run are their own source.
+        """
         all_states = self.hass.states.async_all()
         # Entities currently backed by an entity object
         current_entity_ids = {
@@ -127,13 +248,13 @@ class RestoreStateData:
         }
 
         # Start with the currently registered states
-        stored_states = [
-            StoredState(state, now)
+        stored_states = {
+            state.entity_id: (StoredState(state, now), state)
             for state in all_states
             if state.entity_id in self.entity_ids and
             # Ignore all states that are entity registry placeholders
             not state.attributes.get(entity_registry.ATTR_RESTORED)
-        ]
+        }
         expiration_time = now - STATE_EXPIRATION
 
         for entity_id, stored_state in self.last_states.items():
@@ -147,22 +268,103 @@ class RestoreStateData:
             if stored_state.last_seen < expiration_time:
                 continue
 
-            stored_states.append(stored_state)
+            stored_states[entity_id] = (stored_state, stored_state)
 
         return stored_states
 
-    async def async_dump_states(self) -> None:
-        """Save the current state machine to storage."""
+    async def async_dump_states(self, save_all: bool = False) -> None:
+        """Save the current state machine to storage.
+
+        Only the states that changed since the previous dump are saved, to
+        the delta store. All the states are saved to the main store on the
+        first dump, when save_all is set, when they were last saved more
+        than STATE_DUMP_REFRESH_INTERVAL ago and when the delta would hold
+        more than STATE_DUMP_DELTA_RATIO of the states.
+        """
+        now = dt_util.utcnow()
+        stored_states = self._async_get_stored_states(now)
+        dumped_sources = self._dumped_sources
+
+        if (
+            save_all
+            or dumped_sources is None
+            or self._dumped_time is None
+            or now - self._dumped_time >= STATE_DUMP_REFRESH_INTERVAL
+        ):
+            await self._async_dump_all_states(now, stored_states)
+            return
+
+        changed = [
+            entity_id
+            for entity_id, (_, source) in stored_states.items()
+            if dumped_sources.get(entity_id) is not source
+        ]
+        removed = [
+            entity_id for entity_id in dumped_sources if entity_id not in stored_states
+        ]
+        if not changed and not removed:
+            _LOGGER.debug("Not dumping states - no states changed")
+            return
+
+        delta_size = len(
+            self._delta_changed.keys()
+            | self._delta_removed.keys()
+            | set(changed)
+            | set(removed)
+        )
+        if delta_size > len(stored_states) * STATE_DUMP_DELTA_RATIO:
+            await self._async_dump_all_states(now, stored_states)
+            return
+
+        for entity_id in changed:
+            self._delta_removed.pop(entity_id, None)
+            self._delta_changed[entity_id] = stored_states[entity_id][0].as_dict()
+        for entity_id in removed:
+            self._delta_changed.pop(entity_id, None)
+            self._delta_removed[entity_id] = now
+
+        _LOGGER.debug("Dumping %s changed states", len(changed) + len(removed))
+        try:
+            await self.delta_store.async_save(
+                {
+                    "changed": list(self._delta_changed.values()),
+                    "removed": self._delta_removed,
+                }
+            )
+        except HomeAssistantError as exc:
+            _LOGGER.error("Error saving changed states", exc_info=exc)
+            self._dumped_sources = None
+        else:
+            self._dumped_sources = {
+                entity_id: source for entity_id, (_, source) in stored_states.items()
+            }
+
+    async def _async_dump_all_states(
+        self, now: datetime, stored_states: Dict[str, Tuple[StoredState, Any]]
+    ) -> None:
+        """Save all the states to the main store and clear the delta store."""
         _LOGGER.debug("Dumping states")
         try:
             await self.store.async_save(
-                [
-                    stored_state.as_dict()
-                    for stored_state in self.async_get_stored_states()
-                ]
+                [stored_state.as_dict() for stored_state, _ in stored_states.values()]
             )
         except HomeAssistantError as exc:
             _LOGGER.error("Error saving current states", exc_info=exc)
+            self._dumped_sources = None
+            return
+
+        self._dumped_sources = {
+            entity_id: source for entity_id, (_, source) in stored_states.items()
+        }
+        self._dumped_time = now
+        self._delta_changed = {}
+        self._delta_removed = {}
+
+        # While stopping the main store is only written by the final write.
+        # The delta store is kept until then, its states are older than the
+        # ones of the main store so they are not applied when loading.
+        if self.hass.state != CoreState.stopping:
+            await self.delta_store.async_remove()
 
     @callback
     def async_setup_dump(self, *args: Any) -> None:
@@ -171,16 +373,21 @@ class RestoreStateData:
         async def _async_dump_states(*_: Any) -> None:
             await self.async_dump_states()
 
+        async def _async_dump_all_states(*_: Any) -> None:
+            await self.async_dump_states(save_all=True)
+
         # Dump the initial states now. This helps minimize the risk of having
         # old states loaded by overwriting the last states once Home Assistant
         # has started and the old states have been read.
-        self.hass.async_create_task(_async_dump_states())
+        self.hass.async_create_task(_async_dump_all_states())
 
-        # Dump states periodically
+        # Dump changed states periodically
         async_track_time_interval(self.hass, _async_dump_states, STATE_DUMP_INTERVAL)
 
-        # Dump states when stopping hass
-        self.hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_dump_states)
+        # Dump all states when stopping hass
+        self.hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_STOP, _async_dump_all_states
+        )
 
     @callback
     def async_restore_entity_added(self, entity_id: str) -> None:
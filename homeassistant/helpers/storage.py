@@ -1,15 +1,22 @@
 """Helper to help store data."""
 import asyncio
+from contextlib import AsyncExitStack
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from functools import partial
+import json
 from json import JSONEncoder
 import logging
 import os
-from typing import Any, Callable, Dict, List, Optional, Type, Union
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, Union
 
 from homeassistant.const import EVENT_HOMEASSISTANT_FINAL_WRITE
 from homeassistant.core import CALLBACK_TYPE, CoreState, HomeAssistant, callback
+from homeassistant.helpers import json as json_helper
 from homeassistant.helpers.event import async_call_later
 from homeassistant.loader import bind_hass
-from homeassistant.util import json as json_util
+from homeassistant.util import dt as dt_util, json as json_util
 
 # mypy: allow-untyped-calls, allow-untyped-defs, no-warn-return-any
 # mypy: no-check-untyped-defs
@@ -17,6 +24,149 @@ from homeassistant.util import json as json_util
 STORAGE_DIR = ".storage"
 _LOGGER = logging.getLogger(__name__)
 
+DATA_STORAGE_SCHEDULER = "storage_scheduler"
+DATA_STORAGE_METRICS = "storage_metrics"
+
+# Delayed writes that are due within this window of the first due
+# write are flushed together with it
+WRITE_FLUSH_WINDOW = timedelta(seconds=5)
+
+
+@dataclass
+class StoreMetrics:
+    """Write metrics of a store."""
+
+    write_count: int = 0
+    last_write_size: int = 0
+    total_write_size: int = 0
+    last_serialize_time: float = 0.0
+    total_serialize_time: float = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the metrics as a dictionary."""
+        return {
+            "write_count": self.write_count,
+            "last_write_size": self.last_write_size,
+            "total_write_size": self.total_write_size,
+            "last_serialize_time": self.last_serialize_time,
+            "total_serialize_time": self.total_serialize_time,
+        }
+
+
+@callback
+@bind_hass
+def async_get_storage_metrics(hass: HomeAssistant) -> Dict[str, Dict[str, Any]]:
+    """Return the write metrics of the stores by key.
+
+    Sizes are in bytes and times in seconds.
+    """
+    return {
+        key: metrics.as_dict()
+        for key, metrics in hass.data.get(DATA_STORAGE_METRICS, {}).items()
+    }
+
+
+class _StoreWriteScheduler:
+    """Coalesce the delayed writes of all stores.
+
+    Stores that are due within WRITE_FLUSH_WINDOW of each other are
+    written by a single executor job instead of each store waking up
+    on its own timer.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the scheduler."""
+        self.hass = hass
+        self._pending: Dict["Store", datetime] = {}
+        self._unsub_timer: Optional[CALLBACK_TYPE] = None
+        self._timer_due: Optional[datetime] = None
+        self.flushes = 0
+
+    @callback
+    def async_schedule(self, store: "Store", delay: float) -> None:
+        """Schedule a delayed write of the store."""
+        due = dt_util.utcnow() + timedelta(seconds=delay)
+        self._pending[store] = due
+        if self._timer_due is None or due < self._timer_due:
+            self._async_schedule_timer(due)
+
+    @callback
+    def async_cancel(self, store: "Store") -> None:
+        """Cancel a delayed write of the store."""
+        self._pending.pop(store, None)
+
+    @callback
+    def _async_schedule_timer(self, due: datetime) -> None:
+        """Schedule the next flush."""
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+        self._timer_due = due
+        self._unsub_timer = async_call_later(
+            self.hass,
+            max((due - dt_util.utcnow()).total_seconds(), 0),
+            self._async_flush_due,
+        )
+
+    @callback
+    def _async_flush_due(self, now: datetime) -> None:
+        """Start writing the stores that are due."""
+        self.hass.async_create_task(self._async_flush(now))
+
+    async def _async_flush(self, now: datetime) -> None:
+        """Write the stores that are due."""
+        self._unsub_timer = None
+        self._timer_due = None
+
+        limit = now + WRITE_FLUSH_WINDOW
+        stores = [store for store, due in self._pending.items() if due <= limit]
+        for store in stores:
+            del self._pending[store]
+
+        if self._pending:
+            self._async_schedule_timer(min(self._pending.values()))
+
+        if not stores:
+            return
+
+        if self.hass.state == CoreState.stopping:
+            # The stores write when Home Assistant does the final write
+            for store in stores:
+                store.async_ensure_final_write_listener()
+            return
+
+        self.flushes += 1
+        # Stores are locked in a fixed order so flushes can't deadlock
+        stores.sort(key=lambda store: (store.key, id(store)))
+        async with AsyncExitStack() as stack:
+            writes: List[Tuple[Store, str, Dict]] = []
+            for store in stores:
+                # pylint: disable=protected-access
+                await stack.enter_async_context(store._write_lock)
+                data = store._async_pop_data()
+                if data is not None:
+                    writes.append((store, store.path, data))
+
+            if writes:
+                await self.hass.async_add_executor_job(_write_stores, writes)
+
+
+def _write_stores(writes: List[Tuple["Store", str, Dict]]) -> None:
+    """Write the data of multiple stores."""
+    for store, path, data in writes:
+        try:
+            store._write_data(path, data)  # pylint: disable=protected-access
+        except (json_util.SerializationError, json_util.WriteError) as err:
+            _LOGGER.error("Error writing config for %s: %s", store.key, err)
+
+
+@callback
+def _async_get_scheduler(hass: HomeAssistant) -> _StoreWriteScheduler:
+    """Return the write scheduler of the stores."""
+    scheduler: Optional[_StoreWriteScheduler] = hass.data.get(DATA_STORAGE_SCHEDULER)
+    if scheduler is None:
+        scheduler = hass.data[DATA_STORAGE_SCHEDULER] = _StoreWriteScheduler(hass)
+    return scheduler
+
 
 @bind_hass
 async def async_migrator(
@@ -79,11 +229,14 @@ class Store:
         self.hass = hass
         self._private = private
         self._data: Optional[Dict[str, Any]] = None
-        self._unsub_delay_listener: Optional[CALLBACK_TYPE] = None
+        self._delayed_write = False
         self._unsub_final_write_listener: Optional[CALLBACK_TYPE] = None
         self._write_lock = asyncio.Lock()
         self._load_task: Optional[asyncio.Future] = None
         self._encoder = encoder
+        self.metrics: StoreMetrics = hass.data.setdefault(
+            DATA_STORAGE_METRICS, {}
+        ).setdefault(key, StoreMetrics())
 
     @property
     def path(self):
@@ -145,7 +298,7 @@ class Store:
         self._data = {"version": self.version, "key": self.key, "data": data}
 
         if self.hass.state == CoreState.stopping:
-            self._async_ensure_final_write_listener()
+            self.async_ensure_final_write_listener()
             return
 
         await self._async_handle_write_data()
@@ -156,17 +309,16 @@ class Store:
         self._data = {"version": self.version, "key": self.key, "data_func": data_func}
 
         self._async_cleanup_delay_listener()
-        self._async_ensure_final_write_listener()
+        self.async_ensure_final_write_listener()
 
         if self.hass.state == CoreState.stopping:
             return
 
-        self._unsub_delay_listener = async_call_later(
-            self.hass, delay, self._async_callback_delayed_write
-        )
+        self._delayed_write = True
+        _async_get_scheduler(self.hass).async_schedule(self, delay)
 
     @callback
-    def _async_ensure_final_write_listener(self):
+    def async_ensure_final_write_listener(self):
         """Ensure that we write if we quit before delay has passed."""
         if self._unsub_final_write_listener is None:
             self._unsub_final_write_listener = self.hass.bus.async_listen_once(
@@ -183,17 +335,9 @@ class Store:
     @callback
     def _async_cleanup_delay_listener(self):
         """Clean up a delay listener."""
-        if self._unsub_delay_listener is not None:
-            self._unsub_delay_listener()
-            self._unsub_delay_listener = None
-
-    async def _async_callback_delayed_write(self, _now):
-        """Handle a delayed write callback."""
-        # catch the case where a call is scheduled and then we stop Home Assistant
-        if self.hass.state == CoreState.stopping:
-            self._async_ensure_final_write_listener()
-            return
-        await self._async_handle_write_data()
+        if self._delayed_write:
+            _async_get_scheduler(self.hass).async_cancel(self)
+            self._delayed_write = False
 
     async def _async_callback_final_write(self, _event):
         """Handle a write because Home Assistant is in final write state."""
@@ -203,20 +347,12 @@ class Store:
     async def _async_handle_write_data(self, *_args):
         """Handle writing the config."""
         async with self._write_lock:
-            self._async_cleanup_delay_listener()
-            self._async_cleanup_final_write_listener()
+            data = self._async_pop_data()
 
-            if self._data is None:
+            if data is None:
                 # Another write already consumed the data
                 return
 
-            data = self._data
-
-            if "data_func" in data:
-                data["data"] = data.pop("data_func")()
-
-            self._data = None
-
             try:
                 await self.hass.async_add_executor_job(
                     self._write_data, self.path, data
@@ -224,13 +360,49 @@ class Store:
             except (json_util.SerializationError, json_util.WriteError) as err:
                 _LOGGER.error("Error writing config for %s: %s", self.key, err)
 
+    @callback
+    def _async_pop_data(self) -> Optional[Dict]:
+        """Return the data to write and clear the pending write."""
+        self._async_cleanup_delay_listener()
+        self._async_cleanup_final_write_listener()
+
+        data = self._data
+
+        if data is None:
+            return None
+
+        if "data_func" in data:
+            data["data"] = data.pop("data_func")()
+
+        self._data = None
+        return data
+
     def _write_data(self, path: str, data: Dict) -> None:
         """Write the data."""
         if not os.path.isdir(os.path.dirname(path)):
             os.makedirs(os.path.dirname(path))
 
         _LOGGER.debug("Writing data for %s to %s", self.key, path)
-        json_util.save_json(path, data, self._private, encoder=self._encoder)
+        json_util.save_json(path, data, self._private, dump=self._dump)
+        self.metrics.write_count += 1
+
+    def _dump(self, data: Dict) -> str:
+        """Serialize the data and record the size and time it took."""
+        if self._encoder is None or self._encoder is json_helper.JSONEncoder:
+            dump: Callable[[Any], str] = json_helper.json_dumps_pretty
+        else:
+            dump = partial(json.dumps, indent=4, cls=self._encoder)
+
+        start = time.perf_counter()
+        json_data = dump(data)
+        serialize_time = time.perf_counter() - start
+
+        self.metrics.last_serialize_time = serialize_time
+        self.metrics.total_serialize_time += serialize_time
+        write_size = len(json_data.encode("utf-8"))
+        self.metrics.last_write_size = write_size
+        self.metrics.total_write_size += write_size
+        return json_data
 
     async def _async_migrate_func(self, old_version, old_data):
         """Migrate to the new version."""
@@ -13,9 +13,9 @@ import math
 from operator import attrgetter
 import random
 import re
+import time
 from typing import Any, Dict, Generator, Iterable, Optional, Type, Union, cast
 from urllib.parse import urlencode as urllib_urlencode
-import weakref
 
 import jinja2
 from jinja2 import contextfilter, contextfunction
@@ -38,6 +38,7 @@ from homeassistant.helpers.typing import HomeAssistantType, TemplateVarsType
 from homeassistant.loader import bind_hass
 from homeassistant.util import convert, dt as dt_util, location as loc_util
 from homeassistant.util.async_ import run_callback_threadsafe
+from homeassistant.util.histogram import Histogram
 from homeassistant.util.thread import ThreadWithException
 
 # mypy: allow-untyped-defs, no-check-untyped-defs
@@ -48,6 +49,10 @@ DATE_STR_FORMAT = "%Y-%m-%d %H:%M:%S"
 
 _RENDER_INFO = "template.render_info"
 _ENVIRONMENT = "template.environment"
+_RENDER_DURATIONS = "template.render_durations"
+
+# Number of compiled templates kept per template environment
+TEMPLATE_CACHE_SIZE = 1000
 
 _RE_JINJA_DELIMITERS = re.compile(r"\{%|\{\{|\{#")
 # Match "simple" ints and floats. -1.0, 1, +5, 5.0
@@ -209,10 +214,12 @@ class RenderInfo:
         self.entities = set()
         self.rate_limit: Optional[timedelta] = None
         self.has_time = False
+        # Seconds spent rendering the template
+        self.render_time = 0.0
 
     def __repr__(self) -> str:
         """Representation of RenderInfo."""
-        return f"<RenderInfo {self.template} all_states={self.all_states} all_states_lifecycle={self.all_states_lifecycle} domains={self.domains} domains_lifecycle={self.domains_lifecycle} entities={self.entities} rate_limit={self.rate_limit}> has_time={self.has_time}"
+        return f"<RenderInfo {self.template} all_states={self.all_states} all_states_lifecycle={self.all_states_lifecycle} domains={self.domains} domains_lifecycle={self.domains_lifecycle} entities={self.entities} rate_limit={self.rate_limit}> has_time={self.has_time} render_time={self.render_time}"
 
     def _filter_domains_and_entities(self, entity_id: str) -> bool:
         """Template should re-render if the entity state changes when we match specific domains or entities."""
@@ -281,7 +288,6 @@ class Template:
         "template",
         "hass",
         "is_static",
-        "_compiled_code",
         "_compiled",
         "_limited",
     )
@@ -292,7 +298,6 @@ class Template:
             raise TypeError("Expected template to be a string")
 
         self.template: str = template.strip()
-        self._compiled_code = None
         self._compiled: Optional[Template] = None
         self.hass = hass
         self.is_static = not is_template_string(template)
@@ -309,11 +314,15 @@ class Template:
 
     def ensure_valid(self) -> None:
         """Return if template is valid."""
-        if self._compiled_code is not None:
+        if self._compiled is not None:
             return
 
+        self._compile(self._env)
+
+    def _compile(self, env: TemplateEnvironment) -> Template:
+        """Return the compiled template shared by all templates with this source."""
         try:
-            self._compiled_code = self._env.compile(self.template)  # type: ignore[no-untyped-call]
+            return cast(Template, env.compile_template(self.template))
         except jinja2.TemplateError as err:
             raise TemplateError(err) from err
 
@@ -362,10 +371,16 @@ class Template:
         if variables is not None:
             kwargs.update(variables)
 
+        start = time.perf_counter()
         try:
             render_result = compiled.render(kwargs)
         except Exception as err:  # pylint: disable=broad-except
             raise TemplateError(err) from err
+        finally:
+            if self.hass is not None:
+                async_get_render_durations(self.hass).observe(
+                    time.perf_counter() - start
+                )
 
         render_result = render_result.strip()
 
@@ -471,11 +486,13 @@ class Template:
             return render_info
 
         self.hass.data[_RENDER_INFO] = render_info
+        start = time.perf_counter()
         try:
             render_info._result = self.async_render(variables, **kwargs)
         except TemplateError as ex:
             render_info.exception = ex
         finally:
+            render_info.render_time = time.perf_counter() - start
             del self.hass.data[_RENDER_INFO]
 
         render_info._freeze()
@@ -534,20 +551,13 @@ class Template:
 
     def _ensure_compiled(self, limited: bool = False) -> Template:
         """Bind a template to a specific hass instance."""
-        self.ensure_valid()
-
         assert self.hass is not None, "hass variable not set on template"
         assert (
             self._limited is None or self._limited == limited
         ), "can't change between limited and non limited template"
 
         self._limited = limited
-        env = self._env
-
-        self._compiled = cast(
-            Template,
-            jinja2.Template.from_code(env, self._compiled_code, env.globals, None),
-        )
+        self._compiled = self._compile(self._env)
 
         return self._compiled
 
@@ -1308,6 +1318,76 @@ def urlencode(value):
     return urllib_urlencode(value).encode("utf-8")
 
 
+class CompiledTemplateCache:
+    """Least recently used cache of compiled templates keyed on their source."""
+
+    def __init__(self, maxsize: int) -> None:
+        """Initialize the cache."""
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._cache: collections.OrderedDict[
+            str, jinja2.Template
+        ] = collections.OrderedDict()
+
+    def __len__(self) -> int:
+        """Return the number of cached templates."""
+        return len(self._cache)
+
+    def get(self, source: str) -> Optional[jinja2.Template]:
+        """Return the compiled template for the source if cached."""
+        compiled = self._cache.get(source)
+        if compiled is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._cache.move_to_end(source)
+        return compiled
+
+    def __setitem__(self, source: str, compiled: jinja2.Template) -> None:
+        """Cache the compiled template for the source."""
+        self._cache[source] = compiled
+        self._cache.move_to_end(source)
+        while len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Return the cache statistics."""
+        return {
+            "size": len(self._cache),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+@callback
+@bind_hass
+def async_get_render_durations(hass: HomeAssistantType) -> Histogram:
+    """Return the histogram of the render durations of the templates in seconds."""
+    durations: Optional[Histogram] = hass.data.get(_RENDER_DURATIONS)
+    if durations is None:
+        durations = hass.data[_RENDER_DURATIONS] = Histogram()
+    return durations
+
+
+@bind_hass
+def template_cache_stats(hass: HomeAssistantType) -> Dict[str, Dict[str, int]]:
+    """Return the statistics of the compiled template caches.
+
+    Limited templates are compiled in a separate environment that is
+    shared by the whole process.
+    """
+    stats = {"limited": _NO_HASS_ENV.template_cache.stats()}
+    env: Optional[TemplateEnvironment] = hass.data.get(_ENVIRONMENT)
+    if env is not None:
+        stats["full"] = env.template_cache.stats()
+    return stats
+
+
 class TemplateEnvironment(ImmutableSandboxedEnvironment):
     """The Home Assistant template environment."""
 
@@ -1315,7 +1395,7 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
         """Initialise template environment."""
         super().__init__()
         self.hass = hass
-        self.template_cache = weakref.WeakValueDictionary()
+        self.template_cache = CompiledTemplateCache(TEMPLATE_CACHE_SIZE)
         self.filters["round"] = forgiving_round
         self.filters["multiply"] = multiply
         self.filters["log"] = logarithm
@@ -1434,25 +1514,22 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
 
         return super().is_safe_attribute(obj, attr, value)
 
-    def compile(self, source, name=None, filename=None, raw=False, defer_init=False):
-        """Compile the template."""
-        if (
-            name is not None
-            or filename is not None
-            or raw is not False
-            or defer_init is not False
-        ):
-            # If there are any non-default keywords args, we do
-            # not cache.  In prodution we currently do not have
-            # any instance of this.
-            return super().compile(source, name, filename, raw, defer_init)
-
-        cached = self.template_cache.get(source)
-
-        if cached is None:
-            cached = self.template_cache[source] = super().compile(source)
-
-        return cached
+    def compile_template(self, source: str) -> jinja2.Template:
+        """Compile the template source.
+
+        The compiled template is stateless so it is shared by all
+        templates with the same source.
+        """
+        cache: CompiledTemplateCache = self.template_cache
+        compiled = cache.get(source)
+        if compiled is not None:
+            return compiled
+
+        template: jinja2.Template = jinja2.Template.from_code(
+            self, self.compile(source), self.globals, None
+        )
+        cache[source] = template
+        return template
 
 
 _NO_HASS_ENV = TemplateEnvironment(None)  # type: ignore[no-untyped-call]
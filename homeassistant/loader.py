@@ -12,7 +12,9 @@ import importlib
 import json
 import logging
 import pathlib
+import stat
 import sys
+import threading
 from types import ModuleType
 from typing import (
     TYPE_CHECKING,
@@ -38,6 +40,7 @@ from homeassistant.generated.zeroconf import HOMEKIT, ZEROCONF
 # Typing imports that create a circular dependency
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
+    from homeassistant.helpers.storage import Store
 
 # mypy: disallow-any-generics
 
@@ -50,6 +53,10 @@ _LOGGER = logging.getLogger(__name__)
 DATA_COMPONENTS = "components"
 DATA_INTEGRATIONS = "integrations"
 DATA_CUSTOM_COMPONENTS = "custom_components"
+DATA_MANIFEST_INDEX = "manifest_index"
+MANIFEST_INDEX_STORAGE_KEY = "core.manifest_index"
+MANIFEST_INDEX_STORAGE_VERSION = 1
+MANIFEST_INDEX_SAVE_DELAY = 60
 PACKAGE_CUSTOM_COMPONENTS = "custom_components"
 PACKAGE_BUILTIN = "homeassistant.components"
 CUSTOM_WARNING = (
@@ -103,6 +110,104 @@ class Manifest(TypedDict, total=False):
     codeowners: List[str]
 
 
+class ManifestIndex:
+    """Index of the parsed manifest.json files, kept between restarts.
+
+    Entries are keyed by the path of the manifest and are only used while
+    the modification time of the file is unchanged. The index is dropped
+    when Home Assistant is upgraded, as that replaces the built-in
+    integrations.
+
+    Lookups run in the executor, so the entries are guarded by a lock.
+    """
+
+    def __init__(
+        self,
+        store: Optional["Store"] = None,
+        manifests: Optional[Dict[str, Dict[str, Any]]] = None,
+    ):
+        """Initialize the manifest index."""
+        self._store = store
+        self._manifests: Dict[str, Dict[str, Any]] = manifests or {}
+        self._lock = threading.Lock()
+        self.changed = False
+
+    def get(self, manifest_path: pathlib.Path) -> Optional[Manifest]:
+        """Return the manifest at a path, or None if there is no manifest.
+
+        Raises ValueError if the manifest can't be parsed.
+        """
+        try:
+            file_stat = manifest_path.stat()
+        except OSError:
+            return None
+
+        if not stat.S_ISREG(file_stat.st_mode):
+            return None
+
+        path = str(manifest_path)
+        with self._lock:
+            entry = self._manifests.get(path)
+        if entry is not None and entry["mtime"] == file_stat.st_mtime:
+            return cast(Manifest, dict(entry["manifest"]))
+
+        manifest = json.loads(manifest_path.read_text())
+        with self._lock:
+            self._manifests[path] = {"mtime": file_stat.st_mtime, "manifest": manifest}
+            self.changed = True
+        return cast(Manifest, dict(manifest))
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the index to store."""
+        # pylint: disable=import-outside-toplevel
+        from homeassistant.const import __version__
+
+        with self._lock:
+            self.changed = False
+            manifests = dict(self._manifests)
+        return {"version": __version__, "manifests": manifests}
+
+    def async_schedule_save(self) -> None:
+        """Save the index if manifests were parsed since it was saved."""
+        if self.changed and self._store is not None:
+            self._store.async_delay_save(self.as_dict, MANIFEST_INDEX_SAVE_DELAY)
+
+
+async def async_get_manifest_index(hass: "HomeAssistant") -> ManifestIndex:
+    """Return the manifest index, loading it from storage on first use."""
+    index_or_evt = hass.data.get(DATA_MANIFEST_INDEX)
+
+    if isinstance(index_or_evt, ManifestIndex):
+        return index_or_evt
+
+    if isinstance(index_or_evt, asyncio.Event):
+        await index_or_evt.wait()
+        return cast(ManifestIndex, hass.data[DATA_MANIFEST_INDEX])
+
+    evt = hass.data[DATA_MANIFEST_INDEX] = asyncio.Event()
+
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.const import __version__
+    from homeassistant.exceptions import HomeAssistantError
+    from homeassistant.helpers.storage import Store
+
+    store = Store(hass, MANIFEST_INDEX_STORAGE_VERSION, MANIFEST_INDEX_STORAGE_KEY)
+    try:
+        data = await store.async_load()
+    except HomeAssistantError as err:
+        _LOGGER.warning("Unable to load the manifest index: %s", err)
+        data = None
+
+    if isinstance(data, dict) and data.get("version") == __version__:
+        index = ManifestIndex(store, data["manifests"])
+    else:
+        index = ManifestIndex(store)
+
+    hass.data[DATA_MANIFEST_INDEX] = index
+    evt.set()
+    return index
+
+
 def manifest_from_legacy_module(domain: str, module: ModuleType) -> Manifest:
     """Generate a manifest from a legacy module."""
     return {
@@ -138,15 +243,21 @@ async def _async_get_custom_components(
     dirs = await hass.async_add_executor_job(
         get_sub_directories, custom_components.__path__
     )
+    manifest_index = await async_get_manifest_index(hass)
 
     integrations = await asyncio.gather(
         *(
             hass.async_add_executor_job(
-                Integration.resolve_from_root, hass, custom_components, comp.name
+                Integration.resolve_from_root,
+                hass,
+                custom_components,
+                comp.name,
+                manifest_index,
             )
             for comp in dirs
         )
     )
+    manifest_index.async_schedule_save()
 
     return {
         integration.domain: integration
@@ -288,23 +399,30 @@ class Integration:
 
     @classmethod
     def resolve_from_root(
-        cls, hass: "HomeAssistant", root_module: ModuleType, domain: str
+        cls,
+        hass: "HomeAssistant",
+        root_module: ModuleType,
+        domain: str,
+        manifest_index: Optional[ManifestIndex] = None,
     ) -> Optional[Integration]:
         """Resolve an integration from a root module."""
+        if manifest_index is None:
+            manifest_index = ManifestIndex()
+
         for base in root_module.__path__:  # type: ignore
             manifest_path = pathlib.Path(base) / domain / "manifest.json"
 
-            if not manifest_path.is_file():
-                continue
-
             try:
-                manifest = json.loads(manifest_path.read_text())
+                manifest = manifest_index.get(manifest_path)
             except ValueError as err:
                 _LOGGER.error(
                     "Error parsing manifest.json file at %s: %s", manifest_path, err
                 )
                 continue
 
+            if manifest is None:
+                continue
+
             return cls(
                 hass, f"{root_module.__name__}.{domain}", manifest_path.parent, manifest
             )
@@ -544,9 +662,11 @@ async def async_get_integration(hass: "HomeAssistant", domain: str) -> Integrati
 
     from homeassistant import components  # pylint: disable=import-outside-toplevel
 
+    manifest_index = await async_get_manifest_index(hass)
     integration = await hass.async_add_executor_job(
-        Integration.resolve_from_root, hass, components, domain
+        Integration.resolve_from_root, hass, components, domain, manifest_index
     )
+    manifest_index.async_schedule_save()
 
     if integration is not None:
         cache[domain] = integration
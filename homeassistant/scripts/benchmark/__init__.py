@@ -7,13 +7,15 @@ from datetime import datetime
 import json
 import logging
 from timeit import default_timer as timer
+import tracemalloc
 from typing import Callable, Dict, TypeVar
 
 from homeassistant import core
 from homeassistant.components.websocket_api.const import JSON_DUMP
 from homeassistant.const import ATTR_NOW, EVENT_STATE_CHANGED, EVENT_TIME_CHANGED
+from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.entityfilter import convert_include_exclude_filter
-from homeassistant.helpers.json import JSONEncoder
+from homeassistant.helpers.json import JSONEncoder, stdlib_json_dumps
 from homeassistant.util import dt as dt_util
 
 # mypy: allow-untyped-calls, allow-untyped-defs, no-check-untyped-defs
@@ -185,6 +187,67 @@ async def state_changed_event_helper(hass):
     return timer() - start
 
 
+@benchmark
+async def state_changed_entity_listeners(hass):
+    """Change 5000 entities with 500 entity listeners for 10 entities each."""
+    return await _state_changed_listeners(hass, True)
+
+
+@benchmark
+async def state_changed_filtering_listeners(hass):
+    """Change 5000 entities with 500 listeners filtering for 10 entities each."""
+    return await _state_changed_listeners(hass, False)
+
+
+async def _state_changed_listeners(hass, indexed):
+    entity_ids = [f"sensor.benchmark_{idx}" for idx in range(5000)]
+    expected = len(entity_ids)
+    count = 0
+    event = asyncio.Event()
+
+    def _create_listener(watched):
+        """Create a listener for 10 of the entities."""
+
+        @core.callback
+        def listener(evt):
+            """Handle event."""
+            nonlocal count
+            if not indexed and evt.data["entity_id"] not in watched:
+                return
+            count += 1
+
+            if count == expected:
+                event.set()
+
+        return listener
+
+    for idx in range(500):
+        watched = set(entity_ids[idx * 10 : (idx + 1) * 10])
+        listener = _create_listener(watched)
+        if indexed:
+            hass.bus.async_listen_entities(EVENT_STATE_CHANGED, listener, watched)
+        else:
+            hass.bus.async_listen(EVENT_STATE_CHANGED, listener)
+
+    events_data = [
+        {
+            "entity_id": entity_id,
+            "old_state": core.State(entity_id, "1"),
+            "new_state": core.State(entity_id, "2"),
+        }
+        for entity_id in entity_ids
+    ]
+
+    start = timer()
+
+    for event_data in events_data:
+        hass.bus.async_fire(EVENT_STATE_CHANGED, event_data)
+
+    await event.wait()
+
+    return timer() - start
+
+
 @benchmark
 async def logbook_filtering_state(hass):
     """Filter state changes."""
@@ -323,6 +386,234 @@ async def json_serialize_states(hass):
     return timer() - start
 
 
+@benchmark
+async def json_serialize_states_stdlib(hass):
+    """Serialize million states with the standard library encoder."""
+    states = [
+        core.State("light.kitchen", "on", {"friendly_name": "Kitchen Lights"})
+        for _ in range(10 ** 6)
+    ]
+
+    start = timer()
+    stdlib_json_dumps(states)
+    return timer() - start
+
+
+@benchmark
+async def state_memory(hass):
+    """Measure the memory held by 50 states of 2000 entities."""
+    entity_ids = [f"sensor.benchmark_{idx}" for idx in range(2000)]
+    attributes = {
+        "unit_of_measurement": "°C",
+        "friendly_name": "Benchmark Temperature",
+        "device_class": "temperature",
+    }
+    history = []
+
+    @core.callback
+    def listener(event):
+        """Keep the states like the logbook and template caches do."""
+        history.append(event.data["new_state"])
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED, listener)
+
+    tracemalloc.start()
+    start = timer()
+
+    for value in range(50):
+        for entity_id in entity_ids:
+            # Entities build new attributes on every write
+            hass.states.async_set(entity_id, str(value % 10), dict(attributes))
+        await hass.async_block_till_done()
+
+    runtime = timer() - start
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{len(history)} states hold {memory / 2 ** 20:.1f} MiB")
+    return runtime
+
+
+@benchmark
+async def entity_state_memory(hass):
+    """Measure the memory held by 50 states of 2000 entities writing them."""
+
+    class BenchmarkEntity(Entity):
+        """Temperature sensor with static attributes."""
+
+        def __init__(self, idx):
+            """Initialize the sensor."""
+            self.entity_id = f"sensor.benchmark_{idx}"
+            self.value = None
+
+        @property
+        def name(self):
+            """Return the name of the sensor."""
+            return "Benchmark Temperature"
+
+        @property
+        def device_class(self):
+            """Return the device class of the sensor."""
+            return "temperature"
+
+        @property
+        def unit_of_measurement(self):
+            """Return the unit of the sensor."""
+            return "°C"
+
+        @property
+        def state(self):
+            """Return the state of the sensor."""
+            return self.value
+
+    entities = [BenchmarkEntity(idx) for idx in range(2000)]
+    for entity in entities:
+        entity.hass = hass
+    history = []
+
+    @core.callback
+    def listener(event):
+        """Keep the states like the logbook and template caches do."""
+        history.append(event.data["new_state"])
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED, listener)
+
+    tracemalloc.start()
+    start = timer()
+
+    for value in range(50):
+        for entity in entities:
+            entity.value = value % 10
+            entity.async_write_ha_state()
+        await hass.async_block_till_done()
+
+    runtime = timer() - start
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{len(history)} states hold {memory / 2 ** 20:.1f} MiB")
+    return runtime
+
+
+@benchmark
+async def json_serialize_events(hass):
+    """Serialize 100k state changed event messages with the default encoder."""
+    return _json_serialize_events(JSON_DUMP)
+
+
+@benchmark
+async def json_serialize_events_stdlib(hass):
+    """Serialize 100k state changed event messages with the standard library."""
+    return _json_serialize_events(stdlib_json_dumps)
+
+
+def _json_serialize_events(dump):
+    entity_id = "light.kitchen"
+    old_state = core.State(entity_id, "off", {"friendly_name": "Kitchen Lights"})
+    new_state = core.State(entity_id, "on", {"friendly_name": "Kitchen Lights"})
+    messages = [
+        {
+            "id": idx,
+            "type": "event",
+            "event": core.Event(
+                EVENT_STATE_CHANGED,
+                {
+                    "entity_id": entity_id,
+                    "old_state": old_state,
+                    "new_state": new_state,
+                },
+            ),
+        }
+        for idx in range(10 ** 5)
+    ]
+
+    start = timer()
+    for message in messages:
+        dump(message)
+    return timer() - start
+
+
+@benchmark
+async def mqtt_topic_routing(hass):
+    """Route 100k MQTT messages to 3000 subscriptions."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.components.mqtt.topic_trie import TopicTrie
+
+    trie = TopicTrie()
+    for idx in range(1000):
+        trie.add(f"zigbee2mqtt/device_{idx}", object())
+        trie.add(f"zigbee2mqtt/device_{idx}/availability", object())
+        trie.add(f"homeassistant/sensor/device_{idx}/+/config", object())
+    trie.add("zigbee2mqtt/bridge/#", object())
+    trie.add("homeassistant/+/+/config", object())
+
+    topics = [
+        f"zigbee2mqtt/device_{idx % 1000}"
+        if idx % 2
+        else f"homeassistant/sensor/device_{idx % 1000}/temperature/config"
+        for idx in range(10 ** 5)
+    ]
+
+    start = timer()
+    for topic in topics:
+        trie.match(topic)
+    return timer() - start
+
+
+@benchmark
+async def recorder_write(hass):
+    """Record 100k state changes with the regular write path."""
+    return await _recorder_write(hass, False)
+
+
+@benchmark
+async def recorder_write_bulk(hass):
+    """Record 100k state changes with the bulk insert write path."""
+    return await _recorder_write(hass, True)
+
+
+async def _recorder_write(hass, bulk_insert):
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.components import recorder
+
+    hass.state = core.CoreState.running
+    instance = recorder.Recorder(
+        hass,
+        auto_purge=False,
+        keep_days=1,
+        commit_interval=1,
+        uri="sqlite://",
+        db_max_retries=1,
+        db_retry_wait=1,
+        entity_filter=lambda entity_id: True,
+        exclude_t=[],
+        db_integrity_check=False,
+        bulk_insert=bulk_insert,
+    )
+    instance.async_initialize()
+    instance.start()
+    await instance.async_db_ready
+
+    count = 10 ** 5
+
+    start = timer()
+
+    for i in range(count):
+        hass.states.async_set(
+            f"sensor.benchmark_{i % 1000}", i, {"unit_of_measurement": "W"}
+        )
+        # Commit once per 1000 state changes
+        if i % 1000 == 999:
+            hass.bus.async_fire(EVENT_TIME_CHANGED, {ATTR_NOW: dt_util.utcnow()})
+
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(instance.block_till_done)
+
+    elapsed = timer() - start
+    print(f"Recorded {count / elapsed:.0f} events/sec")
+    return elapsed
+
+
 def _create_state_changed_event_from_old_new(
     entity_id, event_time_fired, old_state, new_state
 ):
@@ -1,9 +1,11 @@
 """All methods needed to bootstrap a Home Assistant instance."""
 import asyncio
+from contextlib import contextmanager
+from dataclasses import dataclass
 import logging.handlers
 from timeit import default_timer as timer
 from types import ModuleType
-from typing import Awaitable, Callable, Optional, Set
+from typing import Any, Awaitable, Callable, Dict, Generator, List, Optional, Set
 
 from homeassistant import config as conf_util, core, loader, requirements
 from homeassistant.config import async_notify_setup_error
@@ -20,6 +22,15 @@ DATA_SETUP_DONE = "setup_done"
 DATA_SETUP_STARTED = "setup_started"
 DATA_SETUP = "setup_tasks"
 DATA_DEPS_REQS = "deps_reqs_processed"
+DATA_SETUP_TIMELINE = "setup_timeline"
+
+PHASE_DEPENDENCIES = "dependencies"
+PHASE_REQUIREMENTS = "requirements"
+PHASE_IMPORT = "import"
+PHASE_CONFIG = "config"
+PHASE_SETUP = "setup"
+PHASE_CONFIG_ENTRY = "config_entry"
+PHASE_PLATFORM = "platform"
 
 SLOW_SETUP_WARNING = 10
 SLOW_SETUP_MAX_WAIT = 300
@@ -71,6 +82,11 @@ async def _async_process_dependencies(
     hass: core.HomeAssistant, config: ConfigType, integration: loader.Integration
 ) -> bool:
     """Ensure all dependencies are set up."""
+    async_get_setup_timeline(hass).dependencies[integration.domain] = {
+        *integration.dependencies,
+        *integration.after_dependencies,
+    }
+
     dependencies_tasks = {
         dep: hass.loop.create_task(async_setup_component(hass, dep, config))
         for dep in integration.dependencies
@@ -160,10 +176,13 @@ async def _async_setup_component(
         log_error(str(err), integration.documentation)
         return False
 
+    timeline = async_get_setup_timeline(hass)
+
     # Some integrations fail on import because they call functions incorrectly.
     # So we do it before validating config to catch these errors.
     try:
-        component = integration.get_component()
+        with timeline.async_track(domain, PHASE_IMPORT):
+            component = integration.get_component()
     except ImportError as err:
         log_error(f"Unable to import component: {err}", integration.documentation)
         return False
@@ -171,9 +190,10 @@ async def _async_setup_component(
         _LOGGER.exception("Setup failed for %s: unknown error", domain)
         return False
 
-    processed_config = await conf_util.async_process_component_config(
-        hass, config, integration
-    )
+    with timeline.async_track(domain, PHASE_CONFIG):
+        processed_config = await conf_util.async_process_component_config(
+            hass, config, integration
+        )
 
     if processed_config is None:
         log_error("Invalid config.", integration.documentation)
@@ -227,6 +247,7 @@ async def _async_setup_component(
         return False
     finally:
         end = timer()
+        timeline.async_add(domain, PHASE_SETUP, start, end)
         if warn_task:
             warn_task.cancel()
     _LOGGER.info("Setup of domain %s took %.1f seconds", domain, end - start)
@@ -256,6 +277,7 @@ async def _async_setup_component(
 
     hass.config.components.add(domain)
     hass.data[DATA_SETUP_STARTED].pop(domain)
+    timeline.async_set_loaded(domain)
 
     # Cleanup
     if domain in hass.data[DATA_SETUP]:
@@ -335,14 +357,18 @@ async def async_process_deps_reqs(
     elif integration.domain in processed:
         return
 
-    if not await _async_process_dependencies(hass, config, integration):
-        raise HomeAssistantError("Could not set up all dependencies.")
+    timeline = async_get_setup_timeline(hass)
+
+    with timeline.async_track(integration.domain, PHASE_DEPENDENCIES):
+        if not await _async_process_dependencies(hass, config, integration):
+            raise HomeAssistantError("Could not set up all dependencies.")
 
     if not hass.config.skip_pip and integration.requirements:
-        async with hass.timeout.async_freeze(integration.domain):
-            await requirements.async_get_integration_with_requirements(
-                hass, integration.domain
-            )
+        with timeline.async_track(integration.domain, PHASE_REQUIREMENTS):
+            async with hass.timeout.async_freeze(integration.domain):
+                await requirements.async_get_integration_with_requirements(
+                    hass, integration.domain
+                )
 
     processed.add(integration.domain)
 
@@ -378,3 +404,214 @@ def async_when_setup(
         await when_setup()
 
     unsub = hass.bus.async_listen(EVENT_COMPONENT_LOADED, loaded_event)
+
+
+@dataclass
+class SetupTimelineEvent:
+    """A phase of setting up an integration."""
+
+    domain: str
+    phase: str
+    start: float
+    end: float
+    detail: Optional[str] = None
+
+
+class SetupTimeline:
+    """Record how long each phase of setting up the integrations took.
+
+    Times are taken from the default timer and reported in seconds
+    since the timeline was created, which is when bootstrap starts
+    setting up the integrations. Nothing is recorded once bootstrap has
+    finished, so integrations and platforms set up later do not make
+    the timeline grow for as long as Home Assistant runs.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the timeline."""
+        self.start = timer()
+        self.finished: Optional[float] = None
+        self.events: List[SetupTimelineEvent] = []
+        self.stages: List[SetupTimelineEvent] = []
+        self.dependencies: Dict[str, Set[str]] = {}
+        self.loaded: Dict[str, float] = {}
+
+    @core.callback
+    def async_add(
+        self,
+        domain: str,
+        phase: str,
+        start: float,
+        end: float,
+        detail: Optional[str] = None,
+    ) -> None:
+        """Add a phase that has completed."""
+        if self.finished is not None:
+            return
+        self.events.append(SetupTimelineEvent(domain, phase, start, end, detail))
+
+    @contextmanager
+    def async_track(
+        self, domain: str, phase: str, detail: Optional[str] = None
+    ) -> Generator[None, None, None]:
+        """Record the phase run within the context."""
+        start = timer()
+        try:
+            yield
+        finally:
+            self.async_add(domain, phase, start, timer(), detail)
+
+    @contextmanager
+    def async_track_stage(self, name: str) -> Generator[None, None, None]:
+        """Record a stage of bootstrap run within the context."""
+        start = timer()
+        try:
+            yield
+        finally:
+            self.stages.append(SetupTimelineEvent("bootstrap", name, start, timer()))
+
+    @core.callback
+    def async_set_loaded(self, domain: str) -> None:
+        """Mark an integration as set up."""
+        if self.finished is None:
+            self.loaded[domain] = timer()
+
+    @core.callback
+    def async_set_finished(self) -> None:
+        """Mark the setup of the integrations as finished."""
+        self.finished = timer()
+
+    def _relative(self, time: float) -> float:
+        """Return a time relative to the start of the timeline."""
+        return round(time - self.start, 6)
+
+    def _event_as_dict(self, event: SetupTimelineEvent) -> Dict[str, Any]:
+        """Return a dictionary representation of an event."""
+        return {
+            "domain": event.domain,
+            "phase": event.phase,
+            "detail": event.detail,
+            "start": self._relative(event.start),
+            "end": self._relative(event.end),
+        }
+
+    def critical_path(self) -> List[Dict[str, Any]]:
+        """Return the chain of integrations that delayed startup the most.
+
+        The path ends with the integration that finished last. Going back,
+        each integration is preceded by the dependency it waited on the
+        longest, which is the one that was set up last.
+        """
+        starts: Dict[str, float] = {}
+        ends: Dict[str, float] = {}
+        for event in self.events:
+            if event.start < starts.get(event.domain, event.start + 1):
+                starts[event.domain] = event.start
+            if event.end > ends.get(event.domain, event.end - 1):
+                ends[event.domain] = event.end
+
+        if not ends:
+            return []
+
+        path = []
+        seen: Set[str] = set()
+        domain: Optional[str] = max(ends, key=ends.__getitem__)
+        while domain is not None:
+            seen.add(domain)
+            path.append(
+                {
+                    "domain": domain,
+                    "start": self._relative(starts[domain]),
+                    "end": self._relative(ends[domain]),
+                    "duration": round(ends[domain] - starts[domain], 6),
+                }
+            )
+            waited_on = [
+                dep
+                for dep in self.dependencies.get(domain, ())
+                if dep in ends and dep not in seen
+            ]
+            domain = (
+                max(waited_on, key=lambda dep: self.loaded.get(dep, ends[dep]))
+                if waited_on
+                else None
+            )
+
+        path.reverse()
+        return path
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return a dictionary representation of the timeline."""
+        return {
+            "finished": None
+            if self.finished is None
+            else self._relative(self.finished),
+            "stages": [
+                {
+                    "name": stage.phase,
+                    "start": self._relative(stage.start),
+                    "end": self._relative(stage.end),
+                }
+                for stage in self.stages
+            ],
+            "events": [self._event_as_dict(event) for event in self.events],
+            "critical_path": self.critical_path(),
+        }
+
+    def as_chrome_trace(self) -> Dict[str, Any]:
+        """Return the timeline in the Chrome trace event format.
+
+        The result can be loaded in chrome://tracing or Perfetto, with a
+        row for the stages of bootstrap and a row per integration.
+        """
+        thread_ids: Dict[str, int] = {"bootstrap": 0}
+        trace_events: List[Dict[str, Any]] = []
+
+        for event in [*self.stages, *self.events]:
+            thread_id = thread_ids.setdefault(event.domain, len(thread_ids))
+            trace_event: Dict[str, Any] = {
+                "name": event.phase
+                if event.detail is None
+                else f"{event.phase} {event.detail}",
+                "cat": event.phase,
+                "ph": "X",
+                "pid": 1,
+                "tid": thread_id,
+                "ts": round((event.start - self.start) * 1_000_000),
+                "dur": round((event.end - event.start) * 1_000_000),
+            }
+            trace_events.append(trace_event)
+
+        trace_events.extend(
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": 1,
+                "tid": thread_id,
+                "args": {"name": domain},
+            }
+            for domain, thread_id in thread_ids.items()
+        )
+
+        if self.finished is not None:
+            trace_events.append(
+                {
+                    "name": "setup finished",
+                    "ph": "i",
+                    "s": "g",
+                    "pid": 1,
+                    "tid": 0,
+                    "ts": round((self.finished - self.start) * 1_000_000),
+                }
+            )
+
+        return {"traceEvents": trace_events, "displayTimeUnit": "ms"}
+
+
+@core.callback
+def async_get_setup_timeline(hass: core.HomeAssistant) -> SetupTimeline:
+    """Return the setup timeline."""
+    timeline: Optional[SetupTimeline] = hass.data.get(DATA_SETUP_TIMELINE)
+    if timeline is None:
+        timeline = hass.data[DATA_SETUP_TIMELINE] = SetupTimeline()
+    return timeline
@@ -0,0 +1,70 @@
+"""Histogram of durations that can be read by exporters."""
+from bisect import bisect_left
+import threading
+from typing import Any, Dict, List, Sequence, Tuple
+
+# Upper bounds in seconds, the same as the Prometheus client defaults
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.075,
+    0.1,
+    0.25,
+    0.5,
+    0.75,
+    1.0,
+    2.5,
+    5.0,
+    7.5,
+    10.0,
+)
+
+
+class Histogram:
+    """Count observations in buckets with fixed upper bounds.
+
+    Observing is a bisect and two additions under a lock, so it can be used
+    on hot paths. Templates are also rendered in worker threads when a
+    render times out, so observations can come from any thread.
+    """
+
+    __slots__ = ("bounds", "counts", "count", "sum", "_lock")
+
+    def __init__(self, bounds: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        """Initialize the histogram."""
+        self.bounds = tuple(bounds)
+        # The last bucket counts the observations above the largest bound
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        """Count an observation."""
+        bucket = bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[bucket] += 1
+            self.count += 1
+            self.sum += value
+
+    def cumulative_buckets(self) -> List[Tuple[str, int]]:
+        """Return the cumulative count per upper bound, ending with +Inf."""
+        with self._lock:
+            counts = list(self.counts)
+        buckets = []
+        total = 0
+        for bound, count in zip(self.bounds, counts):
+            total += count
+            buckets.append((repr(float(bound)), total))
+        buckets.append(("+Inf", total + counts[-1]))
+        return buckets
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return a dictionary representation of the histogram."""
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "buckets": dict(self.cumulative_buckets()),
+        }
@@ -48,15 +48,22 @@ def save_json(
     private: bool = False,
     *,
     encoder: Optional[Type[json.JSONEncoder]] = None,
+    dump: Optional[Callable[[Any], str]] = None,
 ) -> None:
     """Save JSON data to a file.
 
+    The data is serialized with dump if given, otherwise with json.dumps
+    and the encoder.
+
     Returns True on success.
     """
     try:
-        json_data = json.dumps(data, indent=4, cls=encoder)
+        if dump is None:
+            json_data = json.dumps(data, indent=4, cls=encoder)
+        else:
+            json_data = dump(data)
     except TypeError as error:
-        msg = f"Failed to serialize to JSON: {filename}. Bad data at {format_unserializable_data(find_paths_unserializable_data(data))}"
+        msg = f"Failed to serialize to JSON: {filename}. Bad data at {format_unserializable_data(find_paths_unserializable_data(data, dump=dump or json.dumps))}"
         _LOGGER.error(msg)
         raise SerializationError(msg) from error
 
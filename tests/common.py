@@ -114,6 +114,8 @@ def get_test_home_assistant():
     loop = asyncio.new_event_loop()
     asyncio.set_event_loop(loop)
     hass = loop.run_until_complete(async_test_home_assistant(loop))
+    # Storage is not mocked, don't persist the index in the test config dir
+    hass.data[loader.DATA_MANIFEST_INDEX] = loader.ManifestIndex()
 
     loop_stop_event = threading.Event()
 
@@ -7,7 +7,7 @@ import unittest
 from unittest.mock import patch, sentinel
 
 from homeassistant.components import history, recorder
-from homeassistant.components.recorder.models import process_timestamp
+from homeassistant.components.recorder.models import Statistics, process_timestamp
 import homeassistant.core as ha
 from homeassistant.helpers.json import JSONEncoder
 from homeassistant.setup import async_setup_component, setup_component
@@ -1008,3 +1008,259 @@ async def test_entity_ids_limit_via_api_with_skip_initial_state(hass, hass_clien
     assert len(response_json) == 2
     assert response_json[0][0]["entity_id"] == "light.kitchen"
     assert response_json[1][0]["entity_id"] == "light.cow"
+
+
+async def test_fetch_period_api_with_statistics(hass, hass_client):
+    """Test the fetch period view reading the statistics rollups."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    start = dt_util.utcnow().replace(minute=0, second=0, microsecond=0)
+
+    def _add_statistics():
+        with recorder.session_scope(hass=hass) as session:
+            for entity_id in ("sensor.one", "sensor.two"):
+                session.add(
+                    Statistics(entity_id=entity_id, start=start, mean=1.5, min=1, max=2)
+                )
+
+    await hass.async_add_executor_job(_add_statistics)
+
+    client = await hass_client()
+    response = await client.get(
+        f"/api/history/period/{start.isoformat()}?statistics=hour&filter_entity_id=sensor.one"
+    )
+    assert response.status == 200
+    assert await response.json() == {
+        "sensor.one": [{"start": start.isoformat(), "mean": 1.5, "min": 1, "max": 2}]
+    }
+
+    response = await client.get(
+        f"/api/history/period/{start.isoformat()}?statistics=month"
+    )
+    assert response.status == 400
+
+
+def test_downsample_states_keeps_peaks():
+    """Test downsampling keeps the first, last, lowest and highest states."""
+    states = [{"state": str(value), "last_changed": value} for value in range(100)]
+    states[57]["state"] = "1000"
+    states[23]["state"] = "-5"
+
+    downsampled = history._downsample_states(states, 10)
+
+    assert len(downsampled) <= 10
+    assert downsampled[0] is states[0]
+    assert downsampled[-1] is states[-1]
+    assert states[57] in downsampled
+    assert states[23] in downsampled
+    changed = [state["last_changed"] for state in downsampled]
+    assert changed == sorted(changed)
+
+
+def test_downsample_states_not_numeric():
+    """Test downsampling keeps the last state of each bucket when not numeric."""
+    states = [
+        {"state": "on" if value % 2 else "off", "last_changed": value}
+        for value in range(20)
+    ]
+
+    downsampled = history._downsample_states(states, 6)
+
+    assert [state["last_changed"] for state in downsampled] == [0, 9, 18, 19]
+    assert history._downsample_states(states, 2) == [states[0], states[-1]]
+
+
+async def test_history_stream(hass, hass_ws_client):
+    """Test streaming the history of entities over the websocket."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    start = dt_util.utcnow()
+    for value in range(20):
+        hass.states.async_set("sensor.power", value)
+    hass.states.async_set("light.kitchen", "on")
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(trigger_db_commit, hass)
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    client = await hass_ws_client()
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "history/stream",
+            "start_time": start.isoformat(),
+            "entity_ids": ["sensor.power", "sensor.missing", "light.kitchen"],
+            "include_start_time_state": False,
+            "max_points": 6,
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+
+    response = await client.receive_json()
+    assert response["event"]["entity_id"] == "sensor.power"
+    states = response["event"]["states"]
+    assert len(states) == 6
+    assert states[0]["state"] == "0"
+    assert states[-1]["state"] == "19"
+
+    response = await client.receive_json()
+    assert response["event"]["entity_id"] == "light.kitchen"
+    assert [state["state"] for state in response["event"]["states"]] == ["on"]
+
+    response = await client.receive_json()
+    assert response["event"] == {"done": True}
+
+    await client.send_json(
+        {
+            "id": 2,
+            "type": "history/stream",
+            "start_time": "not a time",
+            "entity_ids": ["sensor.power"],
+        }
+    )
+    response = await client.receive_json()
+    assert not response["success"]
+    assert response["error"]["code"] == "invalid_start_time"
+
+
+async def test_history_stream_applies_filters(hass, hass_ws_client):
+    """Test the history stream skips entities excluded by the configuration."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(
+        hass, "history", {"history": {"exclude": {"domains": ["light"]}}}
+    )
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    start = dt_util.utcnow()
+    hass.states.async_set("sensor.power", "1")
+    hass.states.async_set("light.kitchen", "on")
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(trigger_db_commit, hass)
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    client = await hass_ws_client()
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "history/stream",
+            "start_time": start.isoformat(),
+            "entity_ids": ["light.kitchen", "sensor.power"],
+            "include_start_time_state": False,
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+
+    response = await client.receive_json()
+    assert response["event"]["entity_id"] == "sensor.power"
+
+    response = await client.receive_json()
+    assert response["event"] == {"done": True}
+
+
+async def test_history_subscribe(hass, hass_ws_client):
+    """Test the history subscription sends the backfill and then new states."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    start = dt_util.utcnow()
+    hass.states.async_set("sensor.power", "1")
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(trigger_db_commit, hass)
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    client = await hass_ws_client()
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "history/subscribe",
+            "start_time": start.isoformat(),
+            "entity_ids": ["sensor.power"],
+            "include_start_time_state": False,
+            "minimal_response": True,
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+
+    response = await client.receive_json()
+    assert response["event"]["entity_id"] == "sensor.power"
+    assert [state["state"] for state in response["event"]["states"]] == ["1"]
+
+    response = await client.receive_json()
+    assert response["event"] == {"done": True}
+
+    # New states do not query the database
+    with patch(
+        "homeassistant.components.history._get_significant_states",
+        side_effect=AssertionError,
+    ):
+        hass.states.async_set("sensor.other", "1")
+        hass.states.async_set("sensor.power", "2")
+        hass.states.async_set("sensor.power", "2", {"changed": "attribute"})
+        hass.states.async_set("sensor.power", "3")
+        await hass.async_block_till_done()
+
+    response = await client.receive_json()
+    assert response["event"]["entity_id"] == "sensor.power"
+    assert response["event"]["states"][0]["state"] == "2"
+    assert "attributes" not in response["event"]["states"][0]
+
+    response = await client.receive_json()
+    assert response["event"]["states"][0]["state"] == "3"
+
+    await client.send_json({"id": 2, "type": "unsubscribe_events", "subscription": 1})
+    response = await client.receive_json()
+    assert response["success"]
+
+
+async def test_history_subscribe_applies_filters(hass, hass_ws_client):
+    """Test the history subscription skips entities excluded by the configuration."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(
+        hass, "history", {"history": {"exclude": {"domains": ["light"]}}}
+    )
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    start = dt_util.utcnow()
+    hass.states.async_set("sensor.power", "1")
+    hass.states.async_set("light.kitchen", "on")
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(trigger_db_commit, hass)
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    client = await hass_ws_client()
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "history/subscribe",
+            "start_time": start.isoformat(),
+            "entity_ids": ["light.kitchen", "sensor.power"],
+            "include_start_time_state": False,
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+
+    response = await client.receive_json()
+    assert response["event"]["entity_id"] == "sensor.power"
+
+    response = await client.receive_json()
+    assert response["event"] == {"done": True}
+
+    hass.states.async_set("light.kitchen", "off")
+    hass.states.async_set("sensor.power", "2")
+    await hass.async_block_till_done()
+
+    response = await client.receive_json()
+    assert response["event"]["entity_id"] == "sensor.power"
+    assert response["event"]["states"][0]["state"] == "2"
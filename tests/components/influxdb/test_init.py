@@ -38,7 +38,7 @@ class FilterTest:
 @pytest.fixture(autouse=True)
 def mock_batch_timeout(hass, monkeypatch):
     """Mock the event bus listener and the batch timeout for tests."""
-    hass.bus.listen = MagicMock()
+    hass.bus.listen = hass.bus.listen_entities = MagicMock()
     monkeypatch.setattr(
         f"{INFLUX_PATH}.InfluxThread.batch_timeout",
         Mock(return_value=0),
@@ -294,7 +294,8 @@ def create_state_changed_event_from_old_new(
 
     row.event_type = EVENT_STATE_CHANGED
     row.event_data = "{}"
-    row.attributes = attributes_json
+    row.attributes = None
+    row.shared_attrs = attributes_json
     row.time_fired = event_time_fired
     row.state = new_state and new_state.get("state")
     row.entity_id = entity_id
@@ -1801,6 +1802,59 @@ async def test_empty_config(hass, hass_client):
     _assert_entry(entries[1], name="blu", entity_id=entity_id)
 
 
+async def test_event_stream(hass, hass_ws_client):
+    """Test the logbook subscription sends the backfill and then live entries."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "logbook", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    start = dt_util.utcnow()
+    hass.states.async_set("light.kitchen", STATE_OFF)
+    hass.states.async_set("light.kitchen", STATE_ON)
+    await _async_commit_and_wait(hass)
+
+    client = await hass_ws_client()
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "logbook/event_stream",
+            "start_time": start.isoformat(),
+            "entity_ids": ["light.kitchen", "sensor.power"],
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+
+    response = await client.receive_json()
+    entries = response["event"]["events"]
+    assert len(entries) == 1
+    _assert_entry(entries[0], name="kitchen", entity_id="light.kitchen")
+    assert entries[0]["state"] == STATE_ON
+
+    # Live entries do not query the database
+    with patch(
+        "homeassistant.components.logbook._get_events", side_effect=AssertionError
+    ):
+        # Continuous sensors and attribute changes are left out
+        hass.states.async_set("sensor.power", "1", {"unit_of_measurement": "W"})
+        hass.states.async_set("sensor.power", "2", {"unit_of_measurement": "W"})
+        hass.states.async_set("light.kitchen", STATE_ON, {"brightness": 100})
+        hass.states.async_set("light.other", STATE_OFF)
+        hass.states.async_set("light.other", STATE_ON)
+        hass.states.async_set("light.kitchen", STATE_OFF)
+        await hass.async_block_till_done()
+
+    response = await client.receive_json()
+    entries = response["event"]["events"]
+    assert len(entries) == 1
+    _assert_entry(entries[0], name="kitchen", entity_id="light.kitchen")
+    assert entries[0]["state"] == STATE_OFF
+
+    await client.send_json({"id": 2, "type": "unsubscribe_events", "subscription": 1})
+    response = await client.receive_json()
+    assert response["success"]
+
+
 async def _async_fetch_logbook(client):
 
     # Today time 00:00:00
@@ -11,9 +11,14 @@ from homeassistant.components.mqtt.abbreviations import (
     ABBREVIATIONS,
     DEVICE_ABBREVIATIONS,
 )
-from homeassistant.components.mqtt.discovery import ALREADY_DISCOVERED, async_start
+from homeassistant.components.mqtt.discovery import (
+    ALREADY_DISCOVERED,
+    async_get_discovery_stats,
+    async_start,
+)
 from homeassistant.const import EVENT_STATE_CHANGED, STATE_OFF, STATE_ON
 import homeassistant.core as ha
+from homeassistant.helpers.entity_platform import EntityPlatform
 
 from tests.common import (
     async_fire_mqtt_message,
@@ -122,6 +127,95 @@ async def test_correct_config_discovery(hass, mqtt_mock, caplog):
     assert ("binary_sensor", "bla") in hass.data[ALREADY_DISCOVERED]
 
 
+async def test_discovery_batch(hass, mqtt_mock, hass_ws_client):
+    """Test a burst of discovery messages is processed as one batch."""
+    with patch(
+        "homeassistant.helpers.entity_platform.EntityPlatform.async_add_entities",
+        autospec=True,
+        side_effect=EntityPlatform.async_add_entities,
+    ) as mock_add_entities:
+        for idx in range(10):
+            async_fire_mqtt_message(
+                hass,
+                f"homeassistant/sensor/bla_{idx}/config",
+                f'{{ "name": "Beer {idx}", "state_topic": "test-topic" }}',
+            )
+        async_fire_mqtt_message(
+            hass,
+            "homeassistant/binary_sensor/bla/config",
+            '{ "name": "Beer", "state_topic": "test-topic" }',
+        )
+        await hass.async_block_till_done()
+
+    assert len(hass.states.async_entity_ids("sensor")) == 10
+    assert hass.states.get("binary_sensor.beer") is not None
+    # One call for all sensors and one for the binary sensor
+    assert mock_add_entities.call_count == 2
+
+    stats = async_get_discovery_stats(hass)
+    assert stats["batches"] == 1
+    assert stats["payloads"] == 11
+    assert stats["max_batch_size"] == 11
+    assert stats["max_backlog"] == 11
+    assert stats["backlog"] == 0
+    assert stats["payloads_per_second"] > 0
+
+    client = await hass_ws_client(hass)
+    await client.send_json({"id": 5, "type": "mqtt/discovery/stats"})
+    response = await client.receive_json()
+    assert response["success"]
+    assert response["result"]["payloads"] == 11
+
+
+async def test_discovery_batch_failures(hass, mqtt_mock, caplog):
+    """Test a failing payload or platform does not drop the rest of the batch."""
+    dispatcher_send = mqtt.discovery.async_dispatcher_send
+    forward_entry_setup = hass.config_entries.async_forward_entry_setup
+
+    def _dispatcher_send(hass, signal, *args):
+        if args and args[0].get("name") == "Broken":
+            raise ValueError
+        dispatcher_send(hass, signal, *args)
+
+    async def _forward_entry_setup(entry, component):
+        if component == "binary_sensor":
+            raise ValueError
+        return await forward_entry_setup(entry, component)
+
+    with patch(
+        "homeassistant.components.mqtt.discovery.async_dispatcher_send",
+        side_effect=_dispatcher_send,
+    ), patch.object(
+        hass.config_entries,
+        "async_forward_entry_setup",
+        side_effect=_forward_entry_setup,
+    ):
+        async_fire_mqtt_message(
+            hass,
+            "homeassistant/binary_sensor/bla/config",
+            '{ "name": "Beer", "state_topic": "test-topic" }',
+        )
+        async_fire_mqtt_message(
+            hass,
+            "homeassistant/sensor/bla_0/config",
+            '{ "name": "Broken", "state_topic": "test-topic" }',
+        )
+        async_fire_mqtt_message(
+            hass,
+            "homeassistant/sensor/bla_1/config",
+            '{ "name": "Beer", "state_topic": "test-topic" }',
+        )
+        await hass.async_block_till_done()
+
+    assert hass.states.get("sensor.beer") is not None
+    assert "Error setting up the MQTT platform of binary_sensor" in caplog.text
+    assert "Error processing the discovery payload of sensor bla_0" in caplog.text
+
+    stats = async_get_discovery_stats(hass)
+    assert stats["batches"] == 1
+    assert stats["payloads"] == 3
+
+
 async def test_discover_fan(hass, mqtt_mock, caplog):
     """Test discovering an MQTT fan."""
     async_fire_mqtt_message(
@@ -474,6 +568,7 @@ ABBREVIATIONS_WHITE_LIST = [
     "CONF_DISCOVERY_PREFIX",
     "CONF_EMBEDDED",
     "CONF_KEEPALIVE",
+    "CONF_SHARE_TEMPLATE_RENDERS",
     "CONF_TLS_INSECURE",
     "CONF_TLS_VERSION",
     "CONF_WILL_MESSAGE",
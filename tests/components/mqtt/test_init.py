@@ -19,7 +19,7 @@ from homeassistant.const import (
     TEMP_CELSIUS,
 )
 from homeassistant.core import callback
-from homeassistant.helpers import device_registry
+from homeassistant.helpers import device_registry, template
 from homeassistant.setup import async_setup_component
 from homeassistant.util.dt import utcnow
 
@@ -313,6 +313,89 @@ async def test_all_subscriptions_run_when_decode_fails(
     assert len(calls) == 1
 
 
+async def test_subscribers_share_decoded_payload(hass, mqtt_mock, calls, record_calls):
+    """Test subscribers of a message share the decoded payload."""
+    await mqtt.async_subscribe(hass, "test-topic", record_calls)
+    await mqtt.async_subscribe(hass, "test-topic", record_calls)
+    await mqtt.async_subscribe(hass, "test-topic", record_calls, encoding=None)
+
+    with patch(
+        "homeassistant.components.mqtt.models.json.loads", wraps=json.loads
+    ) as mock_loads:
+        async_fire_mqtt_message(hass, "test-topic", '{"val": 1}')
+        await hass.async_block_till_done()
+
+        assert len(calls) == 3
+        assert calls[0][0].payload_cache is calls[1][0].payload_cache
+        assert calls[0][0].payload_cache is not calls[2][0].payload_cache
+        assert calls[2][0].payload == b'{"val": 1}'
+
+        assert calls[0][0].payload_json() == {"val": 1}
+        assert calls[1][0].payload_json() is calls[0][0].payload_json()
+        assert mock_loads.call_count == 1
+
+    async_fire_mqtt_message(hass, "test-topic", "not json")
+    await hass.async_block_till_done()
+
+    for (msg,) in calls[3:]:
+        with pytest.raises(ValueError):
+            msg.payload_json()
+
+
+@pytest.mark.parametrize(
+    "mqtt_config",
+    [{mqtt.CONF_BROKER: "mock-broker", mqtt.CONF_SHARE_TEMPLATE_RENDERS: True}],
+)
+async def test_shared_template_renders(hass, mqtt_mock, calls, record_calls):
+    """Test identical templates are rendered once per message when enabled."""
+    await mqtt.async_subscribe(hass, "test-topic", record_calls)
+    await mqtt.async_subscribe(hass, "test-topic", record_calls)
+
+    tpl = template.Template("{{ value_json.val }}", hass)
+    other_tpl = template.Template("{{ value_json.val }}", hass)
+    bad_tpl = template.Template("{{ value_json.val.missing.attr }}", hass)
+
+    async_fire_mqtt_message(hass, "test-topic", '{"val": 1}')
+    await hass.async_block_till_done()
+
+    with patch.object(
+        template.Template,
+        "async_render_with_possible_json_value",
+        autospec=True,
+        side_effect=template.Template.async_render_with_possible_json_value,
+    ) as mock_render:
+        assert calls[0][0].render_template(tpl) == "1"
+        assert calls[1][0].render_template(other_tpl) == "1"
+        assert mock_render.call_count == 1
+
+        # Failed renders are handled by each subscriber
+        assert calls[0][0].render_template(bad_tpl, "error") == "error"
+        assert calls[1][0].render_template(bad_tpl, "other") == "other"
+
+
+async def test_template_renders_not_shared_by_default(
+    hass, mqtt_mock, calls, record_calls
+):
+    """Test templates are rendered for each subscriber by default."""
+    await mqtt.async_subscribe(hass, "test-topic", record_calls)
+    await mqtt.async_subscribe(hass, "test-topic", record_calls)
+
+    tpl = template.Template("{{ value_json.val }}", hass)
+
+    async_fire_mqtt_message(hass, "test-topic", '{"val": 1}')
+    await hass.async_block_till_done()
+
+    with patch.object(
+        template.Template,
+        "async_render_with_possible_json_value",
+        autospec=True,
+        side_effect=template.Template.async_render_with_possible_json_value,
+    ) as mock_render:
+        assert calls[0][0].render_template(tpl) == "1"
+        assert calls[1][0].render_template(tpl) == "1"
+        assert mock_render.call_count == 2
+
+
 async def test_subscribe_topic(hass, mqtt_mock, calls, record_calls):
     """Test the subscription of a topic."""
     unsub = await mqtt.async_subscribe(hass, "test-topic", record_calls)
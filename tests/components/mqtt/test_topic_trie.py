@@ -0,0 +1,89 @@
+"""The tests for the MQTT topic trie."""
+from paho.mqtt.matcher import MQTTMatcher
+import pytest
+
+from homeassistant.components.mqtt.topic_trie import TopicTrie
+
+FILTERS = [
+    "a/b/c",
+    "a/b/#",
+    "a/+/c",
+    "a/+",
+    "+/+/+",
+    "#",
+    "+/b/#",
+    "a/#",
+    "$SYS/#",
+    "$SYS/+",
+    "/a",
+    "+/a",
+    "a//c",
+    "a/+/",
+]
+
+
+@pytest.mark.parametrize(
+    "topic",
+    [
+        "a",
+        "a/b",
+        "a/b/c",
+        "a/b/c/d",
+        "a/x/c",
+        "b/b/b",
+        "$SYS/broker",
+        "$SYS/broker/uptime",
+        "/a",
+        "a//c",
+        "a/b/",
+        "",
+    ],
+)
+def test_match_like_paho(topic):
+    """Test the trie matches the same filters as paho."""
+    trie = TopicTrie()
+    for topic_filter in FILTERS:
+        trie.add(topic_filter, topic_filter)
+
+    expected = []
+    for topic_filter in FILTERS:
+        matcher = MQTTMatcher()
+        matcher[topic_filter] = True
+        if next(matcher.iter_match(topic), False):
+            expected.append(topic_filter)
+
+    assert trie.match(topic) == expected
+
+
+def test_add_remove():
+    """Test items are matched in order they were added until removed."""
+    trie = TopicTrie()
+    first = object()
+    second = object()
+    third = object()
+
+    trie.add("a/b", first)
+    trie.add("a/#", second)
+    trie.add("a/b", third)
+    assert len(trie) == 3
+    assert trie.match("a/b") == [first, second, third]
+
+    trie.remove("a/b", first)
+    assert trie.match("a/b") == [second, third]
+
+    trie.remove("a/#", second)
+    trie.remove("a/b", third)
+    assert len(trie) == 0
+    assert trie.match("a/b") == []
+    # Nodes without items are pruned
+    assert trie._root.children == {}
+
+    with pytest.raises(KeyError):
+        trie.remove("a/b", first)
+
+    trie.add("a/b/c", first)
+    with pytest.raises(KeyError):
+        trie.remove("a/b", first)
+    with pytest.raises(KeyError):
+        trie.remove("a/b/c", second)
+    assert trie.match("a/b/c") == [first]
@@ -1,7 +1,9 @@
 """Test the Profiler config flow."""
 from datetime import timedelta
 import os
-from unittest.mock import patch
+from unittest.mock import Mock, patch
+
+import pytest
 
 from homeassistant import setup
 from homeassistant.components.profiler import (
@@ -15,6 +17,7 @@ from homeassistant.components.profiler import (
     SERVICE_STOP_LOG_OBJECTS,
 )
 from homeassistant.components.profiler.const import DOMAIN
+from homeassistant.helpers.loop_monitor import DATA_LOOP_MONITOR, LoopMonitor
 import homeassistant.util.dt as dt_util
 
 from tests.common import MockConfigEntry, async_fire_time_changed
@@ -147,3 +150,90 @@ async def test_dump_log_object(hass, caplog):
 
     assert await hass.config_entries.async_unload(entry.entry_id)
     await hass.async_block_till_done()
+
+
+async def test_loop_health(hass, hass_ws_client):
+    """Test stalls of the event loop are attributed to integrations."""
+    monitor = hass.data[DATA_LOOP_MONITOR] = LoopMonitor(hass)
+    monitor._loop_thread_id = 1
+    entry = MockConfigEntry(domain=DOMAIN)
+    entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert hass.states.get("sensor.event_loop_stalls").state == "0"
+
+    loop_frame = Mock()
+    with patch("homeassistant.helpers.loop_monitor.time") as mock_time, patch(
+        "homeassistant.helpers.loop_monitor.sys"
+    ) as mock_sys, patch(
+        "homeassistant.helpers.loop_monitor.get_integration_frame",
+        return_value=(
+            Mock(filename="/srv/homeassistant/components/hue/light.py", lineno=42),
+            "hue",
+            "homeassistant/components/",
+        ),
+    ) as mock_integration_frame, patch.object(
+        hass.loop, "call_later"
+    ):
+        mock_sys._current_frames.return_value = {1: loop_frame}
+
+        # The watchdog sleeps until the heartbeat is due to be late
+        monitor._expected = 100.0
+        mock_time.monotonic.return_value = 100.1
+        assert monitor._watchdog_check() == pytest.approx(0.15)
+        assert not mock_sys._current_frames.called
+
+        # A late heartbeat samples the stack of the event loop once
+        mock_time.monotonic.return_value = 100.3
+        monitor._watchdog_check()
+        monitor._watchdog_check()
+        mock_integration_frame.assert_called_once_with(stack_frame=loop_frame)
+        monitor._async_heartbeat()
+
+        # A stall the watchdog did not sample is attributed to core
+        monitor._expected = 200.0
+        mock_time.monotonic.return_value = 200.5
+        monitor._async_heartbeat()
+
+        # A heartbeat within the threshold is not a stall
+        monitor._expected = 300.0
+        mock_time.monotonic.return_value = 300.1
+        monitor._async_heartbeat()
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=11))
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.event_loop_stalls")
+    assert state.state == "2"
+    assert state.attributes["top_offenders"] == {"core": 1, "hue": 1}
+    assert hass.states.get("sensor.event_loop_lag").state == "500.0"
+
+    client = await hass_ws_client(hass)
+    await client.send_json({"id": 5, "type": "profiler/loop_health"})
+    msg = await client.receive_json()
+    assert msg["success"]
+    assert msg["result"]["lag"] == 0.1
+    assert msg["result"]["max_lag"] == 0.5
+    assert msg["result"]["stall_count"] == 2
+    assert msg["result"]["top_offenders"] == [
+        {"integration": "core", "count": 1, "total": 0.5, "max": 0.5},
+        {"integration": "hue", "count": 1, "total": 0.3, "max": 0.3},
+    ]
+    hue_stall, core_stall = msg["result"]["recent_stalls"]
+    assert hue_stall["integration"] == "hue"
+    assert hue_stall["location"] == "homeassistant/components/hue/light.py:42"
+    assert hue_stall["duration"] == 0.3
+    assert core_stall["integration"] == "core"
+    assert core_stall["location"] == ""
+    assert core_stall["duration"] == 0.5
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+    # The monitor keeps running when the profiler is unloaded
+    await client.send_json({"id": 6, "type": "profiler/loop_health"})
+    msg = await client.receive_json()
+    assert msg["success"]
+    assert msg["result"]["stall_count"] == 2
@@ -17,9 +17,13 @@ from homeassistant.const import (
     EVENT_STATE_CHANGED,
 )
 from homeassistant.core import split_entity_id
+from homeassistant.helpers import storage, template
+from homeassistant.helpers.entity_platform import DATA_ENTITY_PLATFORM
 from homeassistant.setup import async_setup_component
 from homeassistant.util import dt as dt_util
 
+from tests.common import MockEntity, MockEntityPlatform
+
 PROMETHEUS_PATH = "homeassistant.components.prometheus"
 
 
@@ -201,6 +205,104 @@ async def test_view(hass, hass_client):
     )
 
 
+async def test_view_runtime_metrics(hass, hass_client):
+    """Test the metrics of the runtime are exported."""
+    await MockEntityPlatform(
+        hass, domain="sensor", platform_name="poller"
+    ).async_add_entities([MockEntity(should_poll=True)])
+    client = await prometheus_client(hass, hass_client)
+    template.Template("{{ 1 + 1 }}", hass).async_render()
+    platform = hass.data[DATA_ENTITY_PLATFORM]["demo"][0]
+    platform.update_durations.observe(0.2)
+    store_metrics = storage.Store(hass, 1, "prometheus_test").metrics
+    store_metrics.write_count = 2
+    store_metrics.total_write_size = 300
+    for _ in range(3):
+        hass.bus.async_fire("prometheus_test")
+
+    resp = await client.get(prometheus.API_ENDPOINT)
+    assert resp.status == 200
+    body = (await resp.text()).split("\n")
+
+    assert 'homeassistant_events_fired_total{event_type="prometheus_test"} 3.0' in body
+    assert 'homeassistant_event_bus_listeners{event_type="state_changed"} 1.0' in body
+    assert "homeassistant_websocket_connections 0.0" in body
+    assert "homeassistant_template_render_duration_seconds_count 1.0" in body
+    assert any(
+        line.startswith('homeassistant_template_cache_misses_total{environment="full"}')
+        for line in body
+    )
+    assert "homeassistant_template_rerender_queue_size 0.0" in body
+    assert 'homeassistant_storage_writes_total{key="prometheus_test"} 2.0' in body
+    assert (
+        'homeassistant_storage_written_bytes_total{key="prometheus_test"} 300.0' in body
+    )
+    assert "homeassistant_template_rerender_latency_seconds_count 0.0" in body
+    assert (
+        "homeassistant_entity_platform_update_duration_seconds_bucket"
+        '{domain="sensor",le="0.25",platform="demo"} 1.0' in body
+    )
+    assert (
+        "homeassistant_entity_platform_update_duration_seconds_bucket"
+        '{domain="sensor",le="0.1",platform="demo"} 0.0' in body
+    )
+    assert (
+        'homeassistant_entity_platform_polling_entities{domain="sensor",platform="poller"} 1.0'
+        in body
+    )
+    assert (
+        'homeassistant_entity_platform_polls_total{domain="sensor",platform="poller"} 0.0'
+        in body
+    )
+
+
+async def test_view_serializes_updated_metrics(hass, hass_client):
+    """Test a scrape only serializes the metrics updated since the previous one."""
+    client = await prometheus_client(hass, hass_client)
+    await client.get(prometheus.API_ENDPOINT)
+
+    serialized = []
+    generate_latest = prometheus.prometheus_client.generate_latest
+
+    def _generate_latest(*args):
+        if args and isinstance(args[0], prometheus._SingleMetric):
+            serialized.append(args[0])
+        return generate_latest(*args)
+
+    with mock.patch.object(
+        prometheus.prometheus_client, "generate_latest", _generate_latest
+    ):
+        resp = await client.get(prometheus.API_ENDPOINT)
+        body = await resp.text()
+        assert serialized == []
+        assert "temperature_c{" in body
+
+        hass.states.async_set(
+            "sensor.new_temperature",
+            20,
+            {"unit_of_measurement": "°C", "device_class": "temperature"},
+        )
+        await hass.async_block_till_done()
+        resp = await client.get(prometheus.API_ENDPOINT)
+        body = await resp.text()
+
+    assert 0 < len(serialized) < 10
+    assert 'temperature_c{domain="sensor",entity="sensor.new_temperature"' in body
+    assert 'entity="sensor.outside_temperature"' in body
+
+
+async def test_view_without_runtime_metrics(hass, hass_client):
+    """Test the metrics of the runtime can be disabled."""
+    assert await async_setup_component(
+        hass, prometheus.DOMAIN, {prometheus.DOMAIN: {"internal_metrics": False}}
+    )
+    client = await hass_client()
+
+    resp = await client.get(prometheus.API_ENDPOINT)
+    assert resp.status == 200
+    assert "homeassistant_" not in await resp.text()
+
+
 @pytest.fixture(name="mock_client")
 def mock_client_fixture():
     """Mock the prometheus client."""
@@ -9,12 +9,18 @@ from homeassistant.components.recorder import (
     CONFIG_SCHEMA,
     DOMAIN,
     Recorder,
+    bulk,
     run_information,
     run_information_from_instance,
     run_information_with_session,
 )
 from homeassistant.components.recorder.const import DATA_INSTANCE
-from homeassistant.components.recorder.models import Events, RecorderRuns, States
+from homeassistant.components.recorder.models import (
+    Events,
+    RecorderRuns,
+    StateAttributes,
+    States,
+)
 from homeassistant.components.recorder.util import session_scope
 from homeassistant.const import MATCH_ALL, STATE_LOCKED, STATE_UNLOCKED
 from homeassistant.core import Context, callback
@@ -45,6 +51,7 @@ def test_saving_state(hass, hass_recorder):
         state = db_states[0].to_native()
 
     assert state == _state_empty_context(hass, entity_id)
+    assert hass.data[DATA_INSTANCE].commit_durations.count > 0
 
 
 def test_saving_state_with_exception(hass, hass_recorder, caplog):
@@ -432,6 +439,86 @@ def test_saving_sets_old_state(hass_recorder):
         assert states[3].old_state_id == states[1].state_id
 
 
+def test_saving_deduplicates_attributes(hass_recorder):
+    """Test states with the same attributes share one attributes row."""
+    hass = hass_recorder()
+    attributes = {"test_attr": 5, "test_attr_10": "nice"}
+
+    hass.states.set("test.one", "on", attributes)
+    hass.states.set("test.two", "on", attributes)
+    wait_recording_done(hass)
+    hass.states.set("test.one", "off", attributes)
+    hass.states.set("test.two", "off", {"test_attr": 6})
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        states = list(session.query(States))
+        assert len(states) == 4
+        assert len({state.attributes_id for state in states[:3]}) == 1
+        assert states[3].attributes_id != states[0].attributes_id
+        assert all(state.attributes is None for state in states)
+        assert states[2].to_native().attributes == attributes
+        assert states[3].to_native().attributes == {"test_attr": 6}
+
+        assert session.query(StateAttributes).count() == 2
+
+
+def test_saving_with_bulk_insert(hass_recorder):
+    """Test states and events are saved with the bulk insert write path."""
+    hass = hass_recorder({"bulk_insert": True})
+    attributes = {"test_attr": 5, "test_attr_10": "nice"}
+
+    hass.states.set("test.one", "on", attributes)
+    hass.states.set("test.two", "on", attributes)
+    hass.bus.fire("test_event", {"some_data": 1})
+    wait_recording_done(hass)
+    hass.states.set("test.one", "off", attributes)
+    hass.states.remove("test.two")
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        events = list(session.query(Events).filter(Events.event_type == "test_event"))
+        assert len(events) == 1
+        assert events[0].to_native().data == {"some_data": 1}
+
+        states = list(session.query(States).order_by(States.state_id))
+        assert [(state.entity_id, state.state) for state in states] == [
+            ("test.one", "on"),
+            ("test.two", "on"),
+            ("test.one", "off"),
+            ("test.two", None),
+        ]
+        assert states[0].old_state_id is None
+        assert states[2].old_state_id == states[0].state_id
+        assert states[3].old_state_id == states[1].state_id
+        assert all(state.event.event_type == "state_changed" for state in states)
+        assert len({state.attributes_id for state in states[:3]}) == 1
+        assert states[2].to_native().attributes == attributes
+
+        assert session.query(StateAttributes).count() == 2
+
+
+def test_saving_with_bulk_insert_continues_ids(hass_recorder):
+    """Test the bulk insert write path continues after existing rows."""
+    hass = hass_recorder()
+    hass.states.set("test.one", "on")
+    wait_recording_done(hass)
+
+    instance = hass.data[DATA_INSTANCE]
+    instance._bulk_inserter = bulk.BulkInserter(instance)
+    hass.states.set("test.one", "off")
+    hass.states.set("test.two", "on", {"new": "attribute"})
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        states = list(session.query(States).order_by(States.state_id))
+        assert [state.state_id for state in states] == [1, 2, 3]
+        assert all(state.event.event_type == "state_changed" for state in states)
+        assert [state.to_native().state for state in states] == ["on", "off", "on"]
+        assert states[2].to_native().attributes == {"new": "attribute"}
+        assert session.query(StateAttributes).count() == 2
+
+
 def test_saving_state_with_serializable_data(hass_recorder, caplog):
     """Test saving data that cannot be serialized does not crash."""
     hass = hass_recorder()
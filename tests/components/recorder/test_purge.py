@@ -4,14 +4,28 @@ import json
 from unittest.mock import patch
 
 from homeassistant.components import recorder
-from homeassistant.components.recorder.const import DATA_INSTANCE
-from homeassistant.components.recorder.models import Events, RecorderRuns, States
-from homeassistant.components.recorder.purge import purge_old_data
+from homeassistant.components.recorder.const import (
+    DATA_INSTANCE,
+    EVENT_RECORDER_PURGE_PROGRESS,
+)
+from homeassistant.components.recorder.models import (
+    Events,
+    RecorderRuns,
+    StateAttributes,
+    States,
+)
+from homeassistant.components.recorder.purge import (
+    PurgeProgress,
+    purge_old_data,
+    purge_old_data_chunk,
+)
 from homeassistant.components.recorder.util import session_scope
 from homeassistant.util import dt as dt_util
 
 from .common import wait_recording_done
 
+from tests.common import async_capture_events, async_init_recorder_component
+
 
 def test_purge_old_states(hass, hass_recorder):
     """Test deleting old states."""
@@ -37,6 +51,41 @@ def test_purge_old_states(hass, hass_recorder):
         assert states.count() == 2
 
 
+def test_purge_old_state_attributes(hass, hass_recorder):
+    """Test deleting state attributes no state references anymore."""
+    hass = hass_recorder()
+    now = dt_util.utcnow()
+    eleven_days_ago = now - timedelta(days=11)
+
+    with recorder.session_scope(hass=hass) as session:
+        for idx, timestamp in enumerate((eleven_days_ago, now)):
+            state_attributes = StateAttributes.from_shared_attrs(
+                json.dumps({"idx": idx})
+            )
+            session.add(
+                States(
+                    entity_id="test.recorder2",
+                    domain="sensor",
+                    state="on",
+                    state_attributes=state_attributes,
+                    last_changed=timestamp,
+                    last_updated=timestamp,
+                    created=timestamp,
+                )
+            )
+        session.add(StateAttributes.from_shared_attrs(json.dumps({"idx": 2})))
+
+    with session_scope(hass=hass) as session:
+        state_attributes = session.query(StateAttributes)
+        assert state_attributes.count() == 3
+
+        while not purge_old_data(hass.data[DATA_INSTANCE], 4, repack=False):
+            pass
+
+        assert session.query(States).count() == 1
+        assert [attrs.shared_attrs for attrs in state_attributes] == ['{"idx": 1}']
+
+
 def test_purge_old_events(hass, hass_recorder):
     """Test deleting old events."""
     hass = hass_recorder()
@@ -138,11 +187,134 @@ def test_purge_method(hass, hass_recorder):
             hass.data[DATA_INSTANCE].block_till_done()
             wait_recording_done(hass)
             assert (
-                mock_logger.debug.mock_calls[5][1][0]
+                mock_logger.debug.mock_calls[7][1][0]
                 == "Vacuuming SQL DB to free space"
             )
 
 
+def test_purge_old_data_chunk(hass, hass_recorder):
+    """Test deleting old states and events in chunks."""
+    hass = hass_recorder()
+    _add_test_events(hass)
+    _add_test_states(hass)
+
+    progress = PurgeProgress(
+        purge_before=dt_util.utcnow() - timedelta(days=4),
+        repack=False,
+        chunk_size=1,
+    )
+
+    calls = 1
+    while not purge_old_data_chunk(hass.data[DATA_INSTANCE], progress):
+        calls += 1
+        assert not progress.finished
+        assert progress.percentage < 100
+
+    # One chunk per row and a last call to clean up
+    assert calls == 9
+    assert progress.finished
+    assert progress.percentage == 100
+    assert progress.total == {"states": 4, "events": 4, "statistics_short_term": 0}
+    assert progress.deleted == {"states": 4, "events": 4}
+
+    with session_scope(hass=hass) as session:
+        states = session.query(States)
+        assert states.count() == 2
+        assert {state.state for state in states} == {"dontpurgeme"}
+
+        events = session.query(Events).filter(Events.event_type.like("EVENT_TEST%"))
+        assert events.count() == 2
+
+
+def test_purge_old_data_chunk_unlinks_old_states(hass, hass_recorder):
+    """Test newer states do not reference purged states."""
+    hass = hass_recorder()
+    hass.states.set("test.one", "on")
+    wait_recording_done(hass)
+    hass.states.set("test.one", "off")
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        old_state, new_state = session.query(States).order_by(States.state_id)
+        assert new_state.old_state_id == old_state.state_id
+        old_state.last_updated = dt_util.utcnow() - timedelta(days=5)
+
+    progress = PurgeProgress(
+        purge_before=dt_util.utcnow() - timedelta(days=4),
+        repack=False,
+        chunk_size=100,
+    )
+    while not purge_old_data_chunk(hass.data[DATA_INSTANCE], progress):
+        pass
+
+    with session_scope(hass=hass) as session:
+        states = list(session.query(States))
+        assert len(states) == 1
+        assert states[0].state == "off"
+        assert states[0].old_state_id is None
+
+
+def test_purge_method_chunked(hass, hass_recorder, hass_storage):
+    """Test the purge service in chunked mode reports its progress."""
+    hass = hass_recorder()
+    _add_test_events(hass)
+    _add_test_states(hass)
+
+    progress_events = []
+    hass.bus.listen(EVENT_RECORDER_PURGE_PROGRESS, progress_events.append)
+
+    hass.services.call("recorder", "purge", {"keep_days": 4, "chunk_size": 2})
+    hass.block_till_done()
+    for _ in range(10):
+        hass.data[DATA_INSTANCE].block_till_done()
+        hass.block_till_done()
+        if progress_events and progress_events[-1].data["finished"]:
+            break
+
+    assert len(progress_events) == 5
+    assert [event.data["deleted"] for event in progress_events[:4]] == [
+        {"states": 2},
+        {"states": 4},
+        {"states": 4, "events": 2},
+        {"states": 4, "events": 4},
+    ]
+    assert not any(event.data["finished"] for event in progress_events[:4])
+    assert progress_events[1].data["percentage"] == 50
+    assert progress_events[4].data["finished"]
+    assert progress_events[4].data["percentage"] == 100
+    assert "recorder.purge" not in hass_storage
+
+    with session_scope(hass=hass) as session:
+        assert session.query(States).count() == 2
+
+
+async def test_purge_resumes_after_restart(hass, hass_storage):
+    """Test an interrupted chunked purge is resumed on startup."""
+    progress = PurgeProgress(
+        purge_before=dt_util.utcnow() - timedelta(days=4),
+        repack=False,
+        chunk_size=2,
+        total={"states": 10, "events": 10, "statistics_short_term": 0},
+        deleted={"states": 6},
+    )
+    hass_storage["recorder.purge"] = {
+        "version": 1,
+        "key": "recorder.purge",
+        "data": progress.as_dict(),
+    }
+    progress_events = async_capture_events(hass, EVENT_RECORDER_PURGE_PROGRESS)
+
+    await async_init_recorder_component(hass)
+    await hass.async_add_executor_job(hass.data[DATA_INSTANCE].block_till_done)
+    await hass.async_block_till_done()
+
+    assert len(progress_events) == 1
+    assert progress_events[0].data["finished"]
+    assert progress_events[0].data["deleted"] == {"states": 6}
+    assert progress_events[0].data["purge_before"] == progress.as_dict()["purge_before"]
+    assert "recorder.purge" not in hass_storage
+
+
 def _add_test_states(hass):
     """Add multiple states to the db for testing."""
     now = datetime.now()
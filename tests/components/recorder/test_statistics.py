@@ -0,0 +1,258 @@
+"""The tests for the recorder statistics rollups."""
+# pylint: disable=protected-access
+from datetime import datetime, timedelta
+
+import pytest
+
+from homeassistant.components.recorder.const import DATA_INSTANCE
+from homeassistant.components.recorder.models import (
+    RecorderRuns,
+    States,
+    Statistics,
+    StatisticsShortTerm,
+)
+from homeassistant.components.recorder.statistics import (
+    PERIOD_5MINUTE,
+    PERIOD_HOUR,
+    StatisticsCompiler,
+    floor_time,
+    restore_open_periods,
+    state_as_float,
+    statistics_during_period,
+)
+from homeassistant.components.recorder.util import session_scope
+from homeassistant.const import EVENT_TIME_CHANGED
+from homeassistant.core import Event
+from homeassistant.util import dt as dt_util
+
+from .common import wait_recording_done
+
+START = datetime(2021, 2, 1, 10, 0, 0, tzinfo=dt_util.UTC)
+
+
+@pytest.mark.parametrize(
+    "state,expected",
+    [("1.5", 1.5), ("-3", -3.0), ("on", None), ("nan", None), (None, None)],
+)
+def test_state_as_float(state, expected):
+    """Test numeric states are detected."""
+    assert state_as_float(state) == expected
+
+
+def test_floor_time():
+    """Test aligning times to the start of a period."""
+    time = datetime(2021, 2, 1, 10, 7, 31, 5, tzinfo=dt_util.UTC)
+    assert floor_time(time, timedelta(minutes=5)) == START + timedelta(minutes=5)
+    assert floor_time(time, timedelta(hours=1)) == START
+
+
+def test_compiler_time_weighted_short_term():
+    """Test the 5-minute rollup is weighted by the time a value was held."""
+    compiler = StatisticsCompiler()
+    assert compiler.compile(START) == []
+
+    compiler.record_state("sensor.temp", "10", START)
+    compiler.record_state("sensor.temp", "20", START + timedelta(minutes=4))
+    compiler.record_state("binary_sensor.door", "on", START)
+
+    assert compiler.compile(START + timedelta(minutes=4, seconds=59)) == []
+
+    rows = compiler.compile(START + timedelta(minutes=5))
+    assert len(rows) == 1
+    row = rows[0]
+    assert isinstance(row, StatisticsShortTerm)
+    assert row.entity_id == "sensor.temp"
+    assert row.start == START
+    assert row.mean == pytest.approx(12)
+    assert row.min == 10
+    assert row.max == 20
+
+    # The value is carried into the next period
+    rows = compiler.compile(START + timedelta(minutes=10))
+    assert len(rows) == 1
+    assert rows[0].start == START + timedelta(minutes=5)
+    assert rows[0].mean == rows[0].min == rows[0].max == 20
+
+
+def test_compiler_non_numeric_state_ends_statistics():
+    """Test an entity is dropped once it is no longer numeric."""
+    compiler = StatisticsCompiler()
+    compiler.compile(START)
+
+    compiler.record_state("sensor.temp", "10", START)
+    compiler.record_state("sensor.temp", "unavailable", START + timedelta(minutes=1))
+
+    rows = compiler.compile(START + timedelta(minutes=5))
+    assert len(rows) == 1
+    assert rows[0].mean == rows[0].min == rows[0].max == 10
+
+    assert compiler.compile(START + timedelta(minutes=10)) == []
+
+
+def test_compiler_hourly_rollup():
+    """Test the hourly rollup is compiled from the 5-minute rollups."""
+    compiler = StatisticsCompiler()
+    compiler.compile(START)
+
+    compiler.record_state("sensor.temp", "10", START)
+
+    rows = []
+    for minutes in range(5, 35, 5):
+        rows.extend(compiler.compile(START + timedelta(minutes=minutes)))
+
+    compiler.record_state("sensor.temp", "40", START + timedelta(minutes=30))
+    compiler.record_state("sensor.temp", "5", START + timedelta(minutes=31))
+    compiler.record_state("sensor.temp", "10", START + timedelta(minutes=32))
+
+    for minutes in range(35, 65, 5):
+        rows.extend(compiler.compile(START + timedelta(minutes=minutes)))
+
+    assert {row.entity_id for row in rows} == {"sensor.temp"}
+    short_term = [row for row in rows if isinstance(row, StatisticsShortTerm)]
+    long_term = [row for row in rows if isinstance(row, Statistics)]
+    assert len(short_term) == 12
+    assert len(long_term) == 1
+
+    row = long_term[0]
+    assert row.start == START
+    assert row.mean == pytest.approx((58 * 10 + 40 + 5) / 60)
+    assert row.min == 5
+    assert row.max == 40
+
+
+def test_compiler_clock_jump():
+    """Test a jump of the clock does not emit rows for the whole gap."""
+    compiler = StatisticsCompiler()
+    compiler.compile(START)
+    compiler.record_state("sensor.temp", "10", START)
+
+    assert compiler.compile(START + timedelta(days=2)) == []
+    assert compiler.compile(START + timedelta(days=2, minutes=5)) == []
+
+
+def test_compile_statistics_in_recorder(hass_recorder):
+    """Test the recorder stores the rollups when a period has ended."""
+    hass = hass_recorder()
+    instance = hass.data[DATA_INSTANCE]
+
+    hass.states.set("sensor.temp", "10")
+    hass.states.set("sensor.text", "hello")
+    wait_recording_done(hass)
+
+    now = dt_util.utcnow()
+    later = floor_time(now, timedelta(minutes=5)) + timedelta(minutes=10)
+    instance.event_listener(Event(EVENT_TIME_CHANGED, time_fired=later))
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        rows = list(session.query(StatisticsShortTerm))
+        assert {row.entity_id for row in rows} == {"sensor.temp"}
+        for row in rows:
+            assert row.min == row.max == 10
+            assert row.mean == pytest.approx(10)
+
+    stats = statistics_during_period(hass, now - timedelta(hours=1), period="5minute")
+    assert list(stats) == ["sensor.temp"]
+    assert stats["sensor.temp"][0]["mean"] == pytest.approx(10)
+
+
+def test_restore_open_periods(hass_recorder):
+    """Test the periods open at the last stop are compiled from the states."""
+    hass = hass_recorder()
+    now = START + timedelta(hours=1, minutes=12)
+
+    with session_scope(hass=hass) as session:
+        # The run recording when the replayed hours started
+        session.add(
+            RecorderRuns(
+                start=START - timedelta(days=2),
+                end=now,
+                created=START - timedelta(days=2),
+            )
+        )
+        for entity_id, state, last_updated in (
+            # Recorded before that run started
+            ("sensor.old", "5", START - timedelta(days=3)),
+            ("sensor.temp", "10", START - timedelta(days=1)),
+            ("sensor.temp", "20", START + timedelta(minutes=30)),
+        ):
+            session.add(
+                States(
+                    entity_id=entity_id,
+                    domain="sensor",
+                    state=state,
+                    last_changed=last_updated,
+                    last_updated=last_updated,
+                )
+            )
+        # Stored before the recorder stopped
+        session.add(
+            StatisticsShortTerm(
+                entity_id="sensor.temp", start=START, mean=10, min=10, max=10
+            )
+        )
+
+    compiler = StatisticsCompiler()
+    with session_scope(hass=hass) as session:
+        rows = restore_open_periods(session, compiler, now)
+
+    short_term = [row for row in rows if isinstance(row, StatisticsShortTerm)]
+    long_term = [row for row in rows if isinstance(row, Statistics)]
+    assert [row.start for row in short_term] == [
+        START + timedelta(minutes=minutes) for minutes in range(5, 70, 5)
+    ]
+    assert len(long_term) == 1
+    assert long_term[0].start == START
+    assert long_term[0].mean == pytest.approx(15)
+    assert long_term[0].min == 10
+    assert long_term[0].max == 20
+
+    # The open period continues with the value held at the stop
+    rows = compiler.compile(now + timedelta(minutes=5))
+    assert len(rows) == 1
+    assert rows[0].start == START + timedelta(hours=1, minutes=10)
+    assert rows[0].mean == 20
+
+
+def test_statistics_during_period(hass_recorder):
+    """Test fetching rollups for a period."""
+    hass = hass_recorder()
+
+    with session_scope(hass=hass) as session:
+        for hour in range(3):
+            for entity_id in ("sensor.one", "sensor.two"):
+                session.add(
+                    Statistics(
+                        entity_id=entity_id,
+                        start=START + timedelta(hours=hour),
+                        mean=hour,
+                        min=hour - 1,
+                        max=hour + 1,
+                    )
+                )
+
+    stats = statistics_during_period(
+        hass,
+        START + timedelta(hours=1),
+        START + timedelta(hours=3),
+        ["sensor.two", "sensor.missing"],
+        PERIOD_HOUR,
+    )
+    assert stats == {
+        "sensor.two": [
+            {
+                "start": (START + timedelta(hours=1)).isoformat(),
+                "mean": 1,
+                "min": 0,
+                "max": 2,
+            },
+            {
+                "start": (START + timedelta(hours=2)).isoformat(),
+                "mean": 2,
+                "min": 1,
+                "max": 3,
+            },
+        ]
+    }
+
+    assert statistics_during_period(hass, START, period=PERIOD_5MINUTE) == {}
@@ -10,6 +10,7 @@ import pytest
 from homeassistant import config as hass_config
 from homeassistant.components import recorder
 from homeassistant.components.statistics.sensor import DOMAIN, StatisticsSensor
+from homeassistant.components.statistics.window import LongWindow
 from homeassistant.const import (
     ATTR_UNIT_OF_MEASUREMENT,
     SERVICE_RELOAD,
@@ -234,6 +235,82 @@ class TestStatisticsSensor(unittest.TestCase):
         assert 6 == state.attributes.get("min_value")
         assert 14 == state.attributes.get("max_value")
 
+    def test_long_window(self):
+        """Test the statistics of a long window."""
+        now = dt_util.utcnow()
+        mock_data = {
+            "return_time": datetime(now.year + 1, 8, 2, 12, 23, tzinfo=dt_util.UTC)
+        }
+
+        def mock_now():
+            return mock_data["return_time"]
+
+        with patch(
+            "homeassistant.components.statistics.sensor.dt_util.utcnow", new=mock_now
+        ):
+            assert setup_component(
+                self.hass,
+                "sensor",
+                {
+                    "sensor": {
+                        "platform": "statistics",
+                        "name": "test",
+                        "entity_id": "sensor.test_monitored",
+                        "max_age": {"minutes": 3},
+                        "long_window": True,
+                    }
+                },
+            )
+
+            self.hass.block_till_done()
+            self.hass.start()
+            self.hass.block_till_done()
+
+            for value in self.values:
+                self.hass.states.set(
+                    "sensor.test_monitored",
+                    value,
+                    {ATTR_UNIT_OF_MEASUREMENT: TEMP_CELSIUS},
+                )
+                self.hass.block_till_done()
+                # insert the next value one minute later
+                mock_data["return_time"] += timedelta(minutes=1)
+
+            state = self.hass.states.get("sensor.test")
+
+        values = self.values[-4:]
+        assert float(state.state) == pytest.approx(statistics.mean(values), abs=0.01)
+        assert 4 == state.attributes.get("count")
+        assert 6 == state.attributes.get("min_value")
+        assert 14 == state.attributes.get("max_value")
+        assert round(sum(values), 2) == state.attributes.get("total")
+        assert round(statistics.variance(values), 2) == state.attributes.get("variance")
+        assert round(statistics.stdev(values), 2) == state.attributes.get(
+            "standard_deviation"
+        )
+        assert state.attributes.get("median") == pytest.approx(
+            statistics.median(values), rel=0.02
+        )
+        assert round(values[-1] - values[0], 2) == state.attributes.get("change")
+
+    def test_long_window_requires_max_age(self):
+        """Test a long window can't be configured without a maximum age."""
+        assert setup_component(
+            self.hass,
+            "sensor",
+            {
+                "sensor": {
+                    "platform": "statistics",
+                    "name": "test",
+                    "entity_id": "sensor.test_monitored",
+                    "long_window": True,
+                }
+            },
+        )
+        self.hass.block_till_done()
+
+        assert self.hass.states.get("sensor.test") is None
+
     def test_max_age_without_sensor_change(self):
         """Test value deprecation."""
         now = dt_util.utcnow()
@@ -450,6 +527,106 @@ class TestStatisticsSensor(unittest.TestCase):
             hours=1
         )
 
+    def test_initialize_long_window_from_database(self):
+        """Test seeding a long window from the database."""
+        now = dt_util.utcnow()
+        start = datetime(now.year + 1, 8, 2, 12, 23, 42, tzinfo=dt_util.UTC)
+        mock_data = {"return_time": start}
+
+        def mock_now():
+            return mock_data["return_time"]
+
+        # enable the recorder
+        init_recorder_component(self.hass)
+        self.hass.block_till_done()
+        self.hass.data[recorder.DATA_INSTANCE].block_till_done()
+
+        values = self.values * 3
+        with patch(
+            "homeassistant.components.statistics.sensor.dt_util.utcnow", new=mock_now
+        ):
+            # store some values, starting with one outside of the window
+            for value in [100] + values:
+                self.hass.states.set(
+                    "sensor.test_monitored",
+                    value,
+                    {ATTR_UNIT_OF_MEASUREMENT: TEMP_CELSIUS},
+                )
+                self.hass.block_till_done()
+                # insert the next value 1 minute later
+                mock_data["return_time"] += timedelta(minutes=1)
+
+            # wait for the recorder to really store the data
+            wait_recording_done(self.hass)
+            assert setup_component(
+                self.hass,
+                "sensor",
+                {
+                    "sensor": {
+                        "platform": "statistics",
+                        "name": "test",
+                        "entity_id": "sensor.test_monitored",
+                        "max_age": {"minutes": len(values)},
+                        "long_window": True,
+                    }
+                },
+            )
+            self.hass.block_till_done()
+            self.hass.start()
+            self.hass.block_till_done()
+
+            state = self.hass.states.get("sensor.test")
+
+        assert len(values) == state.attributes.get("count")
+        assert self.mean == float(state.state)
+        assert self.min == state.attributes.get("min_value")
+        assert self.max == state.attributes.get("max_value")
+        assert round(statistics.variance(values), 2) == state.attributes.get("variance")
+        assert start + timedelta(minutes=1) == state.attributes.get("min_age")
+        assert mock_data["return_time"] == state.attributes.get("max_age") + timedelta(
+            minutes=1
+        )
+
+
+def test_long_window_aggregates():
+    """Test the aggregates of a long window when buckets expire."""
+    start = datetime(2021, 2, 1, tzinfo=dt_util.UTC)
+    window = LongWindow(timedelta(minutes=60), buckets=6)
+    values = [5, 1, 3, 8, 2, 7, 4, 6, 9, 0.5, -2, 10]
+
+    for idx, value in enumerate(values):
+        window.add(value, start + timedelta(minutes=idx * 5))
+
+    assert window.count == len(values)
+    assert window.min == -2
+    assert window.max == 10
+    assert window.mean == pytest.approx(statistics.mean(values))
+    assert window.variance == pytest.approx(statistics.variance(values))
+    assert window.median == pytest.approx(statistics.median(values), rel=0.02)
+
+    # Buckets of 10 minutes expire once all their values are too old
+    now = start + timedelta(minutes=85)
+    window.purge(now)
+    assert window.count == len(values) - 4
+    assert window.min == -2
+    assert window.max == 10
+    assert window.oldest == (start + timedelta(minutes=20), 2)
+    assert window.mean == pytest.approx(statistics.mean(values[4:]))
+    assert window.next_expiry == start + timedelta(minutes=85)
+
+    now = start + timedelta(minutes=115)
+    window.purge(now)
+    assert window.count == 2
+    assert window.min == -2
+    assert window.max == 10
+    assert window.variance == pytest.approx(statistics.variance(values[-2:]))
+
+    window.purge(now + timedelta(hours=1))
+    assert window.count == 0
+    assert window.min is None
+    assert window.median is None
+    assert window.next_expiry is None
+
 
 async def test_reload(hass):
     """Verify we can reload filter sensors."""
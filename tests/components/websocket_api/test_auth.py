@@ -119,6 +119,24 @@ async def test_auth_active_with_token(
     auth_msg = await no_auth_websocket_client.receive_json()
 
     assert auth_msg["type"] == TYPE_AUTH_OK
+    assert "supported_features" not in auth_msg
+
+
+async def test_auth_supported_features(
+    hass, no_auth_websocket_client, hass_access_token
+):
+    """Test the supported features are confirmed when authenticating."""
+    await no_auth_websocket_client.send_json(
+        {
+            "type": TYPE_AUTH,
+            "access_token": hass_access_token,
+            "supported_features": {"coalesce_messages": True, "unknown": True},
+        }
+    )
+    auth_msg = await no_auth_websocket_client.receive_json()
+
+    assert auth_msg["type"] == TYPE_AUTH_OK
+    assert auth_msg["supported_features"] == {"coalesce_messages": True}
 
 
 async def test_auth_active_user_inactive(hass, aiohttp_client, hass_access_token):
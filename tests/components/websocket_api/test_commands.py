@@ -1,4 +1,6 @@
 """Tests for WebSocket API commands."""
+from unittest.mock import patch
+
 from async_timeout import timeout
 import voluptuous as vol
 
@@ -11,7 +13,7 @@ from homeassistant.components.websocket_api.auth import (
 from homeassistant.components.websocket_api.const import URL
 from homeassistant.core import Context, callback
 from homeassistant.exceptions import HomeAssistantError
-from homeassistant.helpers import entity
+from homeassistant.helpers import entity, json as json_helper
 from homeassistant.helpers.typing import HomeAssistantType
 from homeassistant.loader import async_get_integration
 from homeassistant.setup import async_setup_component
@@ -301,6 +303,139 @@ async def test_subscribe_unsubscribe_events(hass, websocket_client):
     assert sum(hass.bus.async_listeners().values()) == init_count
 
 
+async def test_subscribe_entities(hass, websocket_client):
+    """Test subscribe entities command."""
+    hass.states.async_set("light.permitted", "off", {"color": "red"})
+    state = hass.states.get("light.permitted")
+
+    await websocket_client.send_json({"id": 7, "type": "subscribe_entities"})
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert msg["type"] == const.TYPE_RESULT
+    assert msg["success"]
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert msg["type"] == "event"
+    assert msg["event"] == {
+        "a": {
+            "light.permitted": {
+                "a": {"color": "red"},
+                "c": state.context.id,
+                "lc": state.last_changed.timestamp(),
+                "s": "off",
+            }
+        }
+    }
+
+    hass.states.async_set("light.permitted", "on", {"effect": "help"})
+    state = hass.states.get("light.permitted")
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert msg["type"] == "event"
+    assert msg["event"] == {
+        "c": {
+            "light.permitted": {
+                "+": {
+                    "a": {"effect": "help"},
+                    "c": state.context.id,
+                    "lc": state.last_changed.timestamp(),
+                    "s": "on",
+                },
+                "-": {"a": ["color"]},
+            }
+        }
+    }
+
+    hass.states.async_set("light.permitted", "on", {"effect": "help", "brightness": 5})
+    state = hass.states.get("light.permitted")
+
+    msg = await websocket_client.receive_json()
+    assert msg["event"] == {
+        "c": {
+            "light.permitted": {
+                "+": {
+                    "a": {"brightness": 5},
+                    "c": state.context.id,
+                    "lu": state.last_updated.timestamp(),
+                }
+            }
+        }
+    }
+
+    hass.states.async_remove("light.permitted")
+
+    msg = await websocket_client.receive_json()
+    assert msg["event"] == {"r": ["light.permitted"]}
+
+
+async def test_subscribe_entities_filtered(hass, websocket_client, hass_admin_user):
+    """Test subscribe entities command with filters and permissions."""
+    hass_admin_user.groups = []
+    hass_admin_user.mock_policy(
+        {
+            "entities": {
+                "entity_ids": {
+                    "switch.allowed": True,
+                    "light.allowed": True,
+                    "light.other": True,
+                }
+            }
+        }
+    )
+
+    hass.states.async_set("light.allowed", "on")
+    hass.states.async_set("light.other", "on")
+    hass.states.async_set("switch.allowed", "on")
+    hass.states.async_set("switch.not_allowed", "on")
+    hass.states.async_set("sensor.ignored", "1")
+
+    with patch.object(
+        hass.bus, "async_listen_entities", wraps=hass.bus.async_listen_entities
+    ) as mock_listen_entities:
+        await websocket_client.send_json(
+            {
+                "id": 7,
+                "type": "subscribe_entities",
+                "entity_ids": ["light.allowed"],
+                "domains": ["switch"],
+            }
+        )
+
+        msg = await websocket_client.receive_json()
+        assert msg["success"]
+
+    # The listener is only called for the state changes of the filtered entities
+    assert mock_listen_entities.call_count == 1
+    assert mock_listen_entities.mock_calls[0][1][2:] == (
+        {"light.allowed"},
+        {"switch"},
+    )
+
+    msg = await websocket_client.receive_json()
+    assert set(msg["event"]["a"]) == {"light.allowed", "switch.allowed"}
+
+    hass.states.async_set("light.other", "off")
+    hass.states.async_set("switch.not_allowed", "off")
+    hass.states.async_set("sensor.ignored", "2")
+    hass.states.async_set("switch.allowed", "off")
+
+    msg = await websocket_client.receive_json()
+    assert msg["event"] == {
+        "c": {
+            "switch.allowed": {
+                "+": {
+                    "c": hass.states.get("switch.allowed").context.id,
+                    "lc": hass.states.get("switch.allowed").last_changed.timestamp(),
+                    "s": "off",
+                }
+            }
+        }
+    }
+
+
 async def test_get_states(hass, websocket_client):
     """Test get_states command."""
     hass.states.async_set("greeting.hello", "world")
@@ -434,15 +569,20 @@ async def test_states_filters_visible(hass, hass_admin_user, websocket_client):
     assert msg["result"][0]["entity_id"] == "test.entity"
 
 
-async def test_get_states_not_allows_nan(hass, websocket_client):
-    """Test get_states command not allows NaN floats."""
+async def test_get_states_nan_as_null(hass, websocket_client):
+    """Test get_states command returns NaN floats as null with orjson."""
     hass.states.async_set("greeting.hello", "world", {"hello": float("NaN")})
 
     await websocket_client.send_json({"id": 5, "type": "get_states"})
 
     msg = await websocket_client.receive_json()
-    assert not msg["success"]
-    assert msg["error"]["code"] == const.ERR_UNKNOWN_ERROR
+    if not json_helper.HAS_ORJSON:
+        assert not msg["success"]
+        assert msg["error"]["code"] == const.ERR_UNKNOWN_ERROR
+        return
+
+    assert msg["success"]
+    assert msg["result"][0]["attributes"] == {"hello": None}
 
 
 async def test_subscribe_unsubscribe_events_whitelist(
@@ -977,3 +1117,35 @@ async def test_test_condition(hass, websocket_client):
     assert msg["type"] == const.TYPE_RESULT
     assert msg["success"]
     assert msg["result"]["result"] is True
+
+
+async def test_startup_timeline(hass, websocket_client, hass_admin_user):
+    """Test fetching the startup timeline."""
+    await websocket_client.send_json({"id": 5, "type": "startup_timeline"})
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 5
+    assert msg["type"] == const.TYPE_RESULT
+    assert msg["success"]
+    assert {"websocket_api", "http"} <= {
+        event["domain"] for event in msg["result"]["events"]
+    }
+    assert msg["result"]["critical_path"]
+
+    await websocket_client.send_json(
+        {"id": 6, "type": "startup_timeline", "format": "chrome_trace"}
+    )
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 6
+    assert msg["success"]
+    assert msg["result"]["traceEvents"]
+
+    hass_admin_user.groups = []
+
+    await websocket_client.send_json({"id": 7, "type": "startup_timeline"})
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert not msg["success"]
+    assert msg["error"]["code"] == const.ERR_UNAUTHORIZED
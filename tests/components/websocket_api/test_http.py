@@ -80,3 +80,74 @@ async def test_non_json_message(hass, websocket_client, caplog):
         f"Unable to serialize to JSON. Bad data found at $.result[0](state: test_domain.entity).attributes.bad={bad_data}(<class 'object'>"
         in caplog.text
     )
+
+
+async def test_coalesce_messages(hass, no_auth_websocket_client, hass_access_token):
+    """Test messages queued together are sent in a single frame."""
+    await no_auth_websocket_client.send_json(
+        {
+            "type": "auth",
+            "access_token": hass_access_token,
+            "supported_features": {const.FEATURE_COALESCE_MESSAGES: True},
+        }
+    )
+    auth_msg = await no_auth_websocket_client.receive_json()
+    assert auth_msg["type"] == "auth_ok"
+    assert auth_msg["supported_features"] == {const.FEATURE_COALESCE_MESSAGES: True}
+
+    await no_auth_websocket_client.send_json(
+        {"id": 1, "type": "subscribe_events", "event_type": "test_event"}
+    )
+    msg = await no_auth_websocket_client.receive_json()
+    assert msg["id"] == 1
+    assert msg["success"]
+
+    for idx in range(3):
+        hass.bus.async_fire("test_event", {"idx": idx})
+    await hass.async_block_till_done()
+
+    msgs = await no_auth_websocket_client.receive_json()
+    assert [msg["event"]["data"]["idx"] for msg in msgs] == [0, 1, 2]
+
+
+async def test_messages_not_coalesced_by_default(hass, websocket_client):
+    """Test messages are sent in their own frame unless coalescing is enabled."""
+    await websocket_client.send_json(
+        {"id": 1, "type": "subscribe_events", "event_type": "test_event"}
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+
+    for idx in range(3):
+        hass.bus.async_fire("test_event", {"idx": idx})
+    await hass.async_block_till_done()
+
+    for idx in range(3):
+        msg = await websocket_client.receive_json()
+        assert msg["event"]["data"]["idx"] == idx
+
+
+async def test_connection_stats(hass, websocket_client, hass_ws_client):
+    """Test the statistics of the open connections."""
+    other_client = await hass_ws_client()
+
+    await websocket_client.send_json({"id": 1, "type": "connection_stats"})
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+
+    stats = msg["result"]
+    assert len(stats) == 2
+    for conn_stats in stats:
+        assert not conn_stats["coalesce_messages"]
+        assert conn_stats["messages_sent"] >= 2
+        assert conn_stats["frames_sent"] == conn_stats["messages_sent"]
+        assert conn_stats["max_pending_messages"] >= 1
+        assert conn_stats["peak_checks"] == 0
+        assert not conn_stats["peak_check_scheduled"]
+
+    await other_client.close()
+    await hass.async_block_till_done()
+
+    await websocket_client.send_json({"id": 2, "type": "connection_stats"})
+    msg = await websocket_client.receive_json()
+    assert len(msg["result"]) == 1
@@ -744,3 +744,120 @@ async def test_removing_entity_unavailable(hass):
     state = hass.states.get("hello.world")
     assert state is not None
     assert state.state == STATE_UNAVAILABLE
+
+
+async def test_cached_static_attributes(hass):
+    """Test static attributes are cached until invalidated."""
+    entry = entity_registry.RegistryEntry(
+        entity_id="hello.world",
+        unique_id="test-unique-id",
+        platform="test-platform",
+    )
+    registry = mock_registry(hass, {"hello.world": entry})
+
+    class CachedEntity(entity.Entity):
+        """Entity caching its static attributes."""
+
+        _cache_static_attributes = True
+
+    ent = CachedEntity()
+    ent.hass = hass
+    ent.entity_id = "hello.world"
+    ent.registry_entry = entry
+    ent.add_to_platform_start(hass, MagicMock(platform_name="test-platform"), None)
+
+    with patch.object(
+        CachedEntity, "name", PropertyMock(return_value="Before")
+    ) as mock_name:
+        await ent.add_to_platform_finish()
+        ent.async_write_ha_state()
+        assert mock_name.call_count == 1
+
+        mock_name.return_value = "After"
+        ent.async_write_ha_state()
+        assert hass.states.get("hello.world").name == "Before"
+
+        ent.async_invalidate_static_attributes()
+        ent.async_write_ha_state()
+        assert hass.states.get("hello.world").name == "After"
+        assert mock_name.call_count == 2
+
+    registry.async_update_entity("hello.world", name="Registry name")
+    await hass.async_block_till_done()
+    assert hass.states.get("hello.world").name == "Registry name"
+
+
+async def test_equal_attributes_shared(hass):
+    """Test equal attributes are shared between consecutive states."""
+    ent = entity.Entity()
+    ent.hass = hass
+    ent.entity_id = "hello.world"
+
+    with patch.object(
+        entity.Entity, "state", PropertyMock(return_value="on")
+    ) as mock_state, patch.object(
+        entity.Entity, "device_state_attributes", PropertyMock(return_value={"a": 1})
+    ) as mock_attributes:
+        ent.async_write_ha_state()
+        state = hass.states.get("hello.world")
+
+        mock_state.return_value = "off"
+        mock_attributes.return_value = {"a": 1}
+        ent.async_write_ha_state()
+        state2 = hass.states.get("hello.world")
+
+        mock_attributes.return_value = {"a": 2}
+        ent.async_write_ha_state()
+        state3 = hass.states.get("hello.world")
+
+    assert state2.state == "off"
+    assert state2.attributes is state.attributes
+    assert state3.attributes == {"a": 2}
+
+
+async def test_cached_attributes_not_compared(hass):
+    """Test unchanged attributes of a caching entity are not compared."""
+    comparisons = []
+
+    class CountingValue:
+        """Value counting its comparisons."""
+
+        def __eq__(self, other):
+            comparisons.append(other)
+            return True
+
+    class CachedEntity(entity.Entity):
+        """Entity caching its static attributes."""
+
+        _cache_static_attributes = True
+
+    ent = CachedEntity()
+    ent.hass = hass
+    ent.entity_id = "hello.world"
+
+    with patch.object(
+        CachedEntity, "state", PropertyMock(return_value="on")
+    ) as mock_state, patch.object(
+        CachedEntity,
+        "device_state_attributes",
+        PropertyMock(return_value={"value": CountingValue()}),
+    ) as mock_attributes:
+        ent.async_write_ha_state()
+        state = hass.states.get("hello.world")
+
+        # Only the state changed
+        mock_state.return_value = "off"
+        ent.async_write_ha_state()
+        state2 = hass.states.get("hello.world")
+        assert state2.state == "off"
+        assert state2.attributes is state.attributes
+        assert comparisons == []
+
+        # Equal attributes in a new dict are compared and shared
+        mock_state.return_value = "on"
+        mock_attributes.return_value = {"value": CountingValue()}
+        ent.async_write_ha_state()
+        state3 = hass.states.get("hello.world")
+        assert state3.state == "on"
+        assert state3.attributes is state.attributes
+        assert len(comparisons) == 1
@@ -15,6 +15,7 @@ from homeassistant.helpers.entity_component import (
     DEFAULT_SCAN_INTERVAL,
     EntityComponent,
 )
+from homeassistant.helpers.poll_scheduler import async_get_poll_scheduler
 import homeassistant.util.dt as dt_util
 
 from tests.common import (
@@ -51,6 +52,28 @@ async def test_polling_only_updates_entities_it_should_poll(hass):
 
     assert not no_poll_ent.async_update.called
     assert poll_ent.async_update.called
+    platform = hass.data[entity_platform.DATA_ENTITY_PLATFORM]["test_domain"][0]
+    assert platform.update_durations.count == 1
+
+
+async def test_polling_entity_that_starts_polling(hass):
+    """Test an entity that starts polling after it was added is polled."""
+    component = EntityComponent(_LOGGER, DOMAIN, hass, timedelta(seconds=20))
+
+    ent = MockEntity(should_poll=False)
+    ent.async_update = Mock()
+
+    await component.async_add_entities([ent])
+    ent.async_update.reset_mock()
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=20))
+    await hass.async_block_till_done()
+    assert not ent.async_update.called
+
+    ent._values["should_poll"] = True
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=40))
+    await hass.async_block_till_done()
+    assert ent.async_update.called
 
 
 async def test_polling_updates_entities_with_exception(hass):
@@ -90,6 +113,149 @@ async def test_polling_updates_entities_with_exception(hass):
     assert len(update_err) == 1
 
 
+async def test_polling_spreads_first_polls(hass):
+    """Test the first polls are spread over the end of the scan interval."""
+    component = EntityComponent(_LOGGER, DOMAIN, hass, timedelta(seconds=20))
+
+    ent1 = MockEntity(should_poll=True)
+    ent1.async_update = Mock()
+    ent2 = MockEntity(should_poll=True)
+    ent2.async_update = Mock()
+
+    now = dt_util.utcnow()
+    with patch("homeassistant.util.dt.utcnow", return_value=now), patch(
+        "homeassistant.helpers.poll_scheduler.random.random", side_effect=[0.9, 0]
+    ):
+        await component.async_add_entities([ent1, ent2])
+
+    async_fire_time_changed(hass, now + timedelta(seconds=12))
+    await hass.async_block_till_done()
+
+    assert ent1.async_update.called
+    assert not ent2.async_update.called
+
+    async_fire_time_changed(hass, now + timedelta(seconds=21))
+    await hass.async_block_till_done()
+
+    assert ent2.async_update.called
+
+
+async def test_polling_backs_off_unchanged_entities(hass):
+    """Test entities whose state does not change are polled less often."""
+    component = EntityComponent(_LOGGER, DOMAIN, hass, timedelta(seconds=20))
+
+    ent = MockEntity(should_poll=True, state="off")
+    ent.update = Mock()
+
+    now = dt_util.utcnow()
+    with patch("homeassistant.util.dt.utcnow", return_value=now), patch(
+        "homeassistant.helpers.poll_scheduler.random.random", return_value=0
+    ), patch("homeassistant.helpers.poll_scheduler.UNCHANGED_POLLS_BEFORE_BACKOFF", 2):
+        await component.async_add_entities([ent])
+
+        for polls in range(1, 4):
+            async_fire_time_changed(hass, now + timedelta(seconds=20 * polls + 1))
+            await hass.async_block_till_done()
+
+    assert ent.update.call_count == 3
+    stats = async_get_poll_scheduler(hass).async_get_stats()
+    assert stats == [
+        {
+            "domain": DOMAIN,
+            "platform": DOMAIN,
+            "scan_interval": 20,
+            "entities": 1,
+            "backed_off": 1,
+            "polls": 3,
+            "failures": 0,
+            "overruns": 0,
+        }
+    ]
+
+    # The poll after the next one is 40 seconds later
+    async_fire_time_changed(hass, now + timedelta(seconds=81))
+    await hass.async_block_till_done()
+    assert ent.update.call_count == 4
+
+    async_fire_time_changed(hass, now + timedelta(seconds=101))
+    await hass.async_block_till_done()
+    assert ent.update.call_count == 4
+
+    ent._values["state"] = "on"
+    async_fire_time_changed(hass, now + timedelta(seconds=121))
+    await hass.async_block_till_done()
+    assert ent.update.call_count == 5
+    assert async_get_poll_scheduler(hass).async_get_stats()[0]["backed_off"] == 0
+
+
+async def test_polling_backs_off_failing_entities(hass):
+    """Test entities whose update keeps failing are polled less often."""
+    component = EntityComponent(_LOGGER, DOMAIN, hass, timedelta(seconds=20))
+
+    ent = MockEntity(should_poll=True)
+    ent.update = Mock(side_effect=HomeAssistantError("Fake error update"))
+
+    now = dt_util.utcnow()
+    with patch("homeassistant.util.dt.utcnow", return_value=now), patch(
+        "homeassistant.helpers.poll_scheduler.random.random", return_value=0
+    ):
+        await component.async_add_entities([ent])
+
+        for polls in range(1, 4):
+            async_fire_time_changed(hass, now + timedelta(seconds=20 * polls + 1))
+            await hass.async_block_till_done()
+
+    stats = async_get_poll_scheduler(hass).async_get_stats()
+    assert stats[0]["polls"] == 3
+    assert stats[0]["failures"] == 3
+    assert stats[0]["backed_off"] == 1
+
+    async_fire_time_changed(hass, now + timedelta(seconds=81))
+    await hass.async_block_till_done()
+    assert ent.update.call_count == 4
+
+    async_fire_time_changed(hass, now + timedelta(seconds=101))
+    await hass.async_block_till_done()
+    assert ent.update.call_count == 4
+
+
+async def test_polling_stops_when_entity_removed(hass):
+    """Test an entity is no longer polled once it is removed."""
+    component = EntityComponent(_LOGGER, DOMAIN, hass, timedelta(seconds=20))
+
+    ent = MockEntity(should_poll=True)
+    ent.async_update = Mock()
+
+    await component.async_add_entities([ent])
+    assert len(async_get_poll_scheduler(hass).async_get_stats()) == 1
+
+    await ent.async_remove()
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=20))
+    await hass.async_block_till_done()
+
+    assert not ent.async_update.called
+    assert async_get_poll_scheduler(hass).async_get_stats() == []
+
+
+async def test_executor_updates_share_a_limit(hass):
+    """Test the executor bound updates of all platforms share a limit."""
+    ent = MockEntity(should_poll=True)
+    ent.update = Mock()
+    with patch("homeassistant.helpers.poll_scheduler.MAX_EXECUTOR_UPDATES", 1):
+        platform = MockEntityPlatform(hass, platform_name="one")
+    await platform.async_add_entities([ent])
+
+    executor_updates = async_get_poll_scheduler(hass).executor_updates
+    await executor_updates.acquire()
+    task = hass.async_create_task(ent.async_device_update())
+    await asyncio.sleep(0)
+    assert not ent.update.called
+
+    executor_updates.release()
+    await task
+    assert ent.update.called
+
+
 async def test_update_state_adds_entities(hass):
     """Test if updating poll entities cause an entity to be added works."""
     component = EntityComponent(_LOGGER, DOMAIN, hass)
@@ -135,8 +301,7 @@ async def test_update_state_adds_entities_with_update_before_add_false(hass):
     assert not ent.update.called
 
 
-@patch("homeassistant.helpers.entity_platform.async_track_time_interval")
-async def test_set_scan_interval_via_platform(mock_track, hass):
+async def test_set_scan_interval_via_platform(hass):
     """Test the setting of the scan interval via platform."""
 
     def platform_setup(hass, config, add_entities, discovery_info=None):
@@ -153,8 +318,9 @@ async def test_set_scan_interval_via_platform(mock_track, hass):
     component.setup({DOMAIN: {"platform": "platform"}})
 
     await hass.async_block_till_done()
-    assert mock_track.called
-    assert timedelta(seconds=30) == mock_track.call_args[0][2]
+    stats = async_get_poll_scheduler(hass).async_get_stats()
+    assert len(stats) == 1
+    assert stats[0]["scan_interval"] == 30
 
 
 async def test_adding_entities_with_generator_and_thread_callback(hass):
@@ -174,6 +340,37 @@ async def test_adding_entities_with_generator_and_thread_callback(hass):
     await component.async_add_entities(create_entity(i) for i in range(2))
 
 
+async def test_scheduled_adds_are_batched(hass):
+    """Test entities scheduled before the add task runs are added together."""
+    platform = MockEntityPlatform(hass)
+
+    with patch.object(
+        platform, "async_add_entities", wraps=platform.async_add_entities
+    ) as mock_add_entities:
+        platform._async_schedule_add_entities([MockEntity(name="one")])
+        platform._async_schedule_add_entities(
+            MockEntity(name=name) for name in ("two", "three")
+        )
+        platform._async_schedule_add_entities(
+            [MockEntity(name="four")], update_before_add=True
+        )
+        await hass.async_block_till_done()
+
+        assert mock_add_entities.call_count == 2
+        assert [entity.name for entity in mock_add_entities.mock_calls[0][1][0]] == [
+            "one",
+            "two",
+            "three",
+        ]
+        assert mock_add_entities.mock_calls[1][2] == {"update_before_add": True}
+
+        platform._async_schedule_add_entities([MockEntity(name="five")])
+        await hass.async_block_till_done()
+        assert mock_add_entities.call_count == 3
+
+    assert len(hass.states.async_entity_ids()) == 5
+
+
 async def test_platform_warn_slow_setup(hass):
     """Warn we log when platform setup takes a long time."""
     platform = MockPlatform()
@@ -248,3 +248,27 @@ def test_filter_schema_include_exclude():
     }
     filt = INCLUDE_EXCLUDE_FILTER_SCHEMA(conf)
     assert filt.config == conf
+
+
+def test_filter_schema_entity_ids_and_domains():
+    """Test the entity IDs and domains a filter can pass are exposed."""
+    filt = FILTER_SCHEMA(
+        {
+            "include_domains": ["light"],
+            "include_entities": ["switch.kitchen"],
+            "exclude_domains": ["cover"],
+        }
+    )
+    assert filt.entity_ids_and_domains == (["switch.kitchen"], ["light"])
+
+    filt = FILTER_SCHEMA({"include_entities": ["switch.kitchen"]})
+    assert filt.entity_ids_and_domains == (["switch.kitchen"], [])
+
+    # No includes, includes with globs and case 4b pass other entities
+    for conf in (
+        {},
+        {"exclude_domains": ["cover"]},
+        {"include_entity_globs": ["sensor.kitchen_*"]},
+        {"include_entities": ["switch.kitchen"], "exclude_domains": ["switch"]},
+    ):
+        assert FILTER_SCHEMA(conf).entity_ids_and_domains is None
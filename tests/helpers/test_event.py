@@ -19,6 +19,7 @@ from homeassistant.helpers.event import (
     TrackTemplate,
     TrackTemplateResult,
     async_call_later,
+    async_template_render_stats,
     async_track_point_in_time,
     async_track_point_in_utc_time,
     async_track_same_state,
@@ -2026,6 +2027,83 @@ async def test_async_track_template_result_multiple_templates(hass):
     ]
 
 
+async def test_async_track_template_result_coalesces_renders(hass):
+    """Test state changes in the same loop iteration cause a single render."""
+    template_1 = Template("{{ states.sensor | map(attribute='state') | list }}")
+    template_2 = Template("{{ states.light.test.state }}")
+
+    refresh_runs = []
+
+    @ha.callback
+    def refresh_listener(event, updates):
+        refresh_runs.append([update.result for update in updates])
+
+    async_track_template_result(
+        hass,
+        [
+            TrackTemplate(template_1, None, timedelta(seconds=0)),
+            TrackTemplate(template_2, None),
+        ],
+        refresh_listener,
+        coalesce=True,
+    )
+    await hass.async_block_till_done()
+
+    hass.states.async_set("sensor.one", "1")
+    hass.states.async_set("sensor.two", "2")
+    hass.states.async_set("light.test", "on")
+    await hass.async_block_till_done()
+
+    assert refresh_runs == [[["1", "2"], "on"]]
+
+    stats = async_template_render_stats(hass)
+    assert stats["queue_depth"] == 0
+    assert stats["max_queue_depth"] == 1
+    assert stats["flushes"] == 1
+    assert stats["renders"] == 1
+    assert stats["coalesced"] == 2
+    assert stats["max_latency"] >= stats["average_latency"] > 0
+
+
+async def test_async_track_template_result_renders_every_state_change(hass):
+    """Test a state that changes back within a loop iteration is not missed."""
+    hass.states.async_set("light.test", "on")
+    template = Template("{{ is_state('light.test', 'on') }}")
+
+    refresh_runs = []
+    coalesced_runs = []
+
+    @ha.callback
+    def refresh_listener(event, updates):
+        refresh_runs.append(updates.pop().result)
+
+    @ha.callback
+    def coalesced_listener(event, updates):
+        coalesced_runs.append(updates.pop().result)
+
+    info = async_track_template_result(
+        hass, [TrackTemplate(template, None)], refresh_listener
+    )
+    info.async_refresh()
+    coalesced_info = async_track_template_result(
+        hass, [TrackTemplate(template, None)], coalesced_listener, coalesce=True
+    )
+    coalesced_info.async_refresh()
+    await hass.async_block_till_done()
+
+    assert refresh_runs == coalesced_runs == [True]
+    refresh_runs.clear()
+    coalesced_runs.clear()
+
+    hass.states.async_set("light.test", "off")
+    await asyncio.sleep(0)
+    hass.states.async_set("light.test", "on")
+    await hass.async_block_till_done()
+
+    assert refresh_runs == [False, True]
+    assert coalesced_runs == []
+
+
 async def test_async_track_template_result_multiple_templates_mixing_domain(hass):
     """Test tracking multiple templates when tracking entities and an entire domain."""
 
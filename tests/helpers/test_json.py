@@ -1,8 +1,19 @@
 """Test Home Assistant remote methods and classes."""
+from collections import namedtuple
+from functools import partial
+import json
+
 import pytest
 
 from homeassistant import core
-from homeassistant.helpers.json import JSONEncoder
+from homeassistant.helpers.json import (
+    HAS_ORJSON,
+    JSONEncoder,
+    json_dumps,
+    json_dumps_pretty,
+    json_encoder_default,
+    stdlib_json_dumps,
+)
 from homeassistant.util import dt as dt_util
 
 
@@ -19,3 +30,70 @@ def test_json_encoder(hass):
 
     now = dt_util.utcnow()
     assert ha_json_enc.default(now) == now.isoformat()
+
+
+@pytest.mark.parametrize(
+    "dumps",
+    [
+        json_dumps,
+        partial(json_dumps, nan_as_null=True),
+        json_dumps_pretty,
+        stdlib_json_dumps,
+    ],
+)
+def test_json_dumps(dumps):
+    """Test the serializers support Home Assistant objects."""
+    now = dt_util.utcnow()
+    state = core.State("test.test", "hello", last_changed=now, last_updated=now)
+
+    point = namedtuple("Point", ["x", "y"])(1, 2)
+
+    data = json.loads(
+        dumps({"state": state, "time": now, "set": {1}, 2: "two", "point": point})
+    )
+    assert data == {
+        "state": json.loads(json.dumps(state, cls=JSONEncoder)),
+        "time": now.isoformat(),
+        "set": [1],
+        "2": "two",
+        "point": [1, 2],
+    }
+
+    with pytest.raises(TypeError):
+        dumps({"bad": object()})
+
+
+def test_json_encoder_default():
+    """Test converting objects for the fast serializer."""
+    state = core.State("test.test", "hello")
+
+    assert json_encoder_default(state) == state.as_dict()
+    assert json_encoder_default({1, 2}) == [1, 2]
+    assert json_encoder_default(namedtuple("Point", ["x", "y"])(1, 2)) == [1, 2]
+
+    with pytest.raises(TypeError):
+        json_encoder_default(1)
+
+
+def test_json_dumps_nan():
+    """Test NaN and infinite floats are rejected unless opted in."""
+    with pytest.raises(ValueError):
+        json_dumps([float("NaN")])
+    with pytest.raises(ValueError):
+        json_dumps([float("inf")])
+
+
+@pytest.mark.skipif(not HAS_ORJSON, reason="orjson is not installed")
+def test_json_dumps_nan_as_null():
+    """Test NaN and infinite floats are serialized as null when opted in."""
+    assert json_dumps([float("NaN"), float("inf")], nan_as_null=True) == "[null,null]"
+
+
+def test_json_dumps_wide_int():
+    """Test integers wider than 64 bits fall back to the standard library."""
+    assert json_dumps([2 ** 64], nan_as_null=True) == "[18446744073709551616]"
+
+
+def test_json_dumps_pretty_indent():
+    """Test files keep their 4 space indentation."""
+    assert json_dumps_pretty({"a": 1}) == '{\n    "a": 1\n}'
@@ -1,5 +1,5 @@
 """The tests for the Restore component."""
-from datetime import datetime
+from datetime import datetime, timedelta
 from unittest.mock import patch
 
 from homeassistant.const import EVENT_HOMEASSISTANT_START
@@ -8,6 +8,8 @@ from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.restore_state import (
     DATA_RESTORE_STATE_TASK,
+    DELTA_STORAGE_KEY,
+    STATE_DUMP_REFRESH_INTERVAL,
     STORAGE_KEY,
     RestoreEntity,
     RestoreStateData,
@@ -160,7 +162,7 @@ async def test_dump_data(hass):
     with patch(
         "homeassistant.helpers.restore_state.Store.async_save"
     ) as mock_write_data, patch.object(hass.states, "async_all", return_value=states):
-        await data.async_dump_states()
+        await data.async_dump_states(save_all=True)
 
     assert mock_write_data.called
     args = mock_write_data.mock_calls[0][1]
@@ -172,6 +174,204 @@ async def test_dump_data(hass):
     assert written_states[1]["state"]["state"] == "off"
 
 
+async def test_dump_skipped_when_unchanged(hass):
+    """Test the states are only dumped when they changed."""
+    entity = RestoreEntity()
+    entity.hass = hass
+    entity.entity_id = "input_boolean.b1"
+    await entity.async_internal_added_to_hass()
+    hass.states.async_set("input_boolean.b1", "on")
+
+    data = await RestoreStateData.async_get_instance(hass)
+    await hass.async_block_till_done()
+
+    with patch(
+        "homeassistant.helpers.restore_state.Store.async_save"
+    ) as mock_write_data:
+        await data.async_dump_states()
+        assert mock_write_data.call_count == 1
+
+        await data.async_dump_states()
+        assert mock_write_data.call_count == 1
+
+        hass.states.async_set("input_boolean.b1", "off")
+        await data.async_dump_states()
+        assert mock_write_data.call_count == 2
+        # A single state is more than the delta holds, so all are saved
+        stored = mock_write_data.mock_calls[1][1][0]
+        assert stored[0]["state"]["state"] == "off"
+
+        # States are refreshed periodically even if they did not change
+        with patch(
+            "homeassistant.util.dt.utcnow",
+            return_value=dt_util.utcnow() + STATE_DUMP_REFRESH_INTERVAL,
+        ):
+            await data.async_dump_states()
+        assert mock_write_data.call_count == 3
+
+
+async def test_dump_changed_states_to_delta(hass, hass_storage):
+    """Test only the changed states are saved between full dumps."""
+    for index in range(10):
+        entity = RestoreEntity()
+        entity.hass = hass
+        entity.entity_id = f"input_boolean.b{index}"
+        await entity.async_internal_added_to_hass()
+        hass.states.async_set(entity.entity_id, "on")
+
+    data = await RestoreStateData.async_get_instance(hass)
+    await hass.async_block_till_done()
+    await data.async_dump_states(save_all=True)
+    assert len(hass_storage[STORAGE_KEY]["data"]) == 10
+    assert DELTA_STORAGE_KEY not in hass_storage
+
+    hass.states.async_set("input_boolean.b1", "off")
+    hass.states.async_remove("input_boolean.b2")
+    await data.async_dump_states()
+
+    # The main store is not rewritten
+    stored = {
+        item["state"]["entity_id"]: item["state"]["state"]
+        for item in hass_storage[STORAGE_KEY]["data"]
+    }
+    assert set(stored.values()) == {"on"}
+    assert "input_boolean.b2" in stored
+    delta = hass_storage[DELTA_STORAGE_KEY]["data"]
+    assert [item["state"]["entity_id"] for item in delta["changed"]] == [
+        "input_boolean.b1"
+    ]
+    assert list(delta["removed"]) == ["input_boolean.b2"]
+
+    # The delta is applied when loading
+    hass.data[DATA_RESTORE_STATE_TASK] = None
+    data = await RestoreStateData.async_get_instance(hass)
+    assert data.last_states["input_boolean.b1"].state.state == "off"
+    assert "input_boolean.b2" not in data.last_states
+
+    # A full dump clears the delta
+    await hass.async_block_till_done()
+    assert DELTA_STORAGE_KEY not in hass_storage
+
+
+async def test_large_delta_dumps_all_states(hass, hass_storage):
+    """Test all the states are saved once the delta grows too large."""
+    for index in range(8):
+        entity = RestoreEntity()
+        entity.hass = hass
+        entity.entity_id = f"input_boolean.b{index}"
+        await entity.async_internal_added_to_hass()
+        hass.states.async_set(entity.entity_id, "on")
+
+    data = await RestoreStateData.async_get_instance(hass)
+    await hass.async_block_till_done()
+    await data.async_dump_states(save_all=True)
+
+    hass.states.async_set("input_boolean.b0", "off")
+    await data.async_dump_states()
+    assert len(hass_storage[DELTA_STORAGE_KEY]["data"]["changed"]) == 1
+
+    hass.states.async_set("input_boolean.b1", "off")
+    await data.async_dump_states()
+    assert len(hass_storage[DELTA_STORAGE_KEY]["data"]["changed"]) == 2
+
+    # A third changed state is more than a quarter of the states
+    hass.states.async_set("input_boolean.b2", "off")
+    await data.async_dump_states()
+    assert DELTA_STORAGE_KEY not in hass_storage
+    stored = {
+        item["state"]["entity_id"]: item["state"]["state"]
+        for item in hass_storage[STORAGE_KEY]["data"]
+    }
+    assert stored["input_boolean.b0"] == "off"
+    assert stored["input_boolean.b2"] == "off"
+    assert stored["input_boolean.b3"] == "on"
+
+
+async def test_stale_delta_not_applied(hass, hass_storage):
+    """Test a delta older than the main store does not undo its states."""
+    now = dt_util.utcnow()
+    before = now - timedelta(hours=1)
+    hass_storage[STORAGE_KEY] = {
+        "version": 1,
+        "key": STORAGE_KEY,
+        "data": [
+            {
+                "state": State("input_boolean.b1", "on").as_dict(),
+                "last_seen": now.isoformat(),
+            },
+            {
+                "state": State("input_boolean.b2", "on").as_dict(),
+                "last_seen": now.isoformat(),
+            },
+        ],
+    }
+    hass_storage[DELTA_STORAGE_KEY] = {
+        "version": 1,
+        "key": DELTA_STORAGE_KEY,
+        "data": {
+            "changed": [
+                {
+                    "state": State("input_boolean.b1", "off").as_dict(),
+                    "last_seen": before.isoformat(),
+                }
+            ],
+            "removed": {"input_boolean.b2": before.isoformat()},
+        },
+    }
+
+    data = await RestoreStateData.async_get_instance(hass)
+    assert data.last_states["input_boolean.b1"].state.state == "on"
+    assert "input_boolean.b2" in data.last_states
+
+
+async def test_stored_states_decoded_lazily(hass, hass_storage):
+    """Test stored states are decoded on first use and saved back unchanged."""
+    now = dt_util.utcnow()
+    stored_states = [
+        StoredState(State("input_boolean.b0", "on"), now).as_dict(),
+        StoredState(
+            State("input_boolean.b1", "off"), now - timedelta(hours=1)
+        ).as_dict(),
+    ]
+    hass_storage[STORAGE_KEY] = {
+        "version": 1,
+        "key": STORAGE_KEY,
+        "data": [
+            {
+                "state": stored_state["state"],
+                "last_seen": stored_state["last_seen"].isoformat(),
+            }
+            for stored_state in stored_states
+        ],
+    }
+
+    data = await RestoreStateData.async_get_instance(hass)
+    stored_b1 = data.last_states["input_boolean.b1"]
+    assert stored_b1._state is None
+
+    entity = RestoreEntity()
+    entity.hass = hass
+    entity.entity_id = "input_boolean.b1"
+    state = await entity.async_get_last_state()
+    assert state.state == "off"
+    assert stored_b1.last_seen == now - timedelta(hours=1)
+    assert data.last_states["input_boolean.b0"]._state is None
+
+    with patch(
+        "homeassistant.helpers.restore_state.Store.async_save"
+    ) as mock_write_data:
+        await data.async_dump_states()
+
+    assert mock_write_data.mock_calls[0][1][0] == hass_storage[STORAGE_KEY]["data"]
+    assert data.last_states["input_boolean.b0"]._state is None
+
+    state_on = State("input_boolean.b1", "on")
+    stored_b1.state = state_on
+    stored_b1.last_seen = now
+    assert stored_b1.state is state_on
+    assert stored_b1.as_dict() == StoredState(state_on, now).as_dict()
+
+
 async def test_dump_error(hass):
     """Test that we cache data."""
     states = [
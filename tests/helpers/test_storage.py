@@ -21,6 +21,9 @@ MOCK_KEY = "storage-test"
 MOCK_DATA = {"hello": "world"}
 MOCK_DATA2 = {"goodbye": "cruel world"}
 
+# The hass_storage fixture replaces the method that writes to disk
+ORIG_WRITE_DATA = storage.Store._write_data
+
 
 @pytest.fixture
 def store(hass):
@@ -83,6 +86,49 @@ async def test_saving_with_delay(hass, store, hass_storage):
     }
 
 
+async def test_delayed_saves_are_coalesced(hass, hass_storage):
+    """Test delayed saves due within the flush window are written together."""
+    store = storage.Store(hass, MOCK_VERSION, MOCK_KEY)
+    store2 = storage.Store(hass, MOCK_VERSION, "storage-test-2")
+    store3 = storage.Store(hass, MOCK_VERSION, "storage-test-3")
+    scheduler = storage._async_get_scheduler(hass)
+
+    store.async_delay_save(lambda: MOCK_DATA, 1)
+    store2.async_delay_save(lambda: MOCK_DATA2, 4)
+    store3.async_delay_save(lambda: MOCK_DATA, 30)
+
+    async_fire_time_changed(hass, dt.utcnow() + timedelta(seconds=1))
+    await hass.async_block_till_done()
+    assert hass_storage[store.key]["data"] == MOCK_DATA
+    assert hass_storage[store2.key]["data"] == MOCK_DATA2
+    assert store3.key not in hass_storage
+    assert scheduler.flushes == 1
+
+    async_fire_time_changed(hass, dt.utcnow() + timedelta(seconds=30))
+    await hass.async_block_till_done()
+    assert hass_storage[store3.key]["data"] == MOCK_DATA
+    assert scheduler.flushes == 2
+
+
+async def test_store_metrics(hass, tmpdir):
+    """Test the write metrics of a store are recorded."""
+    hass.config.config_dir = str(tmpdir)
+    store = storage.Store(hass, MOCK_VERSION, MOCK_KEY)
+
+    with patch.object(storage.Store, "_write_data", ORIG_WRITE_DATA):
+        await store.async_save(MOCK_DATA)
+        await store.async_save(MOCK_DATA2)
+
+    metrics = storage.async_get_storage_metrics(hass)[MOCK_KEY]
+    assert metrics["write_count"] == 2
+    assert metrics["last_write_size"] == tmpdir.join(".storage", MOCK_KEY).size()
+    assert metrics["total_write_size"] > metrics["last_write_size"]
+    assert 0 < metrics["last_serialize_time"] <= metrics["total_serialize_time"]
+
+    # Stores with the same key share their metrics
+    assert storage.Store(hass, MOCK_VERSION, MOCK_KEY).metrics is store.metrics
+
+
 async def test_saving_on_final_write(hass, hass_storage):
     """Test delayed saves trigger when we quit Home Assistant."""
     store = storage.Store(hass, MOCK_VERSION, MOCK_KEY)
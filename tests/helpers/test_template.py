@@ -2055,35 +2055,75 @@ def test_urlencode(hass):
     assert tpl.async_render() == "the%20quick%20brown%20fox%20%3D%20true"
 
 
-async def test_cache_garbage_collection():
-    """Test caching a template."""
+async def test_compiled_template_cache():
+    """Test compiled templates are shared by templates with the same source."""
     template_string = (
         "{% set dict = {'foo': 'x&y', 'bar': 42} %} {{ dict | urlencode }}"
     )
-    tpl = template.Template(
-        (template_string),
-    )
+    cache = template._NO_HASS_ENV.template_cache  # pylint: disable=protected-access
+    hits = cache.hits
+
+    tpl = template.Template(template_string)
     tpl.ensure_valid()
-    assert template._NO_HASS_ENV.template_cache.get(
-        template_string
-    )  # pylint: disable=protected-access
+    compiled = cache.get(template_string)
+    assert compiled
 
-    tpl2 = template.Template(
-        (template_string),
-    )
+    tpl2 = template.Template(template_string)
     tpl2.ensure_valid()
-    assert template._NO_HASS_ENV.template_cache.get(
-        template_string
-    )  # pylint: disable=protected-access
+    assert cache.hits == hits + 2
 
+    # Compiled templates outlive the templates using them
     del tpl
-    assert template._NO_HASS_ENV.template_cache.get(
-        template_string
-    )  # pylint: disable=protected-access
     del tpl2
-    assert not template._NO_HASS_ENV.template_cache.get(
-        template_string
-    )  # pylint: disable=protected-access
+    assert cache.get(template_string) is compiled
+
+
+def test_compiled_template_cache_lru():
+    """Test the least recently used compiled templates are evicted."""
+    cache = template.CompiledTemplateCache(2)
+
+    cache["one"] = "compiled one"
+    cache["two"] = "compiled two"
+    assert cache.get("one") == "compiled one"
+    cache["three"] = "compiled three"
+
+    assert cache.get("two") is None
+    assert cache.get("one") == "compiled one"
+    assert cache.get("three") == "compiled three"
+    assert cache.stats() == {
+        "size": 2,
+        "maxsize": 2,
+        "hits": 3,
+        "misses": 1,
+        "evictions": 1,
+    }
+
+
+async def test_render_durations(hass):
+    """Test the render durations of the templates are recorded."""
+    durations = template.async_get_render_durations(hass)
+    assert durations.count == 0
+
+    template.Template("{{ 1 + 1 }}", hass).async_render()
+    template.Template("static", hass).async_render()
+    with pytest.raises(TemplateError):
+        template.Template("{{ 1 / 0 }}", hass).async_render()
+
+    assert durations.count == 2
+
+
+async def test_template_cache_stats(hass):
+    """Test the template cache statistics are reported per mode."""
+    template.Template("{{ 1 + 1 }}", hass).async_render()
+    info = template.Template("{{ 1 + 1 }}", hass).async_render_to_info()
+    assert info.result() == 2
+    assert info.render_time > 0
+
+    stats = template.template_cache_stats(hass)
+    assert stats["full"]["size"] == 1
+    assert stats["full"]["misses"] == 1
+    assert stats["full"]["hits"] == 1
+    assert "limited" in stats
 
 
 def test_is_template_string():
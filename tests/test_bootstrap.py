@@ -6,7 +6,7 @@ from unittest.mock import Mock, patch
 
 import pytest
 
-from homeassistant import bootstrap, core, runner
+from homeassistant import bootstrap, core, runner, setup
 import homeassistant.config as config_util
 from homeassistant.exceptions import HomeAssistantError
 import homeassistant.util.dt as dt_util
@@ -146,6 +146,20 @@ async def test_setup_after_deps_all_present(hass):
     assert "second_dep" in hass.config.components
     assert order == ["logger", "root", "first_dep", "second_dep"]
 
+    timeline = hass.data[setup.DATA_SETUP_TIMELINE]
+    assert timeline.finished is not None
+    assert [stage.phase for stage in timeline.stages] == [
+        "logging",
+        "registries",
+        "stage_2",
+        "wrap_up",
+    ]
+    assert [item["domain"] for item in timeline.critical_path()] == [
+        "root",
+        "first_dep",
+        "second_dep",
+    ]
+
 
 @pytest.mark.parametrize("load_registries", [False])
 async def test_setup_after_deps_in_stage_1_ignored(hass):
@@ -3,8 +3,10 @@
 import asyncio
 from datetime import datetime, timedelta
 import functools
+import json
 import logging
 import os
+import sys
 from tempfile import TemporaryDirectory
 from unittest.mock import MagicMock, Mock, PropertyMock, patch
 
@@ -360,6 +362,47 @@ def test_state_as_dict():
     assert state.as_dict() is state.as_dict()
 
 
+def test_state_as_json():
+    """Test a State is serialized to JSON once."""
+    state = ha.State("happy.happy", "on", {"pig": "dog"})
+    assert json.loads(state.as_json()) == state.as_dict()
+    assert state.as_json() is state.as_json()
+
+
+def test_state_interned_and_shared_attributes():
+    """Test states share their strings and read only attributes."""
+    state = ha.State("light.kitchen", "".join(["o", "n"]), {"brightness": 100})
+    assert state.state is sys.intern("on")
+    assert state.object_id is sys.intern("kitchen")
+    assert state.domain is sys.intern("light")
+
+    state2 = ha.State("light.kitchen", "off", state.attributes)
+    assert state2.attributes is state.attributes
+
+
+async def test_statemachine_shares_passed_attributes(hass):
+    """Test a new state shares the attributes of the old state if passed."""
+    hass.states.async_set("light.kitchen", "on", {"brightness": 100})
+    state = hass.states.get("light.kitchen")
+
+    hass.states.async_set("light.kitchen", "off", state.attributes)
+    state2 = hass.states.get("light.kitchen")
+    assert state2.attributes is state.attributes
+
+    hass.states.async_set("light.kitchen", "off", {"brightness": 50})
+    assert hass.states.get("light.kitchen").attributes == {"brightness": 50}
+
+
+async def test_eventbus_counts_fired_events(hass):
+    """Test the event bus counts the fired events by event type."""
+    fired = hass.bus.async_fired().get("test_event", 0)
+
+    hass.bus.async_fire("test_event")
+    hass.bus.async_fire("test_event")
+
+    assert hass.bus.async_fired()["test_event"] == fired + 2
+
+
 async def test_eventbus_add_remove_listener(hass):
     """Test remove_listener method."""
     old_count = len(hass.bus.async_listeners())
@@ -403,6 +446,70 @@ async def test_eventbus_unsubscribe_listener(hass):
     assert len(calls) == 1
 
 
+async def test_eventbus_listen_entities(hass):
+    """Test listening for the events of some entities and domains."""
+    calls = []
+
+    @ha.callback
+    def listener(event):
+        """Mock listener."""
+        calls.append(event.data["entity_id"])
+
+    old_count = hass.bus.async_listeners().get("test", 0)
+    unsub = hass.bus.async_listen_entities(
+        "test", listener, ["light.Kitchen", "sensor.temp"], ["switch", "sensor"]
+    )
+    assert hass.bus.async_listeners()["test"] == old_count + 1
+
+    for entity_id in (
+        "light.kitchen",
+        "light.bedroom",
+        "switch.fan",
+        "sensor.temp",
+        "cover.garage",
+    ):
+        hass.bus.async_fire("test", {"entity_id": entity_id})
+    hass.bus.async_fire("test", {"entity_id": ["light.kitchen"]})
+    hass.bus.async_fire("test")
+    hass.bus.async_fire("other", {"entity_id": "light.kitchen"})
+    await hass.async_block_till_done()
+
+    assert calls == ["light.kitchen", "switch.fan", "sensor.temp"]
+
+    unsub()
+    assert hass.bus.async_listeners().get("test", 0) == old_count
+    assert not hass.bus._entity_listeners
+    assert not hass.bus._domain_listeners
+
+    hass.bus.async_fire("test", {"entity_id": "light.kitchen"})
+    await hass.async_block_till_done()
+
+    assert len(calls) == 3
+
+
+async def test_eventbus_listen_entities_with_thread(hass):
+    """Test listening for the events of some entities from a thread."""
+    calls = []
+
+    def listener(event):
+        """Mock listener."""
+        calls.append(event)
+
+    unsub = await hass.async_add_executor_job(
+        hass.bus.listen_entities, "test", listener, ["light.kitchen"]
+    )
+
+    hass.bus.async_fire("test", {"entity_id": "light.kitchen"})
+    await hass.async_block_till_done()
+    assert len(calls) == 1
+
+    await hass.async_add_executor_job(unsub)
+
+    hass.bus.async_fire("test", {"entity_id": "light.kitchen"})
+    await hass.async_block_till_done()
+    assert len(calls) == 1
+
+
 async def test_eventbus_listen_once_event_with_callback(hass):
     """Test listen_once_event method."""
     runs = []
@@ -661,6 +768,31 @@ async def test_statemachine_force_update(hass):
     assert len(events) == 1
 
 
+async def test_statemachine_skips_attribute_comparison_on_state_change(hass):
+    """Test attributes are only compared when the state did not change."""
+    comparisons = []
+
+    class CountingValue:
+        """Value counting its comparisons."""
+
+        def __eq__(self, other):
+            comparisons.append(other)
+            return True
+
+    hass.states.async_set("light.bowl", "on", {"value": CountingValue()})
+    events = async_capture_events(hass, EVENT_STATE_CHANGED)
+
+    hass.states.async_set("light.bowl", "off", {"value": CountingValue()})
+    await hass.async_block_till_done()
+    assert len(events) == 1
+    assert comparisons == []
+
+    hass.states.async_set("light.bowl", "off", {"value": CountingValue()})
+    await hass.async_block_till_done()
+    assert len(events) == 1
+    assert len(comparisons) == 1
+
+
 def test_service_call_repr():
     """Test ServiceCall repr."""
     call = ha.ServiceCall("homeassistant", "start")
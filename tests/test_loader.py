@@ -1,4 +1,6 @@
 """Test to verify that we can load components."""
+from datetime import timedelta
+import os
 from unittest.mock import ANY, patch
 
 import pytest
@@ -6,8 +8,14 @@ import pytest
 from homeassistant import core, loader
 from homeassistant.components import http, hue
 from homeassistant.components.hue import light as hue_light
+from homeassistant.util import dt as dt_util
 
-from tests.common import MockModule, async_mock_service, mock_integration
+from tests.common import (
+    MockModule,
+    async_fire_time_changed,
+    async_mock_service,
+    mock_integration,
+)
 
 
 async def test_component_dependencies(hass):
@@ -507,3 +515,67 @@ async def test_get_custom_components_safe_mode(hass):
     """Test that we get empty custom components in safe mode."""
     hass.config.safe_mode = True
     assert await loader.async_get_custom_components(hass) == {}
+
+
+def test_manifest_index(tmp_path):
+    """Test manifests are only parsed again when they changed."""
+    manifest_path = tmp_path / "manifest.json"
+    manifest_path.write_text('{"domain": "test", "name": "Test"}')
+
+    index = loader.ManifestIndex()
+    assert index.get(tmp_path / "missing.json") is None
+    assert index.get(tmp_path) is None
+    assert index.get(manifest_path) == {"domain": "test", "name": "Test"}
+    assert index.changed
+
+    data = index.as_dict()
+    assert not index.changed
+    assert data["version"] == core.__version__
+
+    index = loader.ManifestIndex(None, data["manifests"])
+    with patch("pathlib.Path.read_text") as mock_read:
+        manifest = index.get(manifest_path)
+    assert not mock_read.called
+    assert manifest == {"domain": "test", "name": "Test"}
+    assert not index.changed
+
+    # Changes to returned manifests do not leak into the index
+    manifest["is_built_in"] = False
+    assert "is_built_in" not in index.get(manifest_path)
+
+    manifest_path.write_text('{"domain": "test", "name": "Changed"}')
+    stat = manifest_path.stat()
+    os.utime(manifest_path, (stat.st_atime, stat.st_mtime + 10))
+    assert index.get(manifest_path)["name"] == "Changed"
+    assert index.changed
+
+    manifest_path.write_text("{")
+    os.utime(manifest_path, (stat.st_atime, stat.st_mtime + 20))
+    with pytest.raises(ValueError):
+        index.get(manifest_path)
+
+
+async def test_manifest_index_stored(hass, hass_storage):
+    """Test the manifest index is stored and dropped on upgrades."""
+    integration = await loader.async_get_integration(hass, "hue")
+    index = await loader.async_get_manifest_index(hass)
+    assert index.changed
+
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=loader.MANIFEST_INDEX_SAVE_DELAY)
+    )
+    await hass.async_block_till_done()
+
+    data = hass_storage[loader.MANIFEST_INDEX_STORAGE_KEY]["data"]
+    assert data["version"] == core.__version__
+    manifest_path = str(integration.file_path / "manifest.json")
+    assert data["manifests"][manifest_path]["manifest"]["domain"] == "hue"
+
+    hass.data.pop(loader.DATA_MANIFEST_INDEX)
+    index = await loader.async_get_manifest_index(hass)
+    assert index._manifests.keys() == data["manifests"].keys()
+
+    data["version"] = "0.1"
+    hass.data.pop(loader.DATA_MANIFEST_INDEX)
+    index = await loader.async_get_manifest_index(hass)
+    assert index._manifests == {}
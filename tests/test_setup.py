@@ -596,3 +596,87 @@ async def test_integration_disabled(hass, caplog):
     result = await setup.async_setup_component(hass, "test_component1", {})
     assert not result
     assert disabled_reason in caplog.text
+
+
+async def test_setup_timeline(hass):
+    """Test the phases of setting up an integration are recorded."""
+    mock_integration(hass, MockModule("dep"))
+    mock_integration(hass, MockModule("comp", dependencies=["dep"]))
+
+    assert await setup.async_setup_component(hass, "comp", {})
+
+    timeline = setup.async_get_setup_timeline(hass)
+    phases = {(event.domain, event.phase) for event in timeline.events}
+    assert {
+        ("comp", setup.PHASE_DEPENDENCIES),
+        ("comp", setup.PHASE_IMPORT),
+        ("comp", setup.PHASE_CONFIG),
+        ("comp", setup.PHASE_SETUP),
+        ("dep", setup.PHASE_SETUP),
+    } <= phases
+    assert timeline.dependencies["comp"] == {"dep"}
+    assert set(timeline.loaded) == {"dep", "comp"}
+
+    assert [item["domain"] for item in timeline.critical_path()] == ["dep", "comp"]
+
+    data = timeline.as_dict()
+    assert data["finished"] is None
+    for event in data["events"]:
+        assert 0 <= event["start"] <= event["end"]
+
+
+async def test_setup_timeline_stops_when_finished(hass):
+    """Test nothing is recorded once bootstrap has finished."""
+    mock_integration(hass, MockModule("early"))
+    mock_integration(hass, MockModule("late"))
+
+    assert await setup.async_setup_component(hass, "early", {})
+
+    timeline = setup.async_get_setup_timeline(hass)
+    timeline.async_set_finished()
+    events = list(timeline.events)
+
+    assert await setup.async_setup_component(hass, "late", {})
+    timeline.async_add("late", setup.PHASE_PLATFORM, 0, 1, "light")
+
+    assert timeline.events == events
+    assert set(timeline.loaded) == {"early"}
+    assert timeline.as_dict()["finished"] is not None
+
+
+def test_setup_timeline_critical_path():
+    """Test the critical path follows the dependency set up last."""
+    timeline = setup.SetupTimeline()
+    timeline.start = 0
+    timeline.dependencies = {"app": {"slow", "fast"}, "slow": {"base"}}
+    timeline.async_add("base", setup.PHASE_SETUP, 0, 1)
+    timeline.async_add("fast", setup.PHASE_SETUP, 0, 2)
+    timeline.async_add("slow", setup.PHASE_SETUP, 1, 5)
+    timeline.async_add("app", setup.PHASE_SETUP, 5, 6)
+    timeline.async_add("app", setup.PHASE_PLATFORM, 6, 9, "light")
+    timeline.async_add("other", setup.PHASE_SETUP, 0, 8)
+
+    assert timeline.critical_path() == [
+        {"domain": "base", "start": 0, "end": 1, "duration": 1},
+        {"domain": "slow", "start": 1, "end": 5, "duration": 4},
+        {"domain": "app", "start": 5, "end": 9, "duration": 4},
+    ]
+
+    trace = timeline.as_chrome_trace()
+    events = trace["traceEvents"]
+    assert {
+        "name": "platform light",
+        "cat": setup.PHASE_PLATFORM,
+        "ph": "X",
+        "pid": 1,
+        "tid": 4,
+        "ts": 6_000_000,
+        "dur": 3_000_000,
+    } in events
+    assert {
+        "name": "thread_name",
+        "ph": "M",
+        "pid": 1,
+        "tid": 4,
+        "args": {"name": "app"},
+    } in events
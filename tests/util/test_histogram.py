@@ -0,0 +1,38 @@
+"""Test Home Assistant histogram utility functions."""
+import threading
+
+from homeassistant.util.histogram import Histogram
+
+
+def test_histogram():
+    """Test observations are counted in cumulative buckets."""
+    histogram = Histogram([0.125, 1])
+    for value in (0.0625, 0.125, 0.5, 2):
+        histogram.observe(value)
+
+    assert histogram.count == 4
+    assert histogram.sum == 2.6875
+    assert histogram.cumulative_buckets() == [("0.125", 2), ("1.0", 3), ("+Inf", 4)]
+    assert histogram.as_dict() == {
+        "count": 4,
+        "sum": 2.6875,
+        "buckets": {"0.125": 2, "1.0": 3, "+Inf": 4},
+    }
+
+
+def test_histogram_observed_from_threads():
+    """Test observations from several threads are all counted."""
+    histogram = Histogram([0.5])
+
+    def observe():
+        for _ in range(10000):
+            histogram.observe(1)
+
+    threads = [threading.Thread(target=observe) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert histogram.count == 40000
+    assert histogram.cumulative_buckets() == [("0.5", 0), ("+Inf", 40000)]